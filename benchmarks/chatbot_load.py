@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Chatbot load test
+Generates a realistic query mix from the knowledge base keywords (phrasing
+templates, typos, casing/punctuation noise, off-topic questions, greetings)
+and replays it from many concurrent simulated sessions, either in-process
+through JobsTerritoryBot.process_query or over HTTP against POST /api/chat.
+Reports queries per second, p50/p95/p99 latency and memory per session, and
+writes a JSON result file meant to be compared across releases.
+
+Usage:
+    python benchmarks/chatbot_load.py --sessions 200 --turns 10 --json chatbot_load.json
+    python benchmarks/chatbot_load.py --url http://localhost:8000 --sessions 50 --turns 20
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from urllib.parse import urlparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'jobsterritory_content.json')
+
+TEMPLATES = (
+    "{}", "what is {}", "tell me about {}", "how does {} work?", "do you offer {}",
+    "I need info on {}", "can you explain {} please", "{}??", "how much is {}"
+)
+NOISE_PREFIXES = ("", "", "", "um ", "ok so ", "quick question: ", "hey, ")
+OFF_TOPIC = (
+    "What is quantum physics?", "who won the cricket match yesterday", "recommend a good pizza place",
+    "how do I fix my wifi", "what's the weather in Mumbai", "write me a poem", "translate hello to french",
+    "is the stock market open today", "asdfgh", "how tall is mount everest"
+)
+SMALL_TALK = ("hello", "hi there", "good morning", "thanks", "thank you, bye")
+
+
+def typo(word, rng):
+    """One random deletion, transposition, substitution or insertion"""
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return word[:i] + word[i + 1:]
+    if kind == 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    if kind == 2:
+        return word[:i] + letter + word[i + 1:]
+    return word[:i] + letter + word[i:]
+
+
+def add_noise(text, rng):
+    """Random filler prefix, casing and trailing punctuation"""
+    text = rng.choice(NOISE_PREFIXES) + text
+    roll = rng.random()
+    if roll < 0.15:
+        text = text.upper()
+    elif roll < 0.4:
+        text = text.capitalize()
+    return text + rng.choice(("", "", "?", "!", " ...", "  "))
+
+
+def generate_queries(kb, count, typo_rate=0.2, off_topic_rate=0.1, small_talk_rate=0.05, seed=7):
+    """
+    Query mix built from the knowledge base keywords. Each query is tagged
+    with its kind (keyword, typo, off_topic, small_talk) for the report.
+    """
+    rng = random.Random(seed)
+    keywords = [keyword for entry_keywords, _, _ in kb.get_all_entries() for keyword in entry_keywords]
+    queries = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < off_topic_rate:
+            queries.append(("off_topic", rng.choice(OFF_TOPIC)))
+        elif roll < off_topic_rate + small_talk_rate:
+            queries.append(("small_talk", rng.choice(SMALL_TALK)))
+        else:
+            text = rng.choice(TEMPLATES).format(rng.choice(keywords))
+            kind = "keyword"
+            if rng.random() < typo_rate:
+                words = text.split()
+                target = max(range(len(words)), key=lambda i: len(words[i]))
+                words[target] = typo(words[target], rng)
+                text = " ".join(words)
+                kind = "typo"
+            queries.append((kind, add_noise(text, rng)))
+    return queries
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies_ms, elapsed, errors=0):
+    return {
+        "queries": len(latencies_ms),
+        "errors": errors,
+        "qps": round(len(latencies_ms) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "mean_ms": round(statistics.mean(latencies_ms), 3) if latencies_ms else 0.0,
+        "seconds": round(elapsed, 3)
+    }
+
+
+def session_scripts(queries, sessions, turns, seed=11):
+    """The list of queries each simulated session sends, drawn from the mix"""
+    rng = random.Random(seed)
+    return [[rng.choice(queries) for _ in range(turns)] for _ in range(sessions)]
+
+
+def run_concurrently(scripts, concurrency, send):
+    """
+    Play the session scripts on `concurrency` threads; send(session_index,
+    text) answers one turn. Returns latencies per query kind, errors and elapsed time.
+    """
+    latencies = {}
+    errors = [0]
+    lock = threading.Lock()
+    next_session = [0]
+
+    def worker():
+        local = {}
+        local_errors = 0
+        while True:
+            with lock:
+                index = next_session[0]
+                next_session[0] += 1
+            if index >= len(scripts):
+                break
+            for kind, text in scripts[index]:
+                start = time.perf_counter()
+                try:
+                    send(index, text)
+                except Exception:
+                    local_errors += 1
+                    continue
+                local.setdefault(kind, []).append((time.perf_counter() - start) * 1000)
+        with lock:
+            for kind, values in local.items():
+                latencies.setdefault(kind, []).extend(values)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(max(1, min(concurrency, len(scripts))))]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.perf_counter() - start
+
+
+def report(latencies, errors, elapsed):
+    everything = [value for values in latencies.values() for value in values]
+    result = summarize(everything, elapsed, errors)
+    result["by_kind"] = {kind: summarize(values, elapsed) for kind, values in sorted(latencies.items())}
+    return result
+
+
+def run_in_process(kb, scripts, concurrency, cache_size):
+    """Replay through a shared bot with one history list per session, as the API does"""
+    from chatbot_logic import JobsTerritoryBot
+    from session_store import SessionStore
+    bot = JobsTerritoryBot(kb, response_cache_size=cache_size)
+    store = SessionStore(max_sessions=max(1, len(scripts)))
+    sessions = [store.get_or_create() for _ in scripts]
+
+    def send(index, text):
+        bot.process_query(text, history=sessions[index].history)
+
+    result = report(*run_concurrently(scripts, concurrency, send))
+    result["response_cache"] = bot.cache_stats()
+    return result
+
+
+def run_http(url, scripts, concurrency, timeout):
+    """Replay against POST /api/chat; each session keeps the session_id it is given"""
+    parsed = urlparse(url)
+    connection_class = http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+    local = threading.local()
+    session_ids = [None] * len(scripts)
+
+    def send(index, text):
+        # One keep-alive connection per client thread
+        if getattr(local, "connection", None) is None:
+            local.connection = connection_class(parsed.hostname, parsed.port, timeout=timeout)
+        body = {"message": text}
+        if session_ids[index]:
+            body["session_id"] = session_ids[index]
+        try:
+            local.connection.request("POST", "/api/chat", body=json.dumps(body),
+                                     headers={"Content-Type": "application/json"})
+            response = local.connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            local.connection.close()
+            local.connection = None
+            raise
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+        session_ids[index] = json.loads(payload)["session_id"]
+
+    return report(*run_concurrently(scripts, concurrency, send))
+
+
+def memory_per_session(kb, scripts):
+    """
+    Python heap bytes per session after every session has played its script,
+    measured with tracemalloc on a bot without response cache (so only the
+    sessions and their histories are counted).
+    """
+    from chatbot_logic import JobsTerritoryBot
+    from session_store import SessionStore
+    bot = JobsTerritoryBot(kb, response_cache_size=0)
+    store = SessionStore(max_sessions=max(1, len(scripts)))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for script in scripts:
+        session = store.get_or_create()
+        for _, text in script:
+            bot.process_query(text, history=session.history)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {
+        "sessions": len(store),
+        "history_turns_kept": bot.max_history,
+        "bytes_per_session": round((after - before) / max(1, len(store)))
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit
+    }
+
+
+def print_result(label, result):
+    print(f"{label:<22} {result['qps']:>10} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+          f"{result['p99_ms']:>9} {result['errors']:>7}")
+    for kind, row in result["by_kind"].items():
+        print(f"  {kind:<20} {'':>10} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput, latency and memory of the chatbot under concurrent sessions")
+    parser.add_argument("--sessions", type=int, default=200, help="Simulated chat sessions")
+    parser.add_argument("--turns", type=int, default=10, help="Queries per session")
+    parser.add_argument("--concurrency", type=int, default=16, help="Sessions played at the same time")
+    parser.add_argument("--queries", type=int, default=500, help="Distinct queries generated for the mix")
+    parser.add_argument("--typo-rate", type=float, default=0.2, help="Share of keyword queries with a typo")
+    parser.add_argument("--off-topic-rate", type=float, default=0.1, help="Share of off-topic queries")
+    parser.add_argument("--cache-size", type=int, default=2048, help="Response cache size in-process (0 disables)")
+    parser.add_argument("--url", help="Also replay over HTTP against a running server, e.g. http://localhost:8000")
+    parser.add_argument("--timeout", type=float, default=10.0, help="HTTP request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the query mix")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    from knowledge_base import KnowledgeBase
+    kb = KnowledgeBase(DATA_FILE)
+    queries = generate_queries(kb, args.queries, args.typo_rate, args.off_topic_rate, seed=args.seed)
+    scripts = session_scripts(queries, args.sessions, args.turns, seed=args.seed + 1)
+
+    print(f"🚀 Chatbot load: {args.sessions} sessions x {args.turns} turns, concurrency {args.concurrency}")
+    print(f"{'mode':<22} {'qps':>10} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'errors':>7}")
+    results = {}
+    results["in_process"] = run_in_process(kb, scripts, args.concurrency, args.cache_size)
+    print_result("in-process", results["in_process"])
+    if args.cache_size > 0:
+        results["in_process_uncached"] = run_in_process(kb, scripts, args.concurrency, 0)
+        print_result("in-process (no cache)", results["in_process_uncached"])
+    if args.url:
+        results["http"] = run_http(args.url, scripts, args.concurrency, args.timeout)
+        print_result("http", results["http"])
+
+    memory = memory_per_session(kb, scripts)
+    print(f"Memory: {memory['bytes_per_session']} bytes per session ({memory['sessions']} sessions)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "benchmark": "chatbot_load",
+                "environment": environment(),
+                "config": {key: value for key, value in vars(args).items() if key != "json"},
+                "knowledge_base": {"version": kb.version, "entries": len(kb.entries)},
+                "results": results,
+                "memory": memory
+            }, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
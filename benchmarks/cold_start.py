@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Cold-start measurement for the ATS backend
+Runs each trial in a fresh interpreter and reports how long it takes to
+import ats_core, load the models, warm up, and serve the first parse
+
+Usage:
+    python benchmarks/cold_start.py --trials 5 --json cold_start.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+TRIAL_SCRIPT = r"""
+import json, sys, time
+sys.path.insert(0, %(backend)r)
+start = time.perf_counter()
+import ats_core
+import_s = time.perf_counter() - start
+
+start = time.perf_counter()
+loaded = ats_core.initialize_nlp()
+load_s = time.perf_counter() - start
+
+warmup_s = ats_core.warm_up() if %(warmup)r else 0.0
+
+start = time.perf_counter()
+ats_core.parse_document(ats_core.WARMUP_CV_TEXT.encode("utf-8"), "txt", is_jd=False)
+first_parse_s = time.perf_counter() - start
+
+print(json.dumps({
+    "loaded": loaded,
+    "import_s": import_s,
+    "load_s": load_s,
+    "warmup_s": warmup_s,
+    "first_parse_s": first_parse_s
+}))
+"""
+
+STAGES = ("import_s", "load_s", "warmup_s", "first_parse_s", "total_s")
+
+
+def run_trial(warmup):
+    """Measure one cold start in a new interpreter"""
+    script = TRIAL_SCRIPT % {"backend": BACKEND_DIR, "warmup": warmup}
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["total_s"] = result["import_s"] + result["load_s"] + result["warmup_s"] + result["first_parse_s"]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ATS backend cold-start time")
+    parser.add_argument("--trials", type=int, default=5, help="Number of fresh-interpreter trials")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip warm_up() to measure its effect on the first parse")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    print(f"🚀 Cold start: {args.trials} trials, warm-up {'off' if args.no_warmup else 'on'}")
+    trials = [run_trial(not args.no_warmup) for _ in range(args.trials)]
+    if not all(trial["loaded"] for trial in trials):
+        print("⚠️  spaCy model was not loaded; numbers reflect the fallback path")
+
+    summary = {}
+    for stage in STAGES:
+        values = [trial[stage] for trial in trials]
+        summary[stage] = {"median": round(statistics.median(values), 4), "max": round(max(values), 4)}
+        print(f"   {stage:<14} median {summary[stage]['median']:.3f}s   max {summary[stage]['max']:.3f}s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "cold_start", "warmup": not args.no_warmup,
+                       "summary": summary, "trials": trials}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Accuracy versus speed of the extraction and matching modes
+Generates a labeled synthetic corpus of resume/JD pairs whose skills, years
+of experience, CTC and JD responsibilities are known from generation, runs
+parse_document and calculate_match_score over it in every mode, and reports
+precision, recall and F1 per field next to the time per document. For each
+input file type, modes on the Pareto front (no other mode is at least as
+accurate and at least as fast) are marked, to pick the default for each
+deployment.
+
+Modes:
+    spacy          spaCy pipeline with direct nlp() calls
+    spacy-batched  spaCy pipeline through the micro-batcher
+    keyword        no spaCy model: the keyword and regex fallbacks
+
+Usage:
+    python benchmarks/extraction_eval.py --pairs 40 --json extraction_eval.json
+    python benchmarks/extraction_eval.py --modes spacy,keyword --types txt,pdf,docx --concurrency 8
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+# Display forms of skills; the gold label is the lowercased form. A fixed list,
+# so a skill dropped from ats_core's dictionary shows up as lost recall
+SKILLS = (
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "Scala", "SQL", "React", "Angular",
+    "Django", "Flask", "Spring", "Pandas", "NumPy", "TensorFlow", "Docker", "Kubernetes", "Jenkins", "Git",
+    "AWS", "Azure", "GCP", "Terraform", "Redis", "MongoDB", "PostgreSQL", "Kafka", "Spark", "Agile",
+    "Scrum", "Microservices", "GraphQL", "CI/CD", "REST API", "Machine Learning", "Data Analysis",
+    "Project Management", "Stakeholder Management", "Leadership", "Communication", "Mentoring"
+)
+CV_VERBS = ("Built", "Designed", "Led", "Maintained", "Migrated", "Optimized", "Automated", "Delivered",
+            "Owned", "Implemented", "Scaled")
+JD_VERBS = ("Design", "Build", "Own", "Maintain", "Improve", "Lead", "Deliver", "Automate", "Review",
+            "Monitor", "Define")
+OBJECTS = ("the billing platform", "an internal analytics dashboard", "customer onboarding flows",
+           "a reporting pipeline", "the partner integration layer", "release processes",
+           "the mobile backend", "quarterly planning", "the search service", "the data warehouse",
+           "the payments API", "on-call runbooks")
+OUTCOMES = ("cutting costs by 20%", "improving latency by 35%", "with zero downtime",
+            "for 2 million monthly users", "ahead of schedule", "across three regions")
+JD_PURPOSES = ("so that product teams can ship safely", "together with product managers and designers",
+               "as the service grows to millions of users", "with a focus on reliability and cost",
+               "and keep documentation up to date")
+BENEFITS = ("Health insurance for you and your family.", "Flexible working hours and a hybrid office.",
+            "A yearly learning budget for books and conferences.", "Paid parental leave and sabbaticals.")
+ABOUT = ("We are a fast-growing fintech company based in Bangalore.",
+         "Our customers are small businesses across India and South East Asia.")
+# Text a human would not label with any skill, years or CTC, but which contains
+# substrings of dictionary skills ("scala" in "escalations") or stray numbers
+DISTRACTORS = (
+    "Handled escalations from trusted partners in good time.",
+    "Sparked a company-wide discussion about remote work.",
+    "Volunteered as a chef at a charity kitchen every winter.",
+    "Joined a Javanese cultural society while studying abroad.",
+    "Played an oracle in an amateur production of a Greek tragedy.",
+    "Managed a yearly budget of 2 crores for the department.",
+    "Mentored 3 graduates over 2 years in the campus programme."
+)
+
+CTC_TOLERANCE = 0.01
+RESPONSIBILITY_MIN_SHARED = 2
+RESPONSIBILITY_MIN_OVERLAP = 0.6
+STOPWORDS = frozenset(("the", "and", "for", "with", "our", "you", "your", "that", "can", "are", "this", "from"))
+FIELDS = ("skills", "years", "ctc", "responsibilities", "matched_skills")
+MODES = {
+    # name: (needs the spaCy model, micro-batching)
+    "spacy": (True, False),
+    "spacy-batched": (True, True),
+    "keyword": (False, False)
+}
+
+
+def jd_years_line(rng, years):
+    return rng.choice((f"We are looking for an engineer with {years}+ years of experience.",
+                       f"You have at least {years} years of experience in backend development.",
+                       f"Experience: {years}-{years + 3} years of experience building web services."))
+
+
+def jd_ctc_line(rng):
+    low = rng.randint(12, 30)
+    high = low + rng.randint(5, 20)
+    if rng.random() < 0.7:
+        return f"Salary: {low}-{high} LPA.", {"min_value": low * 100000, "max_value": high * 100000,
+                                               "currency": "INR"}
+    low_k, high_k = low * 5, high * 5
+    return (f"Compensation: ${low_k}k - ${high_k}k per annum.",
+            {"min_value": low_k * 1000, "max_value": high_k * 1000, "currency": "USD"})
+
+
+def cv_ctc_line(rng):
+    expected = rng.randint(10, 45)
+    line = rng.choice((f"Expected CTC: {expected} LPA.", f"Expected salary: ₹{expected} lakhs."))
+    return line, {"min_value": expected * 100000, "max_value": expected * 100000, "currency": "INR"}
+
+
+def generate_pair(rng, sentences, noise):
+    """A resume and a JD as lists of lines, with their gold labels"""
+    jd_skills = rng.sample(SKILLS, rng.randint(5, 8))
+    shared = rng.sample(jd_skills, rng.randint(1, len(jd_skills) - 1))
+    cv_skills = shared + rng.sample([s for s in SKILLS if s not in jd_skills], rng.randint(1, 4))
+
+    jd_years = rng.randint(2, 10)
+    jd_ctc_text, jd_ctc = jd_ctc_line(rng)
+    responsibilities = []
+    for _ in range(rng.randint(5, 10)):
+        responsibility = f"{rng.choice(JD_VERBS)} {rng.choice(OBJECTS)} {rng.choice(JD_PURPOSES)}."
+        if responsibility not in responsibilities:
+            responsibilities.append(responsibility)
+    jd_lines = ["Senior Software Engineer - Platform Team", "About us:", *ABOUT,
+                jd_years_line(rng, jd_years), f"Required skills: {', '.join(jd_skills)}.", jd_ctc_text,
+                "Key Responsibilities:", *(f"- {r}" for r in responsibilities),
+                "Benefits:", *(f"- {b}" for b in rng.sample(BENEFITS, 3))]
+    if rng.random() < noise:
+        jd_lines.insert(3, "We have been hiring engineers for 25 years in Bangalore.")
+
+    cv_years = rng.randint(2, 15)
+    cv_ctc_text, cv_ctc = cv_ctc_line(rng)
+    header_skills, body_skills = cv_skills[:len(cv_skills) // 2], cv_skills[len(cv_skills) // 2:]
+    cv_lines = ["Jane Doe - Software Engineer", "jane.doe@example.com | +91 98765 43210 | Bangalore",
+                f"Summary: Engineer with {cv_years} years of experience in {', '.join(header_skills)}.",
+                cv_ctc_text, "Education: B.Tech in Computer Science, 2012", "Experience:"]
+    body = [f"{rng.choice(CV_VERBS)} {rng.choice(OBJECTS)} using {skill}, {rng.choice(OUTCOMES)}."
+            for skill in body_skills]
+    while len(body) < sentences:
+        if rng.random() < noise:
+            body.append(rng.choice(DISTRACTORS))
+        else:
+            body.append(f"{rng.choice(CV_VERBS)} {rng.choice(OBJECTS)} {rng.choice(OUTCOMES)}.")
+    rng.shuffle(body)
+    cv_lines.extend(f"* {line}" for line in body)
+
+    jd_gold = {"skills": {s.lower() for s in jd_skills}, "years": jd_years, "ctc": jd_ctc,
+               "responsibilities": responsibilities}
+    cv_gold = {"skills": {s.lower() for s in cv_skills}, "years": cv_years, "ctc": cv_ctc}
+    return cv_lines, cv_gold, jd_lines, jd_gold
+
+
+def build_corpus(pairs, sentences, noise, seed):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(pairs):
+        cv_lines, cv_gold, jd_lines, jd_gold = generate_pair(rng, sentences, noise)
+        corpus.append({"cv": cv_lines, "cv_gold": cv_gold, "jd": jd_lines, "jd_gold": jd_gold,
+                       "matched_skills": cv_gold["skills"] & jd_gold["skills"]})
+    return corpus
+
+
+class Counts:
+    """True positives, false positives and false negatives summed over the corpus"""
+
+    def __init__(self):
+        self.tp = self.fp = self.fn = 0
+
+    def add(self, tp, fp, fn):
+        self.tp += tp
+        self.fp += fp
+        self.fn += fn
+
+    def to_dict(self):
+        precision = self.tp / (self.tp + self.fp) if self.tp + self.fp else 0.0
+        recall = self.tp / (self.tp + self.fn) if self.tp + self.fn else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return {"precision": round(precision, 3), "recall": round(recall, 3), "f1": round(f1, 3),
+                "tp": self.tp, "fp": self.fp, "fn": self.fn}
+
+
+def score_set(counts, predicted, gold):
+    predicted = {item.lower() for item in predicted}
+    counts.add(len(predicted & gold), len(predicted - gold), len(gold - predicted))
+
+
+def score_value(counts, predicted, gold, correct):
+    """A single value: a wrong prediction is both a false positive and a false negative"""
+    if not predicted:
+        counts.add(0, 0, 1)
+    elif correct(predicted, gold):
+        counts.add(1, 0, 0)
+    else:
+        counts.add(0, 1, 1)
+
+
+def ctc_correct(predicted, gold):
+    return (predicted.get("currency") == gold["currency"]
+            and all(abs(predicted.get(key, 0) - gold[key]) <= CTC_TOLERANCE * gold[key]
+                    for key in ("min_value", "max_value")))
+
+
+def content_words(text):
+    return {word for word in re.findall(r"[a-z0-9]+", text.lower()) if len(word) > 2 and word not in STOPWORDS}
+
+
+def score_responsibilities(counts, predicted, gold):
+    """
+    A predicted responsibility matches an unmatched gold one when most of its
+    words come from it: extractors may shorten a bullet to its main clause.
+    """
+    remaining = [content_words(g) for g in gold]
+    tp = 0
+    for item in predicted:
+        words = content_words(item)
+        best, best_shared = None, 0
+        for index, gold_words in enumerate(remaining):
+            shared = len(words & gold_words)
+            if shared > best_shared:
+                best, best_shared = index, shared
+        if (best is not None and best_shared >= RESPONSIBILITY_MIN_SHARED
+                and best_shared / len(words) >= RESPONSIBILITY_MIN_OVERLAP):
+            remaining.pop(best)
+            tp += 1
+    counts.add(tp, len(predicted) - tp, len(gold) - tp)
+
+
+@contextmanager
+def extraction_mode(ats_core, mode, batch_size, window_ms):
+    """Switch ats_core to a mode for the duration of the block (after initialize_nlp)"""
+    model = ats_core.nlp
+    try:
+        if not MODES[mode][0]:
+            ats_core.nlp = None
+        elif MODES[mode][1]:
+            ats_core.enable_micro_batching(max_batch_size=batch_size, max_wait_ms=window_ms)
+        yield
+    finally:
+        ats_core.disable_micro_batching()
+        ats_core.nlp = model
+
+
+def timed_map(fn, items, concurrency):
+    """(results, per-item milliseconds, wall seconds) of fn over items"""
+    def call(item):
+        start = time.perf_counter()
+        result = fn(item)
+        return result, (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outputs = list(pool.map(call, items))
+    else:
+        outputs = [call(item) for item in items]
+    return [result for result, _ in outputs], [ms for _, ms in outputs], time.perf_counter() - start
+
+
+def evaluate(ats_core, corpus, documents, file_type, repeats, concurrency):
+    """Accuracy per field and timings of one mode on one file type"""
+    def parse(document):
+        kind, content = document
+        return ats_core.parse_document(content, file_type, is_jd=(kind == "jd"))
+
+    parse_ms, parse_wall = [], []
+    for _ in range(repeats):
+        parsed, latencies, wall = timed_map(parse, documents, concurrency)
+        parse_ms.extend(latencies)
+        parse_wall.append(wall)
+    pairs = [(parsed[2 * i + 1], parsed[2 * i]) for i in range(len(corpus))]
+    matches, match_ms, _ = timed_map(lambda pair: ats_core.calculate_match_score(*pair), pairs, concurrency)
+
+    counts = {field: Counts() for field in FIELDS}
+    for i, sample in enumerate(corpus):
+        parsed_cv, parsed_jd = parsed[2 * i], parsed[2 * i + 1]
+        for parsed_doc, gold in ((parsed_cv, sample["cv_gold"]), (parsed_jd, sample["jd_gold"])):
+            score_set(counts["skills"], parsed_doc["skills"], gold["skills"])
+            score_value(counts["years"], parsed_doc["experience"].get("years_of_experience"), gold["years"],
+                        lambda predicted, expected: predicted == expected)
+            score_value(counts["ctc"], parsed_doc["ctc"], gold["ctc"], ctc_correct)
+        score_responsibilities(counts["responsibilities"], parsed_jd.get("key_responsibilities", []),
+                               sample["jd_gold"]["responsibilities"])
+        score_set(counts["matched_skills"], matches[i]["matched_skills"], sample["matched_skills"])
+
+    accuracy = {field: counts[field].to_dict() for field in FIELDS}
+    return {
+        "accuracy": accuracy,
+        "overall_f1": round(statistics.mean(accuracy[field]["f1"] for field in FIELDS), 3),
+        "ms_per_doc": round(statistics.median(parse_wall) * 1000 / len(documents), 3),
+        "p50_parse_ms": round(statistics.median(parse_ms), 3),
+        "p50_match_ms": round(statistics.median(match_ms), 3)
+    }
+
+
+def pareto_front(rows, quality, cost):
+    """Mark rows that no other row beats on quality without costing more, or vice versa"""
+    for row in rows:
+        row["pareto"] = not any(
+            other[quality] >= row[quality] and other[cost] <= row[cost]
+            and (other[quality] > row[quality] or other[cost] < row[cost])
+            for other in rows if other is not row
+        )
+    return rows
+
+
+def quality_of(row, objective):
+    return row["overall_f1"] if objective == "overall" else row["accuracy"][objective]["f1"]
+
+
+def print_table(file_type, rows):
+    print(f"\n{file_type}:")
+    print(f"{'mode':<15} " + " ".join(f"{field[:12]:>12}" for field in FIELDS)
+          + f" {'overall':>8} {'ms/doc':>9} {'match_ms':>9}  pareto")
+    for row in sorted(rows, key=lambda r: r["ms_per_doc"]):
+        print(f"{row['mode']:<15} " + " ".join(f"{row['accuracy'][field]['f1']:>12.3f}" for field in FIELDS)
+              + f" {row['overall_f1']:>8.3f} {row['ms_per_doc']:>9} {row['p50_match_ms']:>9}  "
+              + ("*" if row["pareto"] else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy (P/R/F1) versus time per document of each extraction mode")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes")
+    parser.add_argument("--types", default="txt,pdf", help="Comma-separated file types (docx needs python-docx)")
+    parser.add_argument("--pairs", type=int, default=40, help="Resume/JD pairs in the corpus")
+    parser.add_argument("--sentences", type=int, default=20, help="Body sentences per resume")
+    parser.add_argument("--noise", type=float, default=0.2, help="Share of distractor sentences")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed passes over the corpus per mode")
+    parser.add_argument("--concurrency", type=int, default=1, help="Documents parsed in parallel")
+    parser.add_argument("--batch-size", type=int, default=16, help="Micro-batch size for spacy-batched")
+    parser.add_argument("--window-ms", type=float, default=5.0, help="Micro-batch window for spacy-batched")
+    parser.add_argument("--objective", default="overall", choices=("overall",) + FIELDS,
+                        help="F1 used for the Pareto front")
+    parser.add_argument("--seed", type=int, default=7, help="Corpus seed")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    from parse_document import WRITERS, environment
+    modes = [m.strip() for m in args.modes.split(",")]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)} (choose from {', '.join(MODES)})")
+    file_types = [t.strip() for t in args.types.split(",")]
+    corpus = build_corpus(args.pairs, args.sentences, args.noise, args.seed)
+
+    import ats_core
+    if not ats_core.initialize_nlp():
+        skipped = [m for m in modes if MODES[m][0]]
+        modes = [m for m in modes if not MODES[m][0]]
+        print(f"⚠️  spaCy model was not loaded; skipping {', '.join(skipped) or 'nothing'}")
+    ats_core.warm_up()
+
+    print(f"🚀 extraction eval: {args.pairs} pairs, modes {', '.join(modes)}, "
+          f"{args.repeats} passes, concurrency {args.concurrency}")
+    results = []
+    for file_type in file_types:
+        documents = []
+        for sample in corpus:
+            documents.append(("cv", WRITERS[file_type]([sample["cv"]])))
+            documents.append(("jd", WRITERS[file_type]([sample["jd"]])))
+        rows = []
+        for mode in modes:
+            with extraction_mode(ats_core, mode, args.batch_size, args.window_ms):
+                rows.append({"file_type": file_type, "mode": mode,
+                             **evaluate(ats_core, corpus, documents, file_type, args.repeats, args.concurrency)})
+        for row in rows:
+            row["quality"] = quality_of(row, args.objective)
+        pareto_front(rows, "quality", "ms_per_doc")
+        print_table(file_type, rows)
+        results.extend(rows)
+    print(f"\nF1 per field; * marks the Pareto front on {args.objective} F1 against ms/doc")
+
+    output = {
+        "benchmark": "extraction_eval",
+        "environment": environment(ats_core),
+        "config": {key: value for key, value in vars(args).items() if key != "json"},
+        "results": results
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
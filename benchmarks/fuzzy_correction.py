@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Typo correction benchmark for the chatbot knowledge base
+Measures what the fuzzy correction layer adds to a query: the cost of
+correcting a query's words (cold, and memoized) and the end-to-end search
+time of misspelled queries against their correctly spelled versions
+
+Usage:
+    python benchmarks/fuzzy_correction.py --rounds 500 --json fuzzy.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'jobsterritory_content.json')
+
+# (misspelled, correct) query pairs
+QUERY_PAIRS = [
+    ("recruitmnt pricng", "recruitment pricing"),
+    ("how lnog does hirng take", "how long does hiring take"),
+    ("exective serch for a cto", "executive search for a cto"),
+    ("contcat details", "contact details"),
+    ("internatonal hirng", "international hiring"),
+    ("helthcare recruitmnt", "healthcare recruitment"),
+    ("tehcnology jobs", "technology jobs"),
+    ("sucess stories", "success stories"),
+]
+
+
+def measure(fn, inputs, rounds, before_each=None):
+    """Median and p99 of fn(input) in microseconds"""
+    samples = []
+    for _ in range(rounds):
+        for item in inputs:
+            if before_each is not None:
+                before_each()
+            start = time.perf_counter()
+            fn(item)
+            samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return round(statistics.median(samples), 1), round(samples[int(len(samples) * 0.99) - 1], 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of typo correction in knowledge base queries")
+    parser.add_argument("--rounds", type=int, default=500, help="Passes over the query set per measurement")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    from knowledge_base import KnowledgeBase
+    from utils import normalize_text
+    kb = KnowledgeBase(DATA_FILE)
+    corrector = kb.index.corrector
+    misspelled = [normalize_text(bad) for bad, _ in QUERY_PAIRS]
+    correct = [good for _, good in QUERY_PAIRS]
+    words = sum(len(query.split()) for query in misspelled)
+    index_stats = corrector.stats()
+
+    print(f"🚀 Fuzzy correction: {len(QUERY_PAIRS)} queries ({words} words) x {args.rounds} rounds, "
+          f"{index_stats['vocabulary']} vocabulary words, {index_stats['deletion_keys']} deletion keys")
+    results = {
+        "correct_text_cold_us": measure(corrector.correct_text, misspelled, args.rounds,
+                                        before_each=corrector.clear_corrections),
+        "correct_text_memoized_us": measure(corrector.correct_text, misspelled, args.rounds),
+        "search_correct_spelling_us": measure(kb.search_content, correct, args.rounds),
+        "search_misspelled_us": measure(kb.search_content, [bad for bad, _ in QUERY_PAIRS], args.rounds),
+    }
+    for name, (p50, p99) in results.items():
+        print(f"   {name:<28} p50 {p50:>8.1f}us   p99 {p99:>8.1f}us")
+
+    recovered = sum(
+        1 for bad, good in QUERY_PAIRS
+        if kb.search_content(bad)[:1] and kb.search_content(bad)[0][2] == kb.search_content(good)[0][2]
+    )
+    print(f"   misspelled queries answered like their correct spelling: {recovered}/{len(QUERY_PAIRS)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "fuzzy_correction", "recovered": recovered, "queries": len(QUERY_PAIRS),
+                       "index": index_stats,
+                       "results": {name: {"p50_us": p50, "p99_us": p99} for name, (p50, p99) in results.items()}},
+                      f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+HTTP load test for the ATS API
+Starts the API locally (the preforking server.py launcher) or targets a
+running one, then keeps a fixed number of concurrent clients sending a mix
+of /api/ats/match and /api/ats/parse requests with real file payloads. For
+each concurrency level it records throughput, latency percentiles per
+endpoint, error and rejection (503) rates, and samples the server's CPU and
+memory (RSS and PSS, summed over the launcher and its workers) over time.
+Ramp mode doubles the concurrency until throughput stops growing, errors
+appear or p99 goes over a limit, and reports the saturation point.
+
+Usage:
+    python benchmarks/http_load.py --workers 2 --concurrency 1,4,8 --duration 20 --json http_load.json
+    python benchmarks/http_load.py --ramp --max-concurrency 64 --mix match=3,parse=1
+    python benchmarks/http_load.py --url http://localhost:8000 --server-pid 1234 --jd jd.pdf --cvs resumes/*.pdf
+"""
+
+import argparse
+import glob
+import http.client
+import json
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(BENCHMARK_DIR, '..', 'src', 'backend')
+sys.path.append(BACKEND_DIR)
+
+CONTENT_TYPES = {".pdf": "application/pdf", ".txt": "text/plain",
+                 ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def multipart(fields):
+    """Encode [(field name, filename, bytes)] as multipart/form-data; returns (body, content type)"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, filename, content in fields:
+        content_type = CONTENT_TYPES.get(os.path.splitext(filename)[1].lower(), "application/octet-stream")
+        parts.append(f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"; filename=\"{filename}\"\r\n"
+                     f"Content-Type: {content_type}\r\n\r\n".encode() + content + b"\r\n")
+    return b"".join(parts) + f"--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
+
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return os.path.basename(path), f.read()
+
+
+def load_payloads(jd_path, cv_patterns, pages):
+    """(filename, bytes) for the JD and the resumes: given files, or a generated set"""
+    if jd_path and cv_patterns:
+        cv_paths = sorted({path for pattern in cv_patterns for path in glob.glob(pattern)})
+        if not cv_paths:
+            raise SystemExit(f"No resumes match {cv_patterns}")
+        return read_file(jd_path), [read_file(path) for path in cv_paths]
+
+    # Synthetic documents from the parse_document benchmark's generator
+    from parse_document import generate_pages, to_pdf, to_txt
+    jd = ("jd.txt", to_txt(generate_pages("jd", 1)))
+    cvs = []
+    for count in pages:
+        text_pages = generate_pages("cv", count)
+        cvs.append((f"cv_{count}p.txt", to_txt(text_pages)))
+        cvs.append((f"cv_{count}p.pdf", to_pdf(text_pages)))
+    return jd, cvs
+
+
+def parse_mix(text):
+    """'match=3,parse=1' -> [('match', 3), ('parse', 1)]"""
+    mix = []
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ("match", "parse"):
+            raise SystemExit(f"Unknown operation in --mix: {name}")
+        mix.append((name.strip(), float(weight or 1)))
+    return mix
+
+
+class ServerProcess:
+    """The preforking launcher started as a child process, stopped with SIGTERM"""
+
+    def __init__(self, port, workers, startup_timeout):
+        self.url = f"http://127.0.0.1:{port}"
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(BACKEND_DIR, "server.py"), "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(workers), "--log-level", "warning"],
+            cwd=BACKEND_DIR
+        )
+        self.wait_ready(startup_timeout)
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def wait_ready(self, timeout):
+        parsed = urlparse(self.url)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise SystemExit(f"Server exited with code {self.process.returncode} during startup")
+            try:
+                connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=2)
+                connection.request("GET", "/api/ready")
+                if connection.getresponse().status == 200:
+                    return
+            except (OSError, http.client.HTTPException):
+                pass
+            time.sleep(0.5)
+        self.stop()
+        raise SystemExit(f"Server not ready after {timeout}s")
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def process_tree(pid):
+    """pid and all its descendants (Linux /proc)"""
+    pids, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        try:
+            with open(f"/proc/{current}/task/{current}/children", encoding="utf-8") as f:
+                pending.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return pids
+
+
+def cpu_seconds(pids):
+    """User + system CPU time of the processes"""
+    ticks = os.sysconf("SC_CLK_TCK")
+    total = 0.0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            total += (int(fields[11]) + int(fields[12])) / ticks
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+
+class ResourceSampler:
+    """Background sampling of the server's CPU % and memory while a level runs"""
+
+    def __init__(self, pid, interval):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.pid is None or not os.path.exists(f"/proc/{self.pid}"):
+            return self
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        from memstats import process_memory
+        start = time.monotonic()
+        last_time, last_cpu = start, cpu_seconds(process_tree(self.pid))
+        while not self._stop.wait(self.interval):
+            pids = process_tree(self.pid)
+            now, cpu = time.monotonic(), cpu_seconds(pids)
+            memory = [process_memory(pid) or {} for pid in pids]
+            self.samples.append({
+                "t": round(now - start, 2),
+                "cpu_percent": round(100 * (cpu - last_cpu) / (now - last_time), 1),
+                "rss_bytes": sum(m.get("rss", 0) for m in memory),
+                "pss_bytes": sum(m.get("pss", 0) for m in memory),
+                "processes": len(pids)
+            })
+            last_time, last_cpu = now, cpu
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+
+def run_level(url, concurrency, duration, mix, jd, cvs, timeout, sampler_pid, sample_seconds, seed):
+    """Closed-loop load: each client sends its next request as soon as the previous one returns"""
+    parsed = urlparse(url)
+    operations = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    records = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    barrier = threading.Barrier(concurrency + 1)
+
+    def client(index):
+        rng = random.Random(seed * 1000 + index)
+        connection = None
+        local = []
+        barrier.wait()
+        while time.monotonic() < deadline:
+            operation = rng.choices(operations, weights)[0]
+            cv_name, cv_content = rng.choice(cvs)
+            if operation == "match":
+                body, content_type = multipart([("jd_file", jd[0], jd[1]), ("resume_file", cv_name, cv_content)])
+                path = "/api/ats/match"
+            else:
+                body, content_type = multipart([("file", cv_name, cv_content)])
+                path = "/api/ats/parse"
+            start = time.perf_counter()
+            try:
+                if connection is None:
+                    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=timeout)
+                connection.request("POST", path, body=body, headers={"Content-Type": content_type})
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                if connection is not None:
+                    connection.close()
+                connection = None
+                status = 0
+            local.append((operation, status, (time.perf_counter() - start) * 1000))
+        if connection is not None:
+            connection.close()
+        with lock:
+            records.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    sampler = ResourceSampler(sampler_pid, sample_seconds).start()
+    barrier.wait()
+    start = time.monotonic()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    samples = sampler.stop()
+    return summarize_level(concurrency, records, elapsed, samples)
+
+
+def summarize_level(concurrency, records, elapsed, samples):
+    ok = [latency for _, status, latency in records if status == 200]
+    result = {
+        "concurrency": concurrency,
+        "requests": len(records),
+        "seconds": round(elapsed, 2),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(sum(1 for _, status, _ in records if status not in (200, 503)) / len(records), 4) if records else 0.0,
+        "rejected_rate": round(sum(1 for _, status, _ in records if status == 503) / len(records), 4) if records else 0.0,
+        "p50_ms": round(percentile(ok, 50), 1),
+        "p95_ms": round(percentile(ok, 95), 1),
+        "p99_ms": round(percentile(ok, 99), 1),
+        "by_endpoint": {},
+        "status_counts": {},
+        "server": None
+    }
+    for _, status, _ in records:
+        result["status_counts"][str(status)] = result["status_counts"].get(str(status), 0) + 1
+    for operation in sorted({operation for operation, _, _ in records}):
+        latencies = [latency for op, status, latency in records if op == operation and status == 200]
+        result["by_endpoint"][operation] = {
+            "requests": sum(1 for op, _, _ in records if op == operation),
+            "ok": len(latencies),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1)
+        }
+    if samples:
+        result["server"] = {
+            "cpu_percent_mean": round(sum(s["cpu_percent"] for s in samples) / len(samples), 1),
+            "cpu_percent_max": max(s["cpu_percent"] for s in samples),
+            "rss_bytes_max": max(s["rss_bytes"] for s in samples),
+            "pss_bytes_max": max(s["pss_bytes"] for s in samples),
+            "timeline": samples
+        }
+    return result
+
+
+def saturation_point(levels, min_gain, max_error_rate, max_p99_ms):
+    """
+    The last level that still raised throughput by at least min_gain without
+    breaking the error-rate and p99 limits, and why the next one stopped.
+    """
+    best, reason = None, "max concurrency reached"
+    for level in levels:
+        if level["error_rate"] + level["rejected_rate"] > max_error_rate:
+            reason = f"error rate {level['error_rate'] + level['rejected_rate']:.1%} at concurrency {level['concurrency']}"
+            break
+        if max_p99_ms and level["p99_ms"] > max_p99_ms:
+            reason = f"p99 {level['p99_ms']}ms at concurrency {level['concurrency']}"
+            break
+        if best is not None and level["throughput_rps"] < best["throughput_rps"] * (1 + min_gain):
+            reason = f"throughput gain under {min_gain:.0%} at concurrency {level['concurrency']}"
+            break
+        best = level
+    return {
+        "concurrency": best["concurrency"] if best else None,
+        "throughput_rps": best["throughput_rps"] if best else 0.0,
+        "p99_ms": best["p99_ms"] if best else None,
+        "stopped_because": reason
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=BENCHMARK_DIR).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit
+    }
+
+
+def print_level(level):
+    server = level["server"] or {}
+    cpu = server.get("cpu_percent_mean", "-")
+    rss = f"{server['rss_bytes_max'] / (1024 * 1024):.0f}" if server else "-"
+    print(f"{level['concurrency']:>6} {level['throughput_rps']:>8} {level['p50_ms']:>9} {level['p95_ms']:>9} "
+          f"{level['p99_ms']:>9} {level['error_rate']:>7.2%} {level['rejected_rate']:>8.2%} {cpu:>7} {rss:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency of the ATS API under concurrent match/parse load")
+    parser.add_argument("--url", help="Target a running server instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="PID of the running server to sample CPU/memory from (with --url)")
+    parser.add_argument("--workers", type=int, default=2, help="Workers for the started server")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the started server")
+    parser.add_argument("--startup-timeout", type=float, default=180.0, help="Seconds to wait for /api/ready")
+    parser.add_argument("--mix", default="match=3,parse=1", help="Weighted operations, e.g. match=3,parse=1")
+    parser.add_argument("--jd", help="JD file to send (default: a generated one)")
+    parser.add_argument("--cvs", nargs="+", help="Resume files or glob patterns (default: generated TXT/PDF)")
+    parser.add_argument("--pages", default="1,3,10", help="Page counts of the generated resumes")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per level")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Request timeout in seconds")
+    parser.add_argument("--sample-seconds", type=float, default=1.0, help="Server CPU/memory sampling interval")
+    parser.add_argument("--ramp", action="store_true", help="Double concurrency from 1 until saturation")
+    parser.add_argument("--max-concurrency", type=int, default=128, help="Upper bound for --ramp")
+    parser.add_argument("--min-gain", type=float, default=0.05, help="Throughput gain below which --ramp stops")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Error + 503 rate at which --ramp stops")
+    parser.add_argument("--max-p99-ms", type=float, default=0.0, help="p99 at which --ramp stops (0: no limit)")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the request mix")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    jd, cvs = load_payloads(args.jd, args.cvs, [int(p) for p in args.pages.split(",")])
+    server = None
+    if args.url:
+        url, server_pid = args.url.rstrip("/"), args.server_pid
+    else:
+        print(f"Starting server.py with {args.workers} workers on port {args.port}...")
+        server = ServerProcess(args.port, args.workers, args.startup_timeout)
+        url, server_pid = server.url, server.pid
+
+    if args.ramp:
+        levels_to_run = []
+        level = 1
+        while level <= args.max_concurrency:
+            levels_to_run.append(level)
+            level *= 2
+    else:
+        levels_to_run = [int(c) for c in args.concurrency.split(",")]
+
+    print(f"🚀 HTTP load: {args.mix} against {url}, {len(cvs)} resumes, {args.duration:.0f}s per level")
+    print(f"{'conc':>6} {'rps':>8} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'errors':>7} {'503s':>8} {'cpu%':>7} {'rss_mb':>8}")
+    levels = []
+    try:
+        for concurrency in levels_to_run:
+            level = run_level(url, concurrency, args.duration, mix, jd, cvs, args.timeout,
+                              server_pid, args.sample_seconds, args.seed)
+            levels.append(level)
+            print_level(level)
+            if args.ramp:
+                saturation = saturation_point(levels, args.min_gain, args.max_error_rate, args.max_p99_ms)
+                if saturation["stopped_because"] != "max concurrency reached":
+                    break
+    finally:
+        if server is not None:
+            server.stop()
+
+    saturation = saturation_point(levels, args.min_gain, args.max_error_rate, args.max_p99_ms)
+    print(f"Saturation: {saturation['throughput_rps']} rps at concurrency {saturation['concurrency']} "
+          f"({saturation['stopped_because']})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "benchmark": "http_load",
+                "environment": environment(),
+                "config": {key: value for key, value in vars(args).items() if key != "json"},
+                "payloads": {"jd": jd[0], "cvs": [name for name, _ in cvs]},
+                "levels": levels,
+                "saturation": saturation
+            }, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Knowledge base search scaling benchmark
+Grows the Jobs Territory knowledge base with synthetic entries and compares
+the per-query cost of the indexed BM25 search against the previous full scan
+(utils.calculate_match_score over every entry)
+
+Usage:
+    python benchmarks/kb_search.py --sizes 19,200,1000,5000 --json kb_search.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'jobsterritory_content.json')
+
+QUERIES = [
+    "Tell me about RaaS", "What are your fees?", "How can I contact you?", "how long does hiring take",
+    "pay per hire", "I am looking for job", "where are you located", "international hiring",
+    "executive search for a cto", "What is quantum physics?"
+]
+
+FILLER_WORDS = ("talent", "sourcing", "onboarding", "payroll", "compliance", "assessment", "interview",
+                "benefits", "contract", "remote", "analytics", "branding", "retention", "screening")
+
+
+def synthetic_content(base, size, seed=7):
+    """Copy of the real content padded with `size` extra generated entries"""
+    rng = random.Random(seed)
+    content = json.loads(json.dumps(base))
+    extra = content.setdefault("synthetic", {})
+    real_entries = sum(len(sub) for sub in base.values())
+    for i in range(max(0, size - real_entries)):
+        words = rng.sample(FILLER_WORDS, 4)
+        extra[f"topic_{i}"] = {
+            "keywords": [f"{words[0]} {i}", f"{words[1]} topic {i}", words[2]],
+            "answer": " ".join(rng.choice(FILLER_WORDS) for _ in range(60))
+        }
+    return content
+
+
+def full_scan(kb, query):
+    """The search as it was before the index: score every entry"""
+    from utils import extract_keywords, calculate_match_score
+    user_keywords = extract_keywords(query)
+    results = []
+    for keywords, answer, category in kb.get_all_entries():
+        score = calculate_match_score(user_keywords, keywords, query, ' '.join(keywords))
+        if score > 0:
+            results.append((answer, score, category))
+    results.sort(key=lambda x: x[1], reverse=True)
+    return results
+
+
+def time_queries(search, rounds):
+    samples = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            start = time.perf_counter()
+            search(query)
+            samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return round(statistics.median(samples), 1), round(samples[int(len(samples) * 0.99) - 1], 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Knowledge base query cost as the number of entries grows")
+    parser.add_argument("--sizes", default="19,200,1000,5000", help="Comma-separated entry counts")
+    parser.add_argument("--rounds", type=int, default=50, help="Passes over the query set per measurement")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    from knowledge_base import KnowledgeBase
+    with open(DATA_FILE, encoding="utf-8") as f:
+        base = json.load(f)
+
+    print(f"🚀 Knowledge base search: {len(QUERIES)} queries x {args.rounds} rounds")
+    print(f"{'entries':>8} {'build_ms':>9} {'index_p50_us':>13} {'index_p99_us':>13} {'scan_p50_us':>12} {'scan_p99_us':>12}")
+    results = []
+    for size in [int(s) for s in args.sizes.split(",")]:
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(synthetic_content(base, size), f)
+            path = f.name
+        try:
+            start = time.perf_counter()
+            kb = KnowledgeBase(path)
+            build_ms = round((time.perf_counter() - start) * 1000, 1)
+        finally:
+            os.unlink(path)
+        index_p50, index_p99 = time_queries(kb.search_content, args.rounds)
+        scan_p50, scan_p99 = time_queries(lambda q: full_scan(kb, q), max(1, args.rounds // 10))
+        row = {"entries": len(kb.entries), "build_ms": build_ms, "index_p50_us": index_p50,
+               "index_p99_us": index_p99, "scan_p50_us": scan_p50, "scan_p99_us": scan_p99}
+        results.append(row)
+        print(f"{row['entries']:>8} {build_ms:>9} {index_p50:>13} {index_p99:>13} {scan_p50:>12} {scan_p99:>12}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "kb_search", "results": results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Load test for spaCy micro-batching
+Simulates concurrent requests that each run the pipeline over a document and
+reports throughput and latency for each batching window setting
+
+Usage:
+    python benchmarks/microbatch_load.py --clients 16 --requests 25 --windows 0,1,2,5,10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+SAMPLE_DOCUMENTS = [
+    "Senior Software Engineer with 8 years of experience in Python, Django and AWS. "
+    "Led a team of 5 developers and implemented microservices architecture.",
+    "We are looking for a data scientist proficient in machine learning, pandas and "
+    "scikit-learn. You will design experiments and communicate results to stakeholders.",
+    "Responsibilities: develop and maintain scalable web applications, design REST APIs, "
+    "collaborate with cross-functional teams and mentor junior developers.",
+    "DevOps engineer experienced with Docker, Kubernetes, Terraform and Jenkins. "
+    "Responsible for CI/CD pipelines, monitoring and incident response.",
+]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_setting(ats_core, window_ms, clients, requests_per_client, batch_size):
+    """Run one load level and return throughput/latency numbers"""
+    if window_ms > 0:
+        batcher = ats_core.enable_micro_batching(max_batch_size=batch_size, max_wait_ms=window_ms)
+    else:
+        ats_core.disable_micro_batching()
+        batcher = None
+
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client(client_index):
+        local = []
+        barrier.wait()
+        for i in range(requests_per_client):
+            text = SAMPLE_DOCUMENTS[(client_index + i) % len(SAMPLE_DOCUMENTS)].lower()
+            start = time.perf_counter()
+            ats_core.make_doc(text)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "window_ms": window_ms,
+        "clients": clients,
+        "documents": len(latencies),
+        "docs_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "avg_batch_size": batcher.stats()["avg_batch_size"] if batcher else 1.0
+    }
+    ats_core.disable_micro_batching()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput/latency trade-off of spaCy micro-batching windows")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent simulated requests")
+    parser.add_argument("--requests", type=int, default=25, help="Documents per client")
+    parser.add_argument("--windows", default="0,1,2,5,10,20", help="Comma-separated batching windows in ms (0 = no batching)")
+    parser.add_argument("--batch-size", type=int, default=16, help="Maximum batch size")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    import ats_core
+    if not ats_core.initialize_nlp():
+        print("❌ spaCy model could not be loaded; micro-batching needs it")
+        sys.exit(1)
+
+    # Warm up the pipeline so the first setting is not penalised
+    ats_core.make_docs([text.lower() for text in SAMPLE_DOCUMENTS])
+
+    print(f"🚀 Micro-batching load test: {args.clients} clients x {args.requests} documents")
+    print(f"{'window_ms':>10} {'docs/s':>10} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'avg_batch':>10}")
+    results = []
+    for window in [float(w) for w in args.windows.split(",")]:
+        result = run_setting(ats_core, window, args.clients, args.requests, args.batch_size)
+        results.append(result)
+        print(f"{result['window_ms']:>10} {result['docs_per_second']:>10} {result['p50_ms']:>9} "
+              f"{result['p95_ms']:>9} {result['p99_ms']:>9} {result['avg_batch_size']:>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "microbatch_load", "results": results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
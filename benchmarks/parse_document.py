@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+parse_document benchmark suite
+Generates a synthetic corpus of resumes and JDs as PDF, DOCX and TXT, from one
+page up to 50, with a controlled share of sentences mentioning skills, and
+measures every extractor parse_document runs (text extraction, cleaning,
+skills, experience, CTC, academic info, responsibilities) plus the whole
+call: median time, and under tracemalloc, peak and retained memory and the
+net number of allocated blocks. Results are written as JSON with the
+environment, and can be compared against an earlier result file.
+
+Usage:
+    python benchmarks/parse_document.py --pages 1,5,20,50 --json parse_document.json
+    python benchmarks/parse_document.py --baseline parse_document.json --threshold 1.25
+    python benchmarks/parse_document.py --write-corpus corpus/ --pages 1,10
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+# A fixed vocabulary, independent of ats_core's skill dictionary, so the corpus
+# stays the same across releases even when the dictionary changes
+SKILLS = (
+    "Python", "Java", "JavaScript", "TypeScript", "React", "Django", "Flask", "FastAPI", "AWS", "Azure",
+    "Docker", "Kubernetes", "Terraform", "PostgreSQL", "MongoDB", "Redis", "Kafka", "Spark", "Pandas",
+    "Machine Learning", "Data Analysis", "Project Management", "Agile", "Scrum", "REST APIs", "GraphQL",
+    "CI/CD", "Jenkins", "Git", "Linux", "Tableau", "Power BI", "Excel", "Communication", "Leadership"
+)
+VERBS = ("Built", "Designed", "Led", "Maintained", "Migrated", "Optimized", "Automated", "Delivered",
+         "Mentored", "Owned", "Implemented", "Scaled")
+OBJECTS = ("the billing platform", "an internal analytics dashboard", "customer onboarding flows",
+           "a reporting pipeline", "the partner integration layer", "release processes",
+           "a team of four engineers", "the mobile backend", "quarterly planning", "the search service")
+OUTCOMES = ("cutting costs by 20%", "improving latency by 35%", "with zero downtime",
+            "for 2 million monthly users", "ahead of schedule", "across three regions",
+            "raising conversion by 8%", "in close collaboration with product")
+FILLER = ("Worked closely with stakeholders across the business.", "Participated in hiring and onboarding.",
+          "Presented results to leadership every quarter.", "Wrote documentation and runbooks.",
+          "Handled on-call rotations and incident reviews.", "Contributed to internal knowledge sharing.")
+
+LINE_CHARS = 95
+SENTENCES_PER_BULLET = 3
+EXTRACTORS_CV = ("extract_text", "clean_text", "extract_skills", "extract_experience", "extract_ctc_info",
+                 "extract_academic_info", "parse_document")
+EXTRACTORS_JD = ("extract_text", "clean_text", "extract_skills", "extract_experience", "extract_ctc_info",
+                 "extract_key_responsibilities_from_jd", "parse_document")
+
+
+def sentence(rng, skill_density):
+    if rng.random() < skill_density:
+        skills = rng.sample(SKILLS, rng.randint(1, 3))
+        return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {', '.join(skills)}, {rng.choice(OUTCOMES)}."
+    if rng.random() < 0.5:
+        return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(OUTCOMES)}."
+    return rng.choice(FILLER)
+
+
+def wrap(text, width=LINE_CHARS):
+    """Greedy word wrap into lines of at most width characters"""
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def generate_pages(kind, pages, skill_density=0.3, sentences_per_page=30, seed=7):
+    """
+    Text of a synthetic resume ("cv") or JD as a list of pages, each a list
+    of lines. The header carries experience, CTC and (for resumes)
+    education, so every extractor has something to find.
+    """
+    rng = random.Random(f"{kind}-{pages}-{skill_density}-{sentences_per_page}-{seed}")
+    years = rng.randint(2, 15)
+    if kind == "jd":
+        header = [
+            "Senior Software Engineer - Platform Team",
+            f"We are looking for an engineer with {years}+ years of experience.",
+            f"Required skills: {', '.join(rng.sample(SKILLS, 6))}.",
+            f"Salary: {rng.randint(15, 40)}-{rng.randint(41, 60)} LPA.",
+            "Key Responsibilities:"
+        ]
+        bullet = "- "
+    else:
+        header = [
+            "Jane Doe - Senior Software Engineer",
+            "jane.doe@example.com | +91 98765 43210 | Bangalore",
+            f"Summary: Engineer with {years} years of experience in {', '.join(rng.sample(SKILLS, 4))}.",
+            f"Current CTC: {rng.randint(8, 30)} LPA, expected CTC: {rng.randint(31, 50)} LPA.",
+            f"Education: B.Tech in Computer Science, 20{rng.randint(5, 18):02d}, CGPA 8.{rng.randint(0, 9)}",
+            "Experience:"
+        ]
+        bullet = "* "
+    result = []
+    for page in range(pages):
+        lines = list(header) if page == 0 else []
+        sentences = [sentence(rng, skill_density) for _ in range(sentences_per_page)]
+        for start in range(0, len(sentences), SENTENCES_PER_BULLET):
+            lines.extend(wrap(bullet + " ".join(sentences[start:start + SENTENCES_PER_BULLET])))
+        result.append(lines)
+    return result
+
+
+def to_txt(pages):
+    return "\n\n".join("\n".join(lines) for lines in pages).encode("utf-8")
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def to_pdf(pages):
+    """A minimal PDF (one Helvetica text stream per page), written without any dependency"""
+    objects = []  # object bodies; object n is objects[n - 1]
+    page_ids = []
+    font_id = 3
+    objects.extend([b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"])
+    for lines in pages:
+        stream = "BT /F1 9 Tf 11 TL 50 770 Td\n" + "".join(f"({_pdf_escape(line)}) Tj T*\n" for line in lines) + "ET"
+        data = stream.encode("latin-1", errors="replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        content_id = len(objects)
+        objects.append(("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                        "/Resources << /Font << /F1 %d 0 R >> >> >>" % (content_id, font_id)).encode())
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = ("<< /Type /Pages /Kids [%s] /Count %d >>"
+                  % (" ".join(f"{page_id} 0 R" for page_id in page_ids), len(page_ids))).encode()
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def to_docx(pages):
+    """A DOCX with one paragraph per line and a page break between pages (needs python-docx)"""
+    from docx import Document
+    document = Document()
+    for index, lines in enumerate(pages):
+        for line in lines:
+            document.add_paragraph(line)
+        if index < len(pages) - 1:
+            document.add_page_break()
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+WRITERS = {"txt": to_txt, "pdf": to_pdf, "docx": to_docx}
+
+
+def build_corpus(file_types, page_counts, skill_density, sentences_per_page, seed):
+    """(kind, file_type, pages, bytes) for every combination"""
+    corpus = []
+    for kind in ("cv", "jd"):
+        for pages in page_counts:
+            text_pages = generate_pages(kind, pages, skill_density, sentences_per_page, seed)
+            for file_type in file_types:
+                corpus.append((kind, file_type, pages, WRITERS[file_type](text_pages)))
+    return corpus
+
+
+def extractor_calls(ats_core, kind, file_type, content):
+    """(name, zero-argument callable) for every extractor parse_document runs on this document"""
+    extract_text = {"pdf": ats_core.extract_text_from_pdf, "docx": ats_core.extract_text_from_docx,
+                    "txt": ats_core.extract_text_from_txt}[file_type]
+    raw_text = extract_text(content)
+    functions = {
+        "extract_text": lambda: extract_text(content),
+        "clean_text": lambda: ats_core.clean_text(raw_text),
+        "extract_skills": lambda: ats_core.extract_skills(raw_text),
+        "extract_experience": lambda: ats_core.extract_experience(raw_text),
+        "extract_ctc_info": lambda: ats_core.extract_ctc_info(raw_text),
+        "extract_academic_info": lambda: ats_core.extract_academic_info(raw_text),
+        "extract_key_responsibilities_from_jd": lambda: ats_core.extract_key_responsibilities_from_jd(raw_text),
+        "parse_document": lambda: ats_core.parse_document(content, file_type, is_jd=(kind == "jd"))
+    }
+    names = EXTRACTORS_JD if kind == "jd" else EXTRACTORS_CV
+    return raw_text, [(name, functions[name]) for name in names]
+
+
+def measure(fn, repeats):
+    """Median/min wall time untraced, then one traced run for memory"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        blocks_before = sys.getallocatedblocks()
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+        blocks_after = sys.getallocatedblocks()
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+    del result
+    return {
+        "p50_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "peak_kb": round((peak - before) / 1024, 1),
+        "retained_kb": round((current - before) / 1024, 1),
+        "net_blocks": blocks_after - blocks_before
+    }
+
+
+def environment(ats_core):
+    from importlib import metadata
+    versions = {}
+    for package in ("spacy", "nltk", "pypdf", "python-docx", "numpy"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    status = ats_core.nlp_status()
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+        "spacy_model": status["spacy_model"],
+        "spacy_loaded": status["spacy_loaded"],
+        "git_commit": commit
+    }
+
+
+def compare(results, baseline_path, threshold):
+    """Rows whose median time grew by more than threshold times against a baseline file"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(row["kind"], row["file_type"], row["pages"], row["extractor"]): row
+                    for row in json.load(f)["results"]}
+    regressions = []
+    for row in results:
+        old = baseline.get((row["kind"], row["file_type"], row["pages"], row["extractor"]))
+        if old and old["p50_ms"] > 0 and row["p50_ms"] / old["p50_ms"] > threshold:
+            regressions.append({**row, "baseline_p50_ms": old["p50_ms"],
+                                "ratio": round(row["p50_ms"] / old["p50_ms"], 2)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and memory of parse_document's extractors by file type and size")
+    parser.add_argument("--pages", default="1,5,20,50", help="Comma-separated page counts")
+    parser.add_argument("--types", default="txt,pdf,docx", help="Comma-separated file types")
+    parser.add_argument("--skill-density", type=float, default=0.3, help="Share of sentences mentioning skills")
+    parser.add_argument("--sentences-per-page", type=int, default=30, help="Body sentences on each page")
+    parser.add_argument("--repeats", type=int, default=5, help="Untraced runs per measurement")
+    parser.add_argument("--seed", type=int, default=7, help="Corpus seed")
+    parser.add_argument("--write-corpus", help="Also write the generated documents to this directory")
+    parser.add_argument("--baseline", help="Earlier result file to compare median times against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    page_counts = [int(p) for p in args.pages.split(",")]
+    file_types = [t.strip() for t in args.types.split(",")]
+    corpus = build_corpus(file_types, page_counts, args.skill_density, args.sentences_per_page, args.seed)
+    if args.write_corpus:
+        os.makedirs(args.write_corpus, exist_ok=True)
+        for kind, file_type, pages, content in corpus:
+            with open(os.path.join(args.write_corpus, f"{kind}_{pages}p.{file_type}"), "wb") as f:
+                f.write(content)
+        print(f"Corpus written to {args.write_corpus}")
+
+    import ats_core
+    if not ats_core.initialize_nlp():
+        print("⚠️  spaCy model was not loaded; numbers reflect the fallback path")
+    ats_core.warm_up()
+
+    print(f"🚀 parse_document: {len(corpus)} documents, {args.repeats} runs each")
+    print(f"{'doc':<14} {'extractor':<38} {'p50_ms':>9} {'peak_kb':>9} {'retained_kb':>12} {'net_blocks':>11}")
+    results = []
+    for kind, file_type, pages, content in corpus:
+        raw_text, calls = extractor_calls(ats_core, kind, file_type, content)
+        for name, fn in calls:
+            row = {"kind": kind, "file_type": file_type, "pages": pages, "bytes": len(content),
+                   "chars": len(raw_text), "extractor": name, **measure(fn, args.repeats)}
+            results.append(row)
+            print(f"{f'{kind} {pages}p {file_type}':<14} {name:<38} {row['p50_ms']:>9} {row['peak_kb']:>9} "
+                  f"{row['retained_kb']:>12} {row['net_blocks']:>11}")
+
+    output = {
+        "benchmark": "parse_document",
+        "environment": environment(ats_core),
+        "config": {key: value for key, value in vars(args).items() if key not in ("json", "write_corpus")},
+        "results": results
+    }
+    if args.baseline:
+        output["regressions"] = compare(results, args.baseline, args.threshold)
+        print(f"{len(output['regressions'])} measurements slower than {args.threshold}x the baseline")
+        for row in output["regressions"]:
+            print(f"   {row['kind']} {row['pages']}p {row['file_type']} {row['extractor']}: "
+                  f"{row['baseline_p50_ms']} -> {row['p50_ms']} ms ({row['ratio']}x)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2)
+        print(f"Results written to {args.json}")
+    sys.exit(1 if args.baseline and output["regressions"] else 0)
+
+
+if __name__ == "__main__":
+    main()
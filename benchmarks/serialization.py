@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Response serialization benchmark for the ATS API
+Serializes real match and parse results with the standard library encoder
+(what FastAPI used before) and with serialization.dumps, and reports the
+payload size of full responses against common `fields` selections
+
+Usage:
+    python benchmarks/serialization.py --iterations 2000 --json serialization.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+# Field selections a compact client (e.g. the mobile recruiter view) would ask for
+FIELD_SELECTIONS = {
+    "match": ["score,matched_skills,missing_jd_skills", "score"],
+    "parse": ["skills,experience", "skills"]
+}
+
+
+def time_encoder(encode, content, iterations):
+    """Median and p99 time of one encode call in microseconds"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        encode(content)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return round(statistics.median(samples), 1), round(samples[int(len(samples) * 0.99) - 1], 1)
+
+
+def stdlib_dumps(content):
+    return json.dumps(content, default=str).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON encoders and response sizes on ATS results")
+    parser.add_argument("--iterations", type=int, default=2000, help="Encode calls per measurement")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    import ats_core
+    from serialization import dumps, parse_fields, select_fields, JSON_BACKEND
+
+    ats_core.initialize_nlp()
+    parsed_jd = ats_core.parse_document(ats_core.WARMUP_JD_TEXT.encode("utf-8"), "txt", is_jd=True)
+    parsed_cv = ats_core.parse_document(ats_core.WARMUP_CV_TEXT.encode("utf-8"), "txt", is_jd=False)
+    documents = {"match": ats_core.calculate_match_score(parsed_jd, parsed_cv), "parse": parsed_cv}
+
+    print(f"🚀 Serialization benchmark ({JSON_BACKEND} vs json), {args.iterations} iterations")
+    print(f"{'response':<10} {'encoder':<8} {'median_us':>10} {'p99_us':>9} {'bytes':>8}")
+    results = []
+    for name, content in documents.items():
+        for encoder_name, encode in (("json", stdlib_dumps), (JSON_BACKEND, dumps)):
+            median_us, p99_us = time_encoder(encode, content, args.iterations)
+            size = len(encode(content))
+            results.append({"response": name, "encoder": encoder_name, "median_us": median_us,
+                            "p99_us": p99_us, "bytes": size})
+            print(f"{name:<10} {encoder_name:<8} {median_us:>10} {p99_us:>9} {size:>8}")
+
+    print("\nPayload size with a fields selection:")
+    sizes = []
+    for name, selections in FIELD_SELECTIONS.items():
+        full = len(dumps(documents[name]))
+        for fields in selections:
+            size = len(dumps(select_fields(documents[name], parse_fields(fields))))
+            sizes.append({"response": name, "fields": fields, "bytes": size, "full_bytes": full})
+            print(f"   {name:<6} fields={fields:<40} {size:>7} bytes ({size / full:.0%} of {full})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "serialization", "backend": JSON_BACKEND,
+                       "encoders": results, "field_selections": sizes}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Admission control for the ATS endpoints
+A concurrency limiter with a bounded wait queue: requests beyond the queue
+are rejected immediately so admitted requests keep a flat latency under load
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; carries a Retry-After hint in seconds"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Limit concurrent work to `max_concurrency` with at most `max_queue` waiters.
+
+    Waiters are served in arrival order. A request that cannot join the queue,
+    or that waits longer than `queue_timeout` seconds, is rejected with
+    AdmissionRejected. Must be used from a single event loop.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int,
+                 queue_timeout: Optional[float] = None, retry_after: int = 1):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._active = 0
+        self._waiters = deque()
+        self.admitted_total = 0
+        self.rejected_total = 0
+        self.timed_out_total = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> float:
+        """Wait for a slot and return the time spent queueing in seconds"""
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self._record_admission(0.0)
+            return 0.0
+
+        if self.queue_depth >= self.max_queue:
+            self.rejected_total += 1
+            raise AdmissionRejected(f"{self.name} queue is full", self.retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up: pass it on
+                self.release()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out_total += 1
+                self.rejected_total += 1
+                raise AdmissionRejected(f"{self.name} queue wait timed out", self.retry_after)
+            raise
+
+        waited = time.perf_counter() - start
+        self._record_admission(waited)
+        return waited
+
+    def release(self):
+        """Free a slot, handing it directly to the oldest live waiter if any"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a slot for the duration of the block"""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _record_admission(self, waited: float):
+        self.admitted_total += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> Dict:
+        """Current queue depth, rejections and wait times"""
+        return {
+            "active": self._active,
+            "queue_depth": self.queue_depth,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted_total": self.admitted_total,
+            "rejected_total": self.rejected_total,
+            "timed_out_total": self.timed_out_total,
+            "avg_wait_ms": round(self.wait_seconds_total / self.admitted_total * 1000, 2) if self.admitted_total else 0.0,
+            "max_wait_ms": round(self.wait_seconds_max * 1000, 2)
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that holds an admission slot while a request is handled.
+
+    Admission happens before anything reads the request body, so a rejected
+    upload is never received or spooled: it gets a 503 with Retry-After at
+    once and the connection is closed. `routes` lists (method, path regex,
+    controller); other requests pass straight through. A streamed response
+    keeps its slot until the stream ends.
+    """
+
+    def __init__(self, app, routes: List[Tuple[str, str, AdmissionController]]):
+        self.app = app
+        self.routes = [(method, re.compile(pattern), controller) for method, pattern, controller in routes]
+
+    def controller_for(self, method: str, path: str) -> Optional[AdmissionController]:
+        for route_method, pattern, controller in self.routes:
+            if method == route_method and pattern.fullmatch(path):
+                return controller
+        return None
+
+    async def __call__(self, scope, receive, send):
+        controller = self.controller_for(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await controller.acquire()
+        except AdmissionRejected as e:
+            logger.warning(f"Rejected {controller.name} request: {e}")
+            await self.reject(send, e)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release()
+
+    @staticmethod
+    async def reject(send, rejection: AdmissionRejected):
+        body = json.dumps({"detail": f"Server is busy ({rejection}). Please retry later."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(rejection.retry_after).encode()),
+                # The unread body is not drained, so the connection cannot be reused
+                (b"connection", b"close")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
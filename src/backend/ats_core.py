@@ -6,6 +6,10 @@ Framework-agnostic design for maximum flexibility
 
 import re
 import io
+import os
+import threading
+import time
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 from docx import Document
 from pypdf import PdfReader
@@ -15,46 +19,126 @@ from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize, sent_tokenize
 from spacy.matcher import PhraseMatcher
 import logging
-import spacy.cli # Import spacy.cli for programmatic downloads
+from batching import MicroBatcher
+from metrics import PARSE_STAGE_SECONDS, MATCH_COMPONENT_SECONDS, StageTimer, count_fallback
+from profiling import current_profile, count as profile_count
 
-# Configure logging for better visibility of issues
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Model locations. Importing this module loads nothing and never touches the
+# network; initialize_nlp() loads from these locations exactly once.
+# ATS_SPACY_MODEL may be an installed package name or a path to a model directory,
+# ATS_NLTK_DATA an os.pathsep-separated list of NLTK data directories.
+SPACY_MODEL = os.getenv("ATS_SPACY_MODEL", "en_core_web_sm")
+NLTK_DATA_PATHS = [p for p in os.getenv("ATS_NLTK_DATA", "").split(os.pathsep) if p]
 
 # Global spaCy model - loaded once for efficiency
 nlp = None
 
-def initialize_nlp():
-    """Initialize spaCy model and NLTK data"""
-    global nlp
-    try:
-        # Try to load 'en_core_web_sm' first, as requested in previous instructions
-        nlp = spacy.load("en_core_web_sm")
-        logging.info("Successfully loaded spaCy model 'en_core_web_sm'.")
-    except OSError:
-        # If model not found, attempt to download it
-        logging.warning("spaCy model 'en_core_web_sm' not found. Attempting to download it.")
+# Optional micro-batcher that merges nlp() calls from concurrent requests into nlp.pipe batches
+doc_batcher = None
+
+# Multi-word skill matcher, compiled once against the loaded model's vocab
+skill_matcher = None
+
+_nlp_lock = threading.Lock()
+_nlp_status = {
+    "initialized": False,
+    "spacy_model": SPACY_MODEL,
+    "spacy_loaded": False,
+    "nltk_data": {},
+    "load_seconds": None,
+    "warmed_up": False,
+    "warmup_seconds": None
+}
+
+def initialize_nlp() -> bool:
+    """
+    Load the spaCy model and check NLTK data, exactly once per process.
+    
+    Nothing is downloaded: install the model and NLTK data ahead of time
+    (see setup_ats.py) or point ATS_SPACY_MODEL / ATS_NLTK_DATA at local copies.
+    Later calls return the outcome of the first one. Returns True if the spaCy
+    model is available.
+    """
+    global nlp, skill_matcher
+    if _nlp_status["initialized"]:
+        return nlp is not None
+    with _nlp_lock:
+        if _nlp_status["initialized"]:
+            return nlp is not None
+        start = time.perf_counter()
+        
+        for path in NLTK_DATA_PATHS:
+            if path not in nltk.data.path:
+                nltk.data.path.insert(0, path)
+        for name, resource in (("stopwords", "corpora/stopwords"), ("punkt", "tokenizers/punkt")):
+            try:
+                nltk.data.find(resource)
+                _nlp_status["nltk_data"][name] = True
+            except LookupError:
+                _nlp_status["nltk_data"][name] = False
+                logging.warning(f"NLTK data '{name}' not found; related processing will use fallbacks.")
+        
         try:
-            spacy.cli.download("en_core_web_sm")
-            nlp = spacy.load("en_core_web_sm")
-            logging.info("Successfully downloaded and loaded spaCy model 'en_core_web_sm'.")
+            nlp = spacy.load(SPACY_MODEL)
+            patterns = [nlp.make_doc(skill) for skill in PROFESSIONAL_SKILLS if len(skill.split()) > 1]
+            skill_matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+            if patterns: # Only add if there are patterns to avoid empty matcher issues
+                skill_matcher.add("SKILLS", patterns)
+            logging.info(f"Successfully loaded spaCy model '{SPACY_MODEL}'.")
         except Exception as e:
-            logging.error(f"Failed to download or load spaCy model 'en_core_web_sm' even after attempt: {e}")
-            nlp = None # Ensure nlp is None if loading failed
-            return False # Indicate failure
-    except Exception as e:
-        logging.error(f"Failed to initialize NLP models due to an unexpected error: {e}")
-        nlp = None # Ensure nlp is None if loading failed
-        return False # Indicate failure
+            logging.error(f"Failed to load spaCy model '{SPACY_MODEL}': {e}. "
+                          f"Install it with 'python -m spacy download en_core_web_sm' or set ATS_SPACY_MODEL.")
+            nlp = None
+            skill_matcher = None
+        
+        _nlp_status["spacy_loaded"] = nlp is not None
+        _nlp_status["load_seconds"] = round(time.perf_counter() - start, 3)
+        _nlp_status["initialized"] = True
+        return nlp is not None
 
-    # Download required NLTK data
-    try:
-        nltk.download('stopwords', quiet=True)
-        nltk.download('punkt', quiet=True)
-        logging.info("Successfully downloaded NLTK data (stopwords, punkt).")
-        return True # Indicate overall success
-    except Exception as e:
-        logging.error(f"Failed to download NLTK data: {e}")
-        return False # Indicate failure
+def nlp_status() -> Dict:
+    """Model loading and warm-up state, for readiness checks"""
+    return {**_nlp_status, "nltk_data": dict(_nlp_status["nltk_data"])}
+
+@lru_cache(maxsize=1)
+def english_stopwords() -> frozenset:
+    """NLTK English stopwords, read from disk once"""
+    return frozenset(stopwords.words('english'))
+
+
+def enable_micro_batching(max_batch_size: int = 16, max_wait_ms: float = 5.0) -> MicroBatcher:
+    """Route spaCy calls through a shared micro-batcher (call after initialize_nlp)"""
+    global doc_batcher
+    disable_micro_batching()
+    doc_batcher = MicroBatcher(
+        lambda texts: nlp.pipe(texts, batch_size=max_batch_size),
+        max_batch_size=max_batch_size,
+        max_wait_ms=max_wait_ms,
+        name="ats-nlp-batcher"
+    )
+    logging.info(f"spaCy micro-batching enabled (max_batch_size={max_batch_size}, max_wait_ms={max_wait_ms}).")
+    return doc_batcher
+
+def disable_micro_batching():
+    """Stop the micro-batcher and go back to direct nlp() calls"""
+    global doc_batcher
+    if doc_batcher is not None:
+        doc_batcher.stop()
+        doc_batcher = None
+
+def make_doc(text: str):
+    """Run the spaCy pipeline over one text, batched with concurrent callers when enabled"""
+    profile_count("spacy_calls")
+    if doc_batcher is not None:
+        return doc_batcher.process(text)
+    return nlp(text)
+
+def make_docs(texts: List[str]) -> list:
+    """Run the spaCy pipeline over several texts, batched when enabled"""
+    profile_count("spacy_calls", len(texts))
+    if doc_batcher is not None:
+        return doc_batcher.process_many(texts)
+    return list(nlp.pipe(texts))
 
 
 # Common professional skills dictionary for enhanced matching
@@ -105,11 +189,13 @@ def extract_text_from_pdf(pdf_bytes: bytes) -> str:
                 text += page.extract_text() + "\n"
             except Exception as e:
                 logging.warning(f"Failed to extract text from PDF page: {e}")
+                count_fallback("pdf_page_error")
                 continue
                 
         return text.strip()
     except Exception as e:
         logging.error(f"Failed to extract text from PDF: {e}")
+        count_fallback("pdf_error")
         return ""
 
 def extract_text_from_docx(docx_bytes: bytes) -> str:
@@ -132,6 +218,7 @@ def extract_text_from_docx(docx_bytes: bytes) -> str:
         return text.strip()
     except Exception as e:
         logging.error(f"Failed to extract text from DOCX: {e}")
+        count_fallback("docx_error")
         return ""
 
 def extract_text_from_txt(txt_bytes: bytes) -> str:
@@ -147,6 +234,7 @@ def extract_text_from_txt(txt_bytes: bytes) -> str:
                 continue
                 
         # If all encodings fail, use utf-8 with error handling
+        count_fallback("txt_decode_error")
         return txt_bytes.decode('utf-8', errors='ignore').strip()
     except Exception as e:
         logging.error(f"Failed to extract text from TXT: {e}")
@@ -169,13 +257,13 @@ def clean_text(text: str) -> str:
         
         # Remove stopwords
         try:
-            # Ensure stopwords are downloaded
-            stop_words = set(stopwords.words('english'))
+            stop_words = english_stopwords()
             word_tokens = word_tokenize(text)
             filtered_text = [word for word in word_tokens if word not in stop_words and len(word) > 2]
             text = ' '.join(filtered_text)
         except Exception as e:
             logging.warning(f"NLTK stopwords/punkt data not available or error during tokenization: {e}. Skipping stopword removal.")
+            count_fallback("nltk_unavailable")
             # Fallback if NLTK data not available or error
             pass
             
@@ -191,6 +279,7 @@ def extract_skills(text: str) -> List[str]:
         # Attempt to initialize if not already successful
         if not initialize_nlp():
             logging.warning("NLP model not loaded, skill extraction will be limited to keyword matching.")
+            count_fallback("skills_nlp_not_loaded")
             # Fallback to basic keyword matching if NLP not available
             found_skills = set()
             text_lower = text.lower()
@@ -203,7 +292,7 @@ def extract_skills(text: str) -> List[str]:
     
     try:
         # Use spaCy for entity recognition and phrase matching
-        doc = nlp(text.lower())
+        doc = make_doc(text.lower())
         
         # Extract noun phrases and entities that might be skills
         for token in doc:
@@ -211,13 +300,8 @@ def extract_skills(text: str) -> List[str]:
                 if token.text in PROFESSIONAL_SKILLS:
                     skills.add(token.text)
         
-        # Extract multi-word skills using phrase matching
-        matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-        patterns = [nlp(skill) for skill in PROFESSIONAL_SKILLS if len(skill.split()) > 1]
-        if patterns: # Only add if there are patterns to avoid empty matcher issues
-            matcher.add("SKILLS", patterns)
-        
-        matches = matcher(doc)
+        # Extract multi-word skills using the phrase matcher compiled at load time
+        matches = skill_matcher(doc)
         for match_id, start, end in matches:
             skill = doc[start:end].text.lower()
             skills.add(skill)
@@ -230,9 +314,12 @@ def extract_skills(text: str) -> List[str]:
             r'(?:skills|technologies|proficiencies):\s*([a-zA-Z0-9\s\-\.,#]+)', # for colon-separated lists
         ]
         
+        profile = current_profile()
         for pattern in skill_patterns:
             matches = re.finditer(pattern, text, re.IGNORECASE)
             for match in matches:
+                if profile is not None:
+                    profile.count("regex_matches.extract_skills")
                 # Split by common delimiters if it's a list
                 potential_skills_str = match.group(1).strip()
                 potential_skills_list = re.split(r'[,/;]', potential_skills_str) # Split by comma, slash, or semicolon
@@ -252,6 +339,7 @@ def extract_skills(text: str) -> List[str]:
         
     except Exception as e:
         logging.error(f"Failed to extract skills with NLP: {e}")
+        count_fallback("skills_nlp_error")
         # Fallback if NLP processing fails unexpectedly
         found_skills = set()
         text_lower = text.lower()
@@ -279,9 +367,12 @@ def extract_experience(text: str) -> Dict:
         ]
         
         years = []
+        profile = current_profile()
         for pattern in year_patterns:
             matches = re.finditer(pattern, text, re.IGNORECASE)
             for match in matches:
+                if profile is not None:
+                    profile.count("regex_matches.extract_experience")
                 try:
                     if len(match.groups()) == 2 and match.group(2) is not None: # For range pattern
                         years.append(float(match.group(1)))
@@ -358,10 +449,13 @@ def extract_ctc_info(text: str) -> Dict:
         ]
         
         text_lower = text.lower()
+        profile = current_profile()
         
         for pattern in salary_patterns:
             matches = re.finditer(pattern, text_lower, re.IGNORECASE)
             for match in matches:
+                if profile is not None:
+                    profile.count("regex_matches.extract_ctc_info")
                 try:
                     # Safely get groups, handling optional ones
                     min_val_str = match.group(1).replace(',', '') if match.group(1) else None
@@ -425,6 +519,7 @@ def extract_academic_info(text: str) -> Dict:
             "publications": [],
             "awards": []
         }
+        profile = current_profile()
         
         # Degree patterns
         degree_patterns = [
@@ -437,6 +532,8 @@ def extract_academic_info(text: str) -> Dict:
         for pattern in degree_patterns:
             matches = re.finditer(pattern, text, re.IGNORECASE)
             for match in matches:
+                if profile is not None:
+                    profile.count("regex_matches.extract_academic_info")
                 # Extract surrounding context for full degree name
                 start = max(0, match.start() - 50)
                 end = min(len(text), match.end() + 50)
@@ -455,6 +552,8 @@ def extract_academic_info(text: str) -> Dict:
         for pattern in university_patterns:
             matches = re.finditer(pattern, text, re.IGNORECASE)
             for match in matches:
+                if profile is not None:
+                    profile.count("regex_matches.extract_academic_info")
                 academic_info["universities"].append(match.group(0).strip())
         
         # Publication patterns
@@ -468,6 +567,8 @@ def extract_academic_info(text: str) -> Dict:
         for pattern in publication_patterns:
             matches = re.finditer(pattern, text, re.IGNORECASE)
             for match in matches:
+                if profile is not None:
+                    profile.count("regex_matches.extract_academic_info")
                 academic_info["publications"].append(match.group(0).strip())
         
         # Awards patterns
@@ -481,6 +582,8 @@ def extract_academic_info(text: str) -> Dict:
         for pattern in award_patterns:
             matches = re.finditer(pattern, text, re.IGNORECASE)
             for match in matches:
+                if profile is not None:
+                    profile.count("regex_matches.extract_academic_info")
                 # Extract surrounding context
                 start = max(0, match.start() - 30)
                 end = min(len(text), match.end() + 30)
@@ -503,6 +606,7 @@ def extract_key_responsibilities_from_jd(text: str) -> List[str]:
     if not nlp:
         if not initialize_nlp():
             logging.warning("NLP model not loaded, responsibility extraction will be limited.")
+            count_fallback("responsibilities_nlp_not_loaded")
             # Fallback for responsibility extraction if NLP fails
             sentences = sent_tokenize(text)
             responsibilities = []
@@ -532,7 +636,9 @@ def extract_key_responsibilities_from_jd(text: str) -> List[str]:
         
         # Split text into sentences
         sentences = sent_tokenize(text)
+        profile_count("sentences_processed", len(sentences))
         
+        candidates = []
         for sentence in sentences:
             sentence_lower = sentence.lower()
             
@@ -550,35 +656,40 @@ def extract_key_responsibilities_from_jd(text: str) -> List[str]:
             ])
             
             if (has_responsibility_verb or is_bullet_point or has_requirement_indicator) and len(sentence.strip()) > 20:
-                # Use spaCy to get the main clause/root if available for better extraction
-                if nlp:
-                    doc_sentence = nlp(sentence.strip())
-                    # Try to find the main verb and its direct object for a more concise responsibility
-                    main_clause = []
-                    # Heuristic: Find root verb and its direct object/complement
-                    root_token = None
-                    for token in doc_sentence:
-                        if token.dep_ == 'ROOT':
-                            root_token = token
-                            break
-                    
-                    if root_token:
-                        main_clause.append(root_token.text)
-                        for child in root_token.children:
-                            if child.dep_ in ['dobj', 'attr', 'acomp', 'xcomp', 'prep', 'npadvmod', 'compound', 'amod', 'nmod']:
-                                main_clause.append(child.text)
-                    
-                    if main_clause:
-                        clean_resp = ' '.join(main_clause).strip()
-                    else:
-                        clean_resp = re.sub(r'^\s*[\-\*\•\d+\.\)]\s*', '', sentence.strip())
-                else:
-                    clean_resp = re.sub(r'^\s*[\-\*\•\d+\.\)]\s*', '', sentence.strip())
+                candidates.append(sentence.strip())
+        
+        # Parse all candidate sentences in one batch instead of one nlp() call each
+        candidate_docs = make_docs(candidates) if nlp and candidates else [None] * len(candidates)
+        
+        for sentence, doc_sentence in zip(candidates, candidate_docs):
+            # Use spaCy to get the main clause/root if available for better extraction
+            if doc_sentence is not None:
+                # Try to find the main verb and its direct object for a more concise responsibility
+                main_clause = []
+                # Heuristic: Find root verb and its direct object/complement
+                root_token = None
+                for token in doc_sentence:
+                    if token.dep_ == 'ROOT':
+                        root_token = token
+                        break
                 
-                clean_resp = clean_resp.strip()
+                if root_token:
+                    main_clause.append(root_token.text)
+                    for child in root_token.children:
+                        if child.dep_ in ['dobj', 'attr', 'acomp', 'xcomp', 'prep', 'npadvmod', 'compound', 'amod', 'nmod']:
+                            main_clause.append(child.text)
                 
-                if len(clean_resp) > 15 and len(clean_resp) < 200:
-                    responsibilities.append(clean_resp)
+                if main_clause:
+                    clean_resp = ' '.join(main_clause).strip()
+                else:
+                    clean_resp = re.sub(r'^\s*[\-\*\•\d+\.\)]\s*', '', sentence)
+            else:
+                clean_resp = re.sub(r'^\s*[\-\*\•\d+\.\)]\s*', '', sentence)
+            
+            clean_resp = clean_resp.strip()
+            
+            if len(clean_resp) > 15 and len(clean_resp) < 200:
+                responsibilities.append(clean_resp)
         
         # Remove duplicates and sort by length (longer ones first, likely more detailed)
         responsibilities = list(set(responsibilities))
@@ -593,46 +704,56 @@ def extract_key_responsibilities_from_jd(text: str) -> List[str]:
 
 def parse_document(file_content: bytes, file_type: str, is_jd: bool) -> Dict:
     """Parse document and extract all relevant information"""
-    try:
-        # Extract text based on file type
-        if file_type.lower() == 'pdf':
-            raw_text = extract_text_from_pdf(file_content)
-        elif file_type.lower() in ['docx', 'doc']:
-            raw_text = extract_text_from_docx(file_content)
-        elif file_type.lower() == 'txt':
-            raw_text = extract_text_from_txt(file_content)
-        else:
-            raise ValueError(f"Unsupported file type: {file_type}")
-        
-        if not raw_text:
-            raise ValueError("No text could be extracted from the document")
-        
-        # Clean text for processing (for general text fields)
-        cleaned_text = clean_text(raw_text)
-        
-        # Extract common information for both JD and CV
-        parsed_data = {
-            "text": raw_text,
-            "cleaned_text": cleaned_text,
-            "skills": extract_skills(raw_text), # Use raw text for skills to preserve casing for proper nouns in specific cases
-            "experience": extract_experience(raw_text),
-            "ctc": extract_ctc_info(raw_text)
-        }
-        
-        # Extract CV-specific information
-        if not is_jd:
-            parsed_data["academic_info"] = extract_academic_info(raw_text)
+    with StageTimer(PARSE_STAGE_SECONDS, "stage", file_type=file_type.lower()) as timer:
+        try:
+            # Extract text based on file type
+            if file_type.lower() == 'pdf':
+                raw_text = extract_text_from_pdf(file_content)
+            elif file_type.lower() in ['docx', 'doc']:
+                raw_text = extract_text_from_docx(file_content)
+            elif file_type.lower() == 'txt':
+                raw_text = extract_text_from_txt(file_content)
+            else:
+                count_fallback("unsupported_file_type")
+                raise ValueError(f"Unsupported file type: {file_type}")
+            timer.lap("extract_text")
             
-        # Extract JD-specific information
-        if is_jd:
-            parsed_data["key_responsibilities"] = extract_key_responsibilities_from_jd(raw_text)
-        
-        return parsed_data
-        
-    except Exception as e:
-        logging.error(f"Failed to parse document: {e}")
-        # Re-raise the exception to be handled by the Flask app
-        raise
+            if not raw_text:
+                count_fallback("empty_text")
+                raise ValueError("No text could be extracted from the document")
+            
+            # Clean text for processing (for general text fields)
+            cleaned_text = clean_text(raw_text)
+            timer.lap("clean_text")
+            
+            # Extract common information for both JD and CV
+            parsed_data = {
+                "text": raw_text,
+                "cleaned_text": cleaned_text
+            }
+            parsed_data["skills"] = extract_skills(raw_text) # Use raw text for skills to preserve casing for proper nouns in specific cases
+            timer.lap("extract_skills")
+            parsed_data["experience"] = extract_experience(raw_text)
+            timer.lap("extract_experience")
+            parsed_data["ctc"] = extract_ctc_info(raw_text)
+            timer.lap("extract_ctc_info")
+            
+            # Extract CV-specific information
+            if not is_jd:
+                parsed_data["academic_info"] = extract_academic_info(raw_text)
+                timer.lap("extract_academic_info")
+                
+            # Extract JD-specific information
+            if is_jd:
+                parsed_data["key_responsibilities"] = extract_key_responsibilities_from_jd(raw_text)
+                timer.lap("extract_key_responsibilities_from_jd")
+            
+            return parsed_data
+            
+        except Exception as e:
+            logging.error(f"Failed to parse document: {e}")
+            # Re-raise the exception to be handled by the Flask app
+            raise
 
 def calculate_similarity_score(text1: str, text2: str) -> float:
     """Calculate similarity between two text snippets using spaCy's embeddings"""
@@ -640,6 +761,7 @@ def calculate_similarity_score(text1: str, text2: str) -> float:
     if not nlp:
         if not initialize_nlp():
             logging.warning("NLP model not loaded, falling back to basic word overlap for similarity.")
+            count_fallback("similarity_nlp_not_loaded")
             # Fallback to simple word overlap if NLP is not available
             words1 = set(text1.lower().split())
             words2 = set(text2.lower().split())
@@ -648,11 +770,11 @@ def calculate_similarity_score(text1: str, text2: str) -> float:
             return len(intersection) / len(union) if union else 0
 
     try:
-        doc1 = nlp(text1)
-        doc2 = nlp(text2)
+        doc1, doc2 = make_docs([text1, text2])
         # Ensure documents have vectors before calculating similarity
         if not doc1.has_vector or not doc2.has_vector:
              logging.warning("One or both documents do not have word vectors. Falling back to basic word overlap for similarity.")
+             count_fallback("similarity_no_vectors")
              words1 = set(text1.lower().split())
              words2 = set(text2.lower().split())
              intersection = words1.intersection(words2)
@@ -671,281 +793,360 @@ def calculate_similarity_score(text1: str, text2: str) -> float:
 
 def calculate_match_score(parsed_jd: Dict, parsed_cv: Dict) -> Dict:
     """Calculate comprehensive match score with detailed feedback"""
-    try:
-        result = {
-            "score": 0,
-            "matched_skills": [],
-            "missing_jd_skills": [],
-            "extra_cv_skills": [],
-            "experience_feedback": "",
-            "ctc_feedback": "",
-            "academic_alignment_feedback": "",
-            "jd_responsibilities_matched_in_cv": []
-        }
-        
-        jd_skills = set(skill.lower() for skill in parsed_jd.get("skills", []))
-        cv_skills = set(skill.lower() for skill in parsed_cv.get("skills", []))
-        
-        # Skills Analysis (60% weight) - Adjusted weight
-        matched_skills = jd_skills.intersection(cv_skills)
-        missing_skills = jd_skills - cv_skills
-        extra_skills = cv_skills - jd_skills
-        
-        result["matched_skills"] = list(matched_skills)
-        result["missing_jd_skills"] = list(missing_skills)
-        result["extra_cv_skills"] = list(extra_skills)
-        
-        # Calculate skills score based on matched vs. required
-        skills_score = 0
-        if jd_skills:
-            # Emphasize matching crucial skills more if available
-            crucial_skills_jd = {s for s in jd_skills if s in PROFESSIONAL_SKILLS} # Skills from the defined list
-            if crucial_skills_jd:
-                matched_crucial = crucial_skills_jd.intersection(cv_skills)
-                skills_score = (len(matched_crucial) / len(crucial_skills_jd)) * 100
-            else: # If JD has no 'professional' skills, just use general skill overlap
-                 skills_score = (len(matched_skills) / len(jd_skills)) * 100
-        else:
-            skills_score = 50 # Neutral if no skills defined in JD
-        
-        # Experience Analysis (20% weight)
-        jd_exp = parsed_jd.get("experience", {})
-        cv_exp = parsed_cv.get("experience", {})
-        
-        jd_years = jd_exp.get("years_of_experience", 0)
-        cv_years = cv_exp.get("years_of_experience", 0)
-        jd_seniority = jd_exp.get("seniority_level", "Entry-Level")
-        cv_seniority = cv_exp.get("seniority_level", "Entry-Level")
-        
-        experience_score = 0
-        # If JD specifies experience, compare
-        if jd_years > 0:
-            if cv_years >= jd_years:
-                experience_score = 100
-            elif cv_years >= jd_years * 0.9:
-                experience_score = 90
-            elif cv_years >= jd_years * 0.7:
-                experience_score = 70
-            elif cv_years >= jd_years * 0.5:
-                experience_score = 50
-            else:
-                experience_score = max(0, (cv_years / jd_years) * 40) # Lower score for significant gaps
-        else: # If JD doesn't specify years, a reasonable amount of experience is good
-            if cv_years > 0:
-                experience_score = 80 # Good if CV has experience but JD doesn't specify
+    with StageTimer(MATCH_COMPONENT_SECONDS, "component") as timer:
+        try:
+            result = {
+                "score": 0,
+                "matched_skills": [],
+                "missing_jd_skills": [],
+                "extra_cv_skills": [],
+                "experience_feedback": "",
+                "ctc_feedback": "",
+                "academic_alignment_feedback": "",
+                "jd_responsibilities_matched_in_cv": []
+            }
+            
+            jd_skills = set(skill.lower() for skill in parsed_jd.get("skills", []))
+            cv_skills = set(skill.lower() for skill in parsed_cv.get("skills", []))
+            
+            # Skills Analysis (60% weight) - Adjusted weight
+            matched_skills = jd_skills.intersection(cv_skills)
+            missing_skills = jd_skills - cv_skills
+            extra_skills = cv_skills - jd_skills
+            
+            result["matched_skills"] = list(matched_skills)
+            result["missing_jd_skills"] = list(missing_skills)
+            result["extra_cv_skills"] = list(extra_skills)
+            
+            # Calculate skills score based on matched vs. required
+            skills_score = 0
+            if jd_skills:
+                # Emphasize matching crucial skills more if available
+                crucial_skills_jd = {s for s in jd_skills if s in PROFESSIONAL_SKILLS} # Skills from the defined list
+                if crucial_skills_jd:
+                    matched_crucial = crucial_skills_jd.intersection(cv_skills)
+                    skills_score = (len(matched_crucial) / len(crucial_skills_jd)) * 100
+                else: # If JD has no 'professional' skills, just use general skill overlap
+                     skills_score = (len(matched_skills) / len(jd_skills)) * 100
             else:
-                experience_score = 50 # Neutral if neither specifies
-        
-        # Adjust experience score based on seniority level alignment
-        jd_seniority_val = SENIORITY_LEVELS.get(jd_seniority.lower(), 1)
-        cv_seniority_val = SENIORITY_LEVELS.get(cv_seniority.lower(), 1)
-        
-        if cv_seniority_val >= jd_seniority_val:
-            experience_score = min(100, experience_score + 10) # Bonus for matching or exceeding seniority
-        elif cv_seniority_val < jd_seniority_val:
-            experience_score = max(0, experience_score - 15) # Penalty for lower seniority
-
-        # Experience feedback
-        if cv_years >= jd_years and cv_seniority_val >= jd_seniority_val:
-            result["experience_feedback"] = f"Excellent match: Candidate's {cv_years} years of {cv_seniority} experience matches or exceeds the JD's {jd_years}+ years {jd_seniority} requirement."
-        elif cv_years >= jd_years * 0.7:
-            result["experience_feedback"] = f"Good match: Candidate's {cv_years} years of {cv_seniority} experience is closely aligned with the JD's {jd_years}+ years {jd_seniority} requirement."
-        else:
-            result["experience_feedback"] = f"Experience gap: Candidate's {cv_years} years of {cv_seniority} experience is below the JD's {jd_years}+ years {jd_seniority} requirement. Consider for junior roles or if other areas compensate."
-        
-        # CTC Analysis (10% weight) - Adjusted weight
-        jd_ctc = parsed_jd.get("ctc", {})
-        cv_ctc = parsed_cv.get("ctc", {})
-        
-        ctc_score = 50 # Default neutral score if no info or major mismatch
-        
-        if jd_ctc and cv_ctc:
-            jd_min = jd_ctc.get("min_value", 0)
-            jd_max = jd_ctc.get("max_value", jd_min)
-            cv_min = cv_ctc.get("min_value", 0)
-            cv_max = cv_ctc.get("max_value", cv_min)
-            
-            # Simple check if currencies match
-            if jd_ctc.get("currency") != cv_ctc.get("currency"):
-                result["ctc_feedback"] = f"Warning: CTC currencies differ (JD: {jd_ctc.get('currency')}, CV: {cv_ctc.get('currency')}). Cannot compare directly."
-                ctc_score = 20 # Low score if currencies don't match, as direct comparison is invalid
+                skills_score = 50 # Neutral if no skills defined in JD
+            timer.lap("skills")
+            
+            # Experience Analysis (20% weight)
+            jd_exp = parsed_jd.get("experience", {})
+            cv_exp = parsed_cv.get("experience", {})
+            
+            jd_years = jd_exp.get("years_of_experience", 0)
+            cv_years = cv_exp.get("years_of_experience", 0)
+            jd_seniority = jd_exp.get("seniority_level", "Entry-Level")
+            cv_seniority = cv_exp.get("seniority_level", "Entry-Level")
+            
+            experience_score = 0
+            # If JD specifies experience, compare
+            if jd_years > 0:
+                if cv_years >= jd_years:
+                    experience_score = 100
+                elif cv_years >= jd_years * 0.9:
+                    experience_score = 90
+                elif cv_years >= jd_years * 0.7:
+                    experience_score = 70
+                elif cv_years >= jd_years * 0.5:
+                    experience_score = 50
+                else:
+                    experience_score = max(0, (cv_years / jd_years) * 40) # Lower score for significant gaps
+            else: # If JD doesn't specify years, a reasonable amount of experience is good
+                if cv_years > 0:
+                    experience_score = 80 # Good if CV has experience but JD doesn't specify
+                else:
+                    experience_score = 50 # Neutral if neither specifies
+            
+            # Adjust experience score based on seniority level alignment
+            jd_seniority_val = SENIORITY_LEVELS.get(jd_seniority.lower(), 1)
+            cv_seniority_val = SENIORITY_LEVELS.get(cv_seniority.lower(), 1)
+            
+            if cv_seniority_val >= jd_seniority_val:
+                experience_score = min(100, experience_score + 10) # Bonus for matching or exceeding seniority
+            elif cv_seniority_val < jd_seniority_val:
+                experience_score = max(0, experience_score - 15) # Penalty for lower seniority
+
+            # Experience feedback
+            if cv_years >= jd_years and cv_seniority_val >= jd_seniority_val:
+                result["experience_feedback"] = f"Excellent match: Candidate's {cv_years} years of {cv_seniority} experience matches or exceeds the JD's {jd_years}+ years {jd_seniority} requirement."
+            elif cv_years >= jd_years * 0.7:
+                result["experience_feedback"] = f"Good match: Candidate's {cv_years} years of {cv_seniority} experience is closely aligned with the JD's {jd_years}+ years {jd_seniority} requirement."
             else:
-                currency_symbol = jd_ctc.get('currency', '') # Use the common currency symbol for feedback
-                
-                # Perfect overlap (CV expectation is within JD range)
-                if cv_min >= jd_min and cv_max <= jd_max:
-                    ctc_score = 100
-                    result["ctc_feedback"] = f"Excellent alignment: Candidate's expected CTC ({currency_symbol} {cv_min:,.0f} - {cv_max:,.0f}) is perfectly within the JD's range ({currency_symbol} {jd_min:,.0f} - {jd_max:,.0f})."
-                # CV expects less than JD min
-                elif cv_max < jd_min:
-                    ctc_score = 90
-                    result["ctc_feedback"] = f"Favorable: Candidate's expected CTC ({currency_symbol} {cv_min:,.0f} - {cv_max:,.0f}) is below the JD's minimum ({currency_symbol} {jd_min:,.0f})."
-                # Partial overlap (CV min is less than JD max, but CV max is higher than JD max)
-                elif cv_min < jd_max and cv_max > jd_max:
-                    # Calculate how far above the JD max the CV goes
-                    # Using a simplified overlap percentage for scoring clarity
-                    overlap_amount = min(cv_max, jd_max) - max(cv_min, jd_min)
-                    if overlap_amount > 0:
-                        overlap_ratio = overlap_amount / (jd_max - jd_min) if (jd_max - jd_min) > 0 else 0
-                        ctc_score = 50 + (overlap_ratio * 50) # Scale score based on overlap
-                    else:
-                        ctc_score = 50 # No positive overlap
-                    
-                    result["ctc_feedback"] = f"Moderate overlap: Candidate's expected CTC ({currency_symbol} {cv_min:,.0f} - {cv_max:,.0f}) partially overlaps with JD range ({currency_symbol} {jd_min:,.0f} - {jd_max:,.0f}), leaning slightly higher."
-                # CV expects more than JD max
-                elif cv_min > jd_max:
-                    gap_percentage = ((cv_min - jd_max) / jd_max) * 100 if jd_max > 0 else 100
-                    if gap_percentage <= 15:
-                        ctc_score = 70
-                        result["ctc_feedback"] = f"Slight mismatch: Candidate's expected CTC ({currency_symbol} {cv_min:,.0f} - {cv_max:,.0f}) is slightly above the JD's maximum ({currency_symbol} {jd_max:,.0f}). May be negotiable."
-                    else:
-                        ctc_score = 30
-                        result["ctc_feedback"] = f"Significant mismatch: Candidate's expected CTC ({currency_symbol} {cv_min:,.0f} - {cv_max:,.0f}) is significantly above the JD's maximum ({currency_symbol} {jd_max:,.0f}). Low alignment."
-                else: # Any other unexpected case, default to neutral
-                    result["ctc_feedback"] = "CTC comparison inconclusive due to complex ranges."
-
-        else: # One or both CTCs are missing
-            result["ctc_feedback"] = "CTC information not available for one or both documents for comparison."
-            ctc_score = 50 # Neutral score if info is missing
-
-        # JD Responsibilities Matching (5% weight) - Adjusted weight
-        jd_responsibilities = parsed_jd.get("key_responsibilities", [])
-        cv_text_raw = parsed_cv.get("text", "") # Use raw text for responsibility matching
-        
-        responsibilities_match_score = 0
-        matched_responsibilities_details = []
-        
-        if jd_responsibilities and cv_text_raw:
-            individual_scores = []
-            for responsibility in jd_responsibilities:
-                found_in_cv = False
-                relevant_snippet = ""
-                highest_snippet_score = 0.0 # Initialize as float
+                result["experience_feedback"] = f"Experience gap: Candidate's {cv_years} years of {cv_seniority} experience is below the JD's {jd_years}+ years {jd_seniority} requirement. Consider for junior roles or if other areas compensate."
+            timer.lap("experience")
+            
+            # CTC Analysis (10% weight) - Adjusted weight
+            jd_ctc = parsed_jd.get("ctc", {})
+            cv_ctc = parsed_cv.get("ctc", {})
+            
+            ctc_score = 50 # Default neutral score if no info or major mismatch
+            
+            if jd_ctc and cv_ctc:
+                jd_min = jd_ctc.get("min_value", 0)
+                jd_max = jd_ctc.get("max_value", jd_min)
+                cv_min = cv_ctc.get("min_value", 0)
+                cv_max = cv_ctc.get("max_value", cv_min)
                 
-                # Check for direct phrase match first
-                if responsibility.lower() in cv_text_raw.lower():
-                    found_in_cv = True
-                    # Find and extract a relevant sentence or snippet
-                    for sentence in sent_tokenize(cv_text_raw):
-                        if responsibility.lower() in sentence.lower():
-                            relevant_snippet = sentence[:200] + "..." if len(sentence) > 200 else sentence
-                            break # Found a direct match sentence
-                    highest_snippet_score = 1.0 # Max confidence for direct match
-                    individual_scores.append(100)
+                # Simple check if currencies match
+                if jd_ctc.get("currency") != cv_ctc.get("currency"):
+                    result["ctc_feedback"] = f"Warning: CTC currencies differ (JD: {jd_ctc.get('currency')}, CV: {cv_ctc.get('currency')}). Cannot compare directly."
+                    ctc_score = 20 # Low score if currencies don't match, as direct comparison is invalid
                 else:
-                    # Use semantic similarity (if NLP is loaded and has vectors) or keyword overlap as fallback
-                    if nlp and nlp.vocab.vectors.name: # Check if NLP has vectors loaded
-                        jd_resp_doc = nlp(responsibility)
-                        cv_sentences = sent_tokenize(cv_text_raw)
-                        
-                        for sentence in cv_sentences:
-                            cv_sent_doc = nlp(sentence)
-                            if jd_resp_doc.has_vector and cv_sent_doc.has_vector:
-                                similarity = jd_resp_doc.similarity(cv_sent_doc)
-                                if similarity > highest_snippet_score:
-                                    highest_snippet_score = similarity
-                                    relevant_snippet = sentence[:200] + "..." if len(sentence) > 200 else sentence
-                                    
-                        if highest_snippet_score >= 0.7: # Threshold for strong semantic match
-                            found_in_cv = True
-                            individual_scores.append(highest_snippet_score * 100)
-                        elif highest_snippet_score > 0.3: # Partial semantic match
-                             individual_scores.append(highest_snippet_score * 50) # Give partial credit
-                        else:
-                            individual_scores.append(0) # No significant semantic match
-                    else: # Fallback to keyword overlap if NLP not available or no vectors
-                        responsibility_words = set(clean_text(responsibility).split())
-                        cv_words_cleaned = set(clean_text(cv_text_raw).split())
-                        
-                        common_words_count = len(responsibility_words.intersection(cv_words_cleaned))
-                        if responsibility_words:
-                            keyword_match_ratio = common_words_count / len(responsibility_words)
+                    currency_symbol = jd_ctc.get('currency', '') # Use the common currency symbol for feedback
+                    
+                    # Perfect overlap (CV expectation is within JD range)
+                    if cv_min >= jd_min and cv_max <= jd_max:
+                        ctc_score = 100
+                        result["ctc_feedback"] = f"Excellent alignment: Candidate's expected CTC ({currency_symbol} {cv_min:,.0f} - {cv_max:,.0f}) is perfectly within the JD's range ({currency_symbol} {jd_min:,.0f} - {jd_max:,.0f})."
+                    # CV expects less than JD min
+                    elif cv_max < jd_min:
+                        ctc_score = 90
+                        result["ctc_feedback"] = f"Favorable: Candidate's expected CTC ({currency_symbol} {cv_min:,.0f} - {cv_max:,.0f}) is below the JD's minimum ({currency_symbol} {jd_min:,.0f})."
+                    # Partial overlap (CV min is less than JD max, but CV max is higher than JD max)
+                    elif cv_min < jd_max and cv_max > jd_max:
+                        # Calculate how far above the JD max the CV goes
+                        # Using a simplified overlap percentage for scoring clarity
+                        overlap_amount = min(cv_max, jd_max) - max(cv_min, jd_min)
+                        if overlap_amount > 0:
+                            overlap_ratio = overlap_amount / (jd_max - jd_min) if (jd_max - jd_min) > 0 else 0
+                            ctc_score = 50 + (overlap_ratio * 50) # Scale score based on overlap
                         else:
-                            keyword_match_ratio = 0
+                            ctc_score = 50 # No positive overlap
                         
-                        if keyword_match_ratio >= 0.4: # Adjustable threshold
-                            found_in_cv = True
-                            individual_scores.append(keyword_match_ratio * 100)
-                            # Find relevant sentence via keyword overlap
-                            cv_sentences = sent_tokenize(parsed_cv.get("text", ""))
-                            best_sentence = ""
-                            best_overlap_score = 0
-                            for sentence in cv_sentences:
-                                sentence_words = set(clean_text(sentence).split())
-                                overlap = len(sentence_words.intersection(responsibility_words))
-                                if overlap > best_overlap_score:
-                                    best_overlap_score = overlap
-                                    best_sentence = sentence
-                            relevant_snippet = best_sentence[:200] + "..." if len(best_sentence) > 200 else best_sentence
+                        result["ctc_feedback"] = f"Moderate overlap: Candidate's expected CTC ({currency_symbol} {cv_min:,.0f} - {cv_max:,.0f}) partially overlaps with JD range ({currency_symbol} {jd_min:,.0f} - {jd_max:,.0f}), leaning slightly higher."
+                    # CV expects more than JD max
+                    elif cv_min > jd_max:
+                        gap_percentage = ((cv_min - jd_max) / jd_max) * 100 if jd_max > 0 else 100
+                        if gap_percentage <= 15:
+                            ctc_score = 70
+                            result["ctc_feedback"] = f"Slight mismatch: Candidate's expected CTC ({currency_symbol} {cv_min:,.0f} - {cv_max:,.0f}) is slightly above the JD's maximum ({currency_symbol} {jd_max:,.0f}). May be negotiable."
                         else:
-                            individual_scores.append(0)
+                            ctc_score = 30
+                            result["ctc_feedback"] = f"Significant mismatch: Candidate's expected CTC ({currency_symbol} {cv_min:,.0f} - {cv_max:,.0f}) is significantly above the JD's maximum ({currency_symbol} {jd_max:,.0f}). Low alignment."
+                    else: # Any other unexpected case, default to neutral
+                        result["ctc_feedback"] = "CTC comparison inconclusive due to complex ranges."
+
+            else: # One or both CTCs are missing
+                result["ctc_feedback"] = "CTC information not available for one or both documents for comparison."
+                ctc_score = 50 # Neutral score if info is missing
+            timer.lap("ctc")
+
+            # JD Responsibilities Matching (5% weight) - Adjusted weight
+            jd_responsibilities = parsed_jd.get("key_responsibilities", [])
+            cv_text_raw = parsed_cv.get("text", "") # Use raw text for responsibility matching
+            
+            responsibilities_match_score = 0
+            matched_responsibilities_details = []
+            
+            if jd_responsibilities and cv_text_raw:
+                # Split the CV once rather than once per responsibility
+                cv_sentences = sent_tokenize(cv_text_raw)
+                profile_count("sentences_processed", len(cv_sentences))
+                # Parse the responsibilities that need semantic matching and the
+                # CV sentences in one call, not one pipeline call (and micro-batch
+                # window) per responsibility and sentence
+                responsibility_docs = {}
+                cv_sent_docs = []
+                if nlp and nlp.vocab.vectors.name:
+                    semantic_responsibilities = [r for r in jd_responsibilities if r.lower() not in cv_text_raw.lower()]
+                    if semantic_responsibilities:
+                        docs = make_docs(semantic_responsibilities + cv_sentences)
+                        responsibility_docs = dict(zip(semantic_responsibilities, docs))
+                        cv_sent_docs = docs[len(semantic_responsibilities):]
+                individual_scores = []
+                for responsibility in jd_responsibilities:
+                    found_in_cv = False
+                    relevant_snippet = ""
+                    highest_snippet_score = 0.0 # Initialize as float
+                    
+                    # Check for direct phrase match first
+                    if responsibility.lower() in cv_text_raw.lower():
+                        found_in_cv = True
+                        # Find and extract a relevant sentence or snippet
+                        for sentence in cv_sentences:
+                            if responsibility.lower() in sentence.lower():
+                                relevant_snippet = sentence[:200] + "..." if len(sentence) > 200 else sentence
+                                break # Found a direct match sentence
+                        highest_snippet_score = 1.0 # Max confidence for direct match
+                        individual_scores.append(100)
+                    else:
+                        # Use semantic similarity (if NLP is loaded and has vectors) or keyword overlap as fallback
+                        if nlp and nlp.vocab.vectors.name: # Check if NLP has vectors loaded
+                            jd_resp_doc = responsibility_docs[responsibility]
+                            
+                            for sentence, cv_sent_doc in zip(cv_sentences, cv_sent_docs):
+                                if jd_resp_doc.has_vector and cv_sent_doc.has_vector:
+                                    similarity = jd_resp_doc.similarity(cv_sent_doc)
+                                    if similarity > highest_snippet_score:
+                                        highest_snippet_score = similarity
+                                        relevant_snippet = sentence[:200] + "..." if len(sentence) > 200 else sentence
+                                        
+                            if highest_snippet_score >= 0.7: # Threshold for strong semantic match
+                                found_in_cv = True
+                                individual_scores.append(highest_snippet_score * 100)
+                            elif highest_snippet_score > 0.3: # Partial semantic match
+                                 individual_scores.append(highest_snippet_score * 50) # Give partial credit
+                            else:
+                                individual_scores.append(0) # No significant semantic match
+                        else: # Fallback to keyword overlap if NLP not available or no vectors
+                            responsibility_words = set(clean_text(responsibility).split())
+                            cv_words_cleaned = set(clean_text(cv_text_raw).split())
+                            
+                            common_words_count = len(responsibility_words.intersection(cv_words_cleaned))
+                            if responsibility_words:
+                                keyword_match_ratio = common_words_count / len(responsibility_words)
+                            else:
+                                keyword_match_ratio = 0
+                            
+                            if keyword_match_ratio >= 0.4: # Adjustable threshold
+                                found_in_cv = True
+                                individual_scores.append(keyword_match_ratio * 100)
+                                # Find relevant sentence via keyword overlap
+                                best_sentence = ""
+                                best_overlap_score = 0
+                                for sentence in cv_sentences:
+                                    sentence_words = set(clean_text(sentence).split())
+                                    overlap = len(sentence_words.intersection(responsibility_words))
+                                    if overlap > best_overlap_score:
+                                        best_overlap_score = overlap
+                                        best_sentence = sentence
+                                relevant_snippet = best_sentence[:200] + "..." if len(best_sentence) > 200 else best_sentence
+                            else:
+                                individual_scores.append(0)
+                    
+                    matched_responsibilities_details.append({
+                        "responsibility": responsibility,
+                        "found_in_cv": found_in_cv,
+                        "relevant_snippet": relevant_snippet,
+                        "confidence_score": round(highest_snippet_score * 100, 2) if nlp else round(individual_scores[-1], 2) # Use last appended score
+                    })
                 
-                matched_responsibilities_details.append({
-                    "responsibility": responsibility,
-                    "found_in_cv": found_in_cv,
-                    "relevant_snippet": relevant_snippet,
-                    "confidence_score": round(highest_snippet_score * 100, 2) if nlp else round(individual_scores[-1], 2) # Use last appended score
-                })
-            
-            if individual_scores:
-                responsibilities_match_score = sum(individual_scores) / len(individual_scores)
+                if individual_scores:
+                    responsibilities_match_score = sum(individual_scores) / len(individual_scores)
+                else:
+                    responsibilities_match_score = 0 # No responsibilities to compare
             else:
-                responsibilities_match_score = 0 # No responsibilities to compare
-        else:
-            responsibilities_match_score = 50 # Neutral if JD has no responsibilities
-        
-        result["jd_responsibilities_matched_in_cv"] = matched_responsibilities_details
-        
-        # Academic Alignment (5% weight)
-        academic_score = 50 # Neutral if no academic info or not a major factor
-        cv_academic = parsed_cv.get("academic_info", {})
-        academic_feedback_list = [] # Renamed to avoid conflict with result key
-        
-        if cv_academic.get("degrees"):
-            academic_feedback_list.append(f"Education: {len(cv_academic['degrees'])} degree(s) found.")
-            academic_score += 10 # Bonus for degrees
-        
-        if cv_academic.get("universities"):
-             academic_feedback_list.append(f"University mentions: {len(cv_academic['universities'])}.")
-             # Further logic could compare university reputation etc.
-        
-        if cv_academic.get("publications"):
-            academic_feedback_list.append(f"Research: {len(cv_academic['publications'])} publication(s).")
-            academic_score += 15 # Higher bonus for publications
-        
-        if cv_academic.get("awards"):
-            academic_feedback_list.append(f"Recognition: {len(cv_academic['awards'])} award(s)/achievement(s).")
-            academic_score += 10 # Bonus for awards
-        
-        result["academic_alignment_feedback"] = " ".join(academic_feedback_list).strip() or "Limited academic information available."
-        academic_score = min(100, academic_score) # Cap at 100
+                responsibilities_match_score = 50 # Neutral if JD has no responsibilities
+            
+            result["jd_responsibilities_matched_in_cv"] = matched_responsibilities_details
+            timer.lap("responsibilities")
+            
+            # Academic Alignment (5% weight)
+            academic_score = 50 # Neutral if no academic info or not a major factor
+            cv_academic = parsed_cv.get("academic_info", {})
+            academic_feedback_list = [] # Renamed to avoid conflict with result key
+            
+            if cv_academic.get("degrees"):
+                academic_feedback_list.append(f"Education: {len(cv_academic['degrees'])} degree(s) found.")
+                academic_score += 10 # Bonus for degrees
+            
+            if cv_academic.get("universities"):
+                 academic_feedback_list.append(f"University mentions: {len(cv_academic['universities'])}.")
+                 # Further logic could compare university reputation etc.
+            
+            if cv_academic.get("publications"):
+                academic_feedback_list.append(f"Research: {len(cv_academic['publications'])} publication(s).")
+                academic_score += 15 # Higher bonus for publications
+            
+            if cv_academic.get("awards"):
+                academic_feedback_list.append(f"Recognition: {len(cv_academic['awards'])} award(s)/achievement(s).")
+                academic_score += 10 # Bonus for awards
+            
+            result["academic_alignment_feedback"] = " ".join(academic_feedback_list).strip() or "Limited academic information available."
+            academic_score = min(100, academic_score) # Cap at 100
+            timer.lap("academic")
 
-        # Calculate final weighted score
-        final_score = (skills_score * 0.60) + \
-                      (experience_score * 0.20) + \
-                      (ctc_score * 0.10) + \
-                      (responsibilities_match_score * 0.05) + \
-                      (academic_score * 0.05)
-        
-        result["score"] = round(final_score, 1)
-        
-        return result
-        
+            # Calculate final weighted score
+            final_score = (skills_score * 0.60) + \
+                          (experience_score * 0.20) + \
+                          (ctc_score * 0.10) + \
+                          (responsibilities_match_score * 0.05) + \
+                          (academic_score * 0.05)
+            
+            result["score"] = round(final_score, 1)
+            
+            return result
+            
+        except Exception as e:
+            logging.error(f"Failed to calculate match score: {e}")
+            count_fallback("match_score_error")
+            # Return a structured error response in case of a critical failure during scoring
+            return {
+                "score": 0,
+                "matched_skills": [],
+                "missing_jd_skills": [],
+                "extra_cv_skills": [],
+                "experience_feedback": f"Error calculating experience match: {e}",
+                "ctc_feedback": f"Error calculating CTC match: {e}",
+                "academic_alignment_feedback": f"Error calculating academic alignment: {e}",
+                "jd_responsibilities_matched_in_cv": [],
+                "overall_error": "Failed to calculate comprehensive match score."
+            }
+
+# Compact per-resume results for batch matching (API batch/job routes and batch_match.py)
+def compact_breakdown(match_result: Dict, parsed_cv: Dict) -> Dict:
+    """Reduce a full match result to the fields needed for ranking a batch"""
+    responsibilities = match_result.get("jd_responsibilities_matched_in_cv", [])
+    return {
+        "matched_skills": match_result.get("matched_skills", []),
+        "missing_jd_skills": match_result.get("missing_jd_skills", []),
+        "cv_experience_years": parsed_cv.get("experience", {}).get("years_of_experience", 0),
+        "cv_seniority_level": parsed_cv.get("experience", {}).get("seniority_level", "Entry-Level"),
+        "responsibilities_matched": sum(1 for r in responsibilities if r.get("found_in_cv")),
+        "responsibilities_total": len(responsibilities)
+    }
+
+def build_match_line(parsed_jd: Dict, filename: str, cv_content: bytes, cv_file_type: str) -> Dict:
+    """Parse one CV, score it against a parsed JD and return a compact result line"""
+    line = {"filename": filename, "score": None, "breakdown": None, "error": None}
+    if not cv_content:
+        line["error"] = "Resume file is empty"
+        return line
+    try:
+        parsed_cv = parse_document(cv_content, cv_file_type, is_jd=False)
+        match_result = calculate_match_score(parsed_jd, parsed_cv)
+        line["score"] = match_result.get("score", 0)
+        line["breakdown"] = compact_breakdown(match_result, parsed_cv)
+        if match_result.get("overall_error"):
+            line["error"] = match_result["overall_error"]
     except Exception as e:
-        logging.error(f"Failed to calculate match score: {e}")
-        # Return a structured error response in case of a critical failure during scoring
-        return {
-            "score": 0,
-            "matched_skills": [],
-            "missing_jd_skills": [],
-            "extra_cv_skills": [],
-            "experience_feedback": f"Error calculating experience match: {e}",
-            "ctc_feedback": f"Error calculating CTC match: {e}",
-            "academic_alignment_feedback": f"Error calculating academic alignment: {e}",
-            "jd_responsibilities_matched_in_cv": [],
-            "overall_error": "Failed to calculate comprehensive match score."
-        }
+        logging.error(f"Failed to match resume {filename}: {e}")
+        line["error"] = str(e)
+    return line
+
+# Built-in sample documents used to warm up the pipeline before serving traffic
+WARMUP_JD_TEXT = """Senior Software Engineer
+Requirements: 5+ years of experience in software development with Python, React and AWS.
+Responsibilities:
+- Develop and maintain scalable web applications and REST APIs
+- Collaborate with cross-functional teams and mentor junior developers
+Compensation: $110,000 - $130,000 annually"""
 
-# Initialize NLP on module import.
-# This ensures spaCy and NLTK are ready when ats_core.py is first imported.
-initialize_nlp()
\ No newline at end of file
+WARMUP_CV_TEXT = """Jane Doe - Senior Software Engineer
+8 years of experience building Python, Django and React applications on AWS with Docker.
+Led a team of 5 developers and implemented a microservices architecture.
+Education: M.Sc Computer Science, Stanford University. Best paper award at ICML.
+Expected CTC: $120,000 - $140,000 per annum"""
+
+def warm_up() -> float:
+    """
+    Run the full parse and match pipeline over the built-in samples so that
+    lazily built state (spaCy caches, compiled regexes, NLTK tokenizers) is
+    ready before the first real request. Returns the time taken in seconds.
+    """
+    initialize_nlp()
+    start = time.perf_counter()
+    try:
+        parsed_jd = parse_document(WARMUP_JD_TEXT.encode("utf-8"), "txt", is_jd=True)
+        parsed_cv = parse_document(WARMUP_CV_TEXT.encode("utf-8"), "txt", is_jd=False)
+        calculate_match_score(parsed_jd, parsed_cv)
+    except Exception as e:
+        logging.warning(f"Warm-up run failed: {e}")
+    elapsed = time.perf_counter() - start
+    _nlp_status["warmed_up"] = True
+    _nlp_status["warmup_seconds"] = round(elapsed, 3)
+    logging.info(f"NLP pipeline warmed up in {elapsed:.2f}s.")
+    return elapsed
\ No newline at end of file
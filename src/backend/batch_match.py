@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Offline batch matcher for the ATS backend
+Scores a directory (or glob) of resumes against one JD without the HTTP
+server. Resumes are parsed and scored across all cores, results are written
+as CSV or JSONL as they complete, and an interrupted run can be resumed by
+re-running the same command: resumes already in the output file are skipped.
+
+Usage:
+    python batch_match.py --jd job.pdf --cvs resumes/ --output results.jsonl
+    python batch_match.py --jd job.txt --cvs "resumes/**/*.pdf" --output results.csv --workers 8
+"""
+
+import argparse
+import csv
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger("ats.batch_match")
+
+SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
+
+# Columns of the CSV output; JSONL lines carry the same data with the
+# breakdown as a nested object
+CSV_COLUMNS = [
+    "path", "filename", "score", "error", "matched_skills", "missing_jd_skills",
+    "cv_experience_years", "cv_seniority_level", "responsibilities_matched", "responsibilities_total"
+]
+
+# Parsed JD shared by the worker processes (set by the pool initializer)
+_worker_jd: Optional[Dict] = None
+
+
+def collect_resumes(sources: Iterable[str]) -> List[str]:
+    """Expand directories (recursively) and glob patterns into a sorted list of resume paths"""
+    paths = set()
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                paths.update(os.path.join(root, name) for name in files)
+        else:
+            paths.update(glob.glob(source, recursive=True))
+    return sorted(
+        os.path.abspath(path) for path in paths
+        if os.path.isfile(path) and os.path.splitext(path.lower())[1] in SUPPORTED_EXTENSIONS
+    )
+
+
+def output_format(path: str, requested: Optional[str] = None) -> str:
+    """Output format from --format or the output file extension (default JSONL)"""
+    if requested:
+        return requested
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def repair_partial_line(path: str):
+    """Cut off a trailing half-written line left behind by a crash"""
+    with open(path, "rb+") as f:
+        data = f.read()
+        if not data or data.endswith(b"\n"):
+            return
+        f.truncate(data.rfind(b"\n") + 1)
+
+
+def completed_paths(path: str, fmt: str) -> Set[str]:
+    """Resume paths already recorded in an existing output file"""
+    if not os.path.exists(path):
+        return set()
+    repair_partial_line(path)
+    done = set()
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                if row.get("path"):
+                    done.add(row["path"])
+        else:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["path"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+    return done
+
+
+def csv_row(line: Dict) -> Dict:
+    """Flatten a result line for the CSV writer"""
+    breakdown = line.get("breakdown") or {}
+    row = {"path": line["path"], "filename": line["filename"], "score": line.get("score"),
+           "error": line.get("error") or ""}
+    for column in CSV_COLUMNS[4:]:
+        value = breakdown.get(column, "")
+        row[column] = ";".join(value) if isinstance(value, list) else value
+    return row
+
+
+class ResultWriter:
+    """Appends result lines to the output file and flushes each one"""
+
+    def __init__(self, path: str, fmt: str):
+        self.fmt = fmt
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "a", newline="", encoding="utf-8")
+        self.csv_writer = None
+        if fmt == "csv":
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=CSV_COLUMNS)
+            if new_file:
+                self.csv_writer.writeheader()
+
+    def write(self, line: Dict):
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(csv_row(line))
+        else:
+            self.file.write(json.dumps(line) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def _init_worker(parsed_jd: Dict):
+    """Pool initializer: keep the parsed JD and make sure the models are loaded"""
+    global _worker_jd
+    import ats_core
+    _worker_jd = parsed_jd
+    ats_core.initialize_nlp()
+
+
+def _score_path(path: str) -> Dict:
+    """Worker task: read, parse and score one resume"""
+    import ats_core
+    filename = os.path.basename(path)
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+        line = ats_core.build_match_line(_worker_jd, filename, content, os.path.splitext(path)[1].lstrip(".").lower())
+    except OSError as e:
+        line = {"filename": filename, "score": None, "breakdown": None, "error": str(e)}
+    return {"path": path, **line}
+
+
+def pool_context():
+    """Fork where available so workers inherit the models loaded by the parent"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else methods[0])
+
+
+def run(jd_path: str, sources: List[str], output: str, fmt: Optional[str] = None,
+        workers: Optional[int] = None, chunksize: int = 4, progress_seconds: float = 5.0) -> Dict:
+    """Score every resume not already in the output file and return run statistics"""
+    import ats_core
+
+    fmt = output_format(output, fmt)
+    resumes = collect_resumes(sources)
+    done = completed_paths(output, fmt)
+    pending = [path for path in resumes if path not in done]
+    stats = {"found": len(resumes), "skipped": len(resumes) - len(pending), "scored": 0, "errors": 0}
+    print(f"🚀 {len(resumes)} resumes found, {stats['skipped']} already done, {len(pending)} to score", file=sys.stderr)
+    if not pending:
+        return stats
+
+    if not ats_core.initialize_nlp():
+        logger.warning("spaCy model not loaded; scoring with the reduced fallback pipeline")
+    with open(jd_path, "rb") as f:
+        parsed_jd = ats_core.parse_document(f.read(), os.path.splitext(jd_path)[1].lstrip(".").lower(), is_jd=True)
+
+    workers = workers or os.cpu_count() or 1
+    writer = ResultWriter(output, fmt)
+    start = time.perf_counter()
+    next_report = start + progress_seconds
+    try:
+        with pool_context().Pool(workers, initializer=_init_worker, initargs=(parsed_jd,)) as pool:
+            for line in pool.imap_unordered(_score_path, pending, chunksize=chunksize):
+                writer.write(line)
+                stats["scored"] += 1
+                if line.get("error"):
+                    stats["errors"] += 1
+                now = time.perf_counter()
+                if now >= next_report:
+                    rate = stats["scored"] / (now - start)
+                    remaining = (len(pending) - stats["scored"]) / rate if rate else 0
+                    print(f"   {stats['scored']}/{len(pending)} scored, {rate:.1f} resumes/s, "
+                          f"~{remaining:.0f}s remaining", file=sys.stderr)
+                    next_report = now + progress_seconds
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = round(elapsed, 2)
+    stats["resumes_per_second"] = round(stats["scored"] / elapsed, 2) if elapsed else 0.0
+    print(f"✅ Scored {stats['scored']} resumes ({stats['errors']} with errors) in {elapsed:.1f}s, "
+          f"{stats['resumes_per_second']} resumes/s", file=sys.stderr)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a directory of resumes against a JD without the API server")
+    parser.add_argument("--jd", required=True, help="Job description file (PDF, DOCX or TXT)")
+    parser.add_argument("--cvs", required=True, nargs="+", help="Resume directories and/or glob patterns")
+    parser.add_argument("--output", required=True, help="Output file; re-running resumes an interrupted run")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Output format (default: from the file extension)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=4, help="Resumes handed to a worker at a time")
+    parser.add_argument("--progress-seconds", type=float, default=5.0, help="Interval between throughput reports")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    stats = run(args.jd, args.cvs, args.output, args.format, args.workers, args.chunksize, args.progress_seconds)
+    sys.exit(1 if stats["found"] == 0 else 0)
+
+
+if __name__ == "__main__":
+    main()
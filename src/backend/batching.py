@@ -0,0 +1,126 @@
+"""
+Dynamic micro-batching for NLP calls
+Collects items submitted by concurrent requests for a short window (or until
+a maximum batch size is reached) and processes them in a single batch call,
+routing each result back to the caller that submitted it
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Merge concurrent single-item calls into batch calls.
+
+    `process_batch(items)` receives a list of items and must return one
+    result per item, in order (e.g. `lambda texts: nlp.pipe(texts)`). The
+    batching thread is started lazily on first use so that it is never
+    created before a fork.
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], Iterable[Any]],
+                 max_batch_size: int = 16, max_wait_ms: float = 5.0, name: str = "ats-batcher"):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopped = False
+        self.batches_total = 0
+        self.items_total = 0
+        self.max_batch_seen = 0
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item and return a future for its result"""
+        if self._stopped:
+            raise RuntimeError("Cannot submit to a stopped micro-batcher")
+        self._ensure_started()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def process(self, item: Any) -> Any:
+        """Process one item as part of the next batch and wait for its result"""
+        return self.submit(item).result()
+
+    def process_many(self, items: List[Any]) -> List[Any]:
+        """Queue several items at once (they may share a batch) and wait for all results"""
+        futures = [self.submit(item) for item in items]
+        return [future.result() for future in futures]
+
+    def _collect(self) -> List:
+        """Block for the first item, then gather more until the window closes or the batch is full"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            stop = any(future is None for _, future in batch)
+            batch = [(item, future) for item, future in batch
+                     if future is not None and future.set_running_or_notify_cancel()]
+            if batch:
+                self._process(batch)
+            if stop:
+                break
+
+    def _process(self, batch: List):
+        self.batches_total += 1
+        self.items_total += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        try:
+            results = list(self.process_batch([item for item, _ in batch]))
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            logger.error(f"Micro-batch of {len(batch)} items failed: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def stop(self):
+        """Process what is already queued, then stop the batching thread"""
+        self._stopped = True
+        if self._thread is not None:
+            self._queue.put((None, None))
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict:
+        """Batch counters for monitoring"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches_total": self.batches_total,
+            "items_total": self.items_total,
+            "avg_batch_size": round(self.items_total / self.batches_total, 2) if self.batches_total else 0.0,
+            "max_batch_seen": self.max_batch_seen,
+            "queue_depth": self._queue.qsize()
+        }
@@ -0,0 +1,101 @@
+"""
+Bounded LRU cache with optional idle TTL
+Used for chat sessions and chatbot responses. Entries are kept in access
+order, so eviction (over capacity) and expiry (idle too long) both only ever
+look at the oldest end, keeping every operation O(1).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe LRU mapping with a maximum size and an optional idle TTL.
+
+    A get() refreshes an entry's position and idle timer; entries not
+    accessed for ttl_seconds are dropped lazily on the next operation.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._clock = clock
+        # key -> (value, last access time)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self, now: float):
+        """Drop idle entries from the oldest end (caller holds the lock)"""
+        if self.ttl_seconds is None:
+            return
+        while self._entries:
+            key, (value, last_access) = next(iter(self._entries.items()))
+            if now - last_access < self.ttl_seconds:
+                break
+            del self._entries[key]
+            self.expirations += 1
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._entries[key] = (entry[0], now)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            self._entries[key] = (value, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                old_key, (old_value, _) = self._entries.popitem(last=False)
+                self.evictions += 1
+                if self.on_evict is not None:
+                    self.on_evict(old_key, old_value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
@@ -1,34 +1,34 @@
 from typing import Dict, List, Optional, Tuple
+from cache import LRUCache
 from knowledge_base import KnowledgeBase
 from utils import normalize_text, extract_keywords
 
 class JobsTerritoryBot:
-    def __init__(self):
-        self.knowledge_base = KnowledgeBase()
+    def __init__(self, knowledge_base: Optional[KnowledgeBase] = None, response_cache_size: int = 1024):
+        # Pass a shared KnowledgeBase when serving many sessions from one process
+        self.knowledge_base = knowledge_base if knowledge_base is not None else KnowledgeBase()
         self.conversation_history = []
         self.max_history = 5
         
-        # Greeting patterns
-        self.greetings = [
-            "hello", "hi", "hey", "good morning", "good afternoon", 
-            "good evening", "greetings", "namaste"
-        ]
+        # Answers depend only on the normalized query and the knowledge base
+        # version, so repeated questions are served from a bounded LRU cache
+        self.response_cache = LRUCache(response_cache_size) if response_cache_size > 0 else None
+        if self.response_cache is not None:
+            self.knowledge_base.add_reload_listener(lambda kb: self.response_cache.clear())
         
-        # Goodbye patterns
-        self.goodbyes = [
-            "bye", "goodbye", "see you", "thanks", "thank you", 
-            "that's all", "exit", "quit"
-        ]
+        # Built-in replies for intents whose data entry has no "response"
+        self.intent_responses = {
+            'greeting': self.generate_greeting_response,
+            'goodbye': self.generate_goodbye_response
+        }
     
     def is_greeting(self, text: str) -> bool:
         """Check if the input is a greeting."""
-        normalized = normalize_text(text)
-        return any(greeting in normalized for greeting in self.greetings)
+        return self.knowledge_base.match_intent(text) == 'greeting'
     
     def is_goodbye(self, text: str) -> bool:
         """Check if the input is a goodbye."""
-        normalized = normalize_text(text)
-        return any(goodbye in normalized for goodbye in self.goodbyes)
+        return self.knowledge_base.match_intent(text) == 'goodbye'
     
     def generate_greeting_response(self) -> str:
         """Generate a greeting response."""
@@ -52,24 +52,28 @@ class JobsTerritoryBot:
                 f"Could you please rephrase your question or ask about one of these topics? "
                 f"For other inquiries, you can contact us at hello@jobsterritory.com.")
     
-    def add_to_history(self, user_input: str, bot_response: str):
-        """Add conversation turn to history."""
-        self.conversation_history.append({
+    def add_to_history(self, user_input: str, bot_response: str, history: Optional[List[Dict]] = None):
+        """Add conversation turn to history (a session's list, or the bot's own)."""
+        if history is None:
+            history = self.conversation_history
+        history.append({
             'user': user_input,
             'bot': bot_response
         })
         
-        # Keep only recent history
-        if len(self.conversation_history) > self.max_history:
-            self.conversation_history = self.conversation_history[-self.max_history:]
+        # Keep only recent history, trimming in place so the caller's list stays bounded
+        if len(history) > self.max_history:
+            del history[:-self.max_history]
     
-    def get_context_from_history(self) -> str:
+    def get_context_from_history(self, history: Optional[List[Dict]] = None) -> str:
         """Get context from recent conversation history."""
-        if not self.conversation_history:
+        if history is None:
+            history = self.conversation_history
+        if not history:
             return ""
         
         # Get last 2 exchanges for context
-        recent_history = self.conversation_history[-2:]
+        recent_history = history[-2:]
         context_parts = []
         
         for exchange in recent_history:
@@ -78,9 +82,11 @@ class JobsTerritoryBot:
         
         return " ".join(context_parts)
     
-    def process_query(self, user_input: str) -> Dict[str, any]:
+    def process_query(self, user_input: str, history: Optional[List[Dict]] = None) -> Dict[str, any]:
         """
         Process user query and return response with metadata.
+        Pass a session's history list to keep conversations apart; by default
+        the bot's own conversation_history is used.
         """
         if not user_input or not user_input.strip():
             return {
@@ -92,27 +98,38 @@ class JobsTerritoryBot:
         
         user_input = user_input.strip()
         
-        # Handle greetings
-        if self.is_greeting(user_input):
-            response = self.generate_greeting_response()
-            self.add_to_history(user_input, response)
-            return {
-                'response': response,
-                'confidence': 1.0,
-                'category': 'greeting',
-                'suggestions': []
-            }
+        if self.response_cache is None:
+            result = self.answer_query(user_input)
+        else:
+            # The version is part of the key so that an answer computed during
+            # a reload can never be served for the new content
+            cache_key = (self.knowledge_base.version, normalize_text(user_input))
+            result = self.response_cache.get(cache_key)
+            if result is None:
+                result = self.answer_query(user_input)
+                self.response_cache.put(cache_key, result)
         
-        # Handle goodbyes
-        if self.is_goodbye(user_input):
-            response = self.generate_goodbye_response()
-            self.add_to_history(user_input, response)
-            return {
-                'response': response,
-                'confidence': 1.0,
-                'category': 'goodbye',
-                'suggestions': []
-            }
+        # History is per conversation, cached or not
+        self.add_to_history(user_input, result['response'], history)
+        return {**result, 'suggestions': list(result['suggestions'])}
+    
+    def answer_query(self, user_input: str) -> Dict[str, any]:
+        """
+        Answer a stripped, non-empty query without touching any history.
+        """
+        # Handle fixed intents (greetings, goodbyes, ...) in one pass
+        intent = self.knowledge_base.match_intent(user_input)
+        if intent is not None:
+            response = self.knowledge_base.get_intent_response(intent)
+            if response is None and intent in self.intent_responses:
+                response = self.intent_responses[intent]()
+            if response is not None:
+                return {
+                    'response': response,
+                    'confidence': 1.0,
+                    'category': intent,
+                    'suggestions': []
+                }
         
         # Search knowledge base
         search_results = self.knowledge_base.search_content(user_input)
@@ -154,9 +171,6 @@ class JobsTerritoryBot:
             category = 'fallback'
             suggestions = self.knowledge_base.get_fallback_suggestions()
         
-        # Add to conversation history
-        self.add_to_history(user_input, response)
-        
         return {
             'response': response,
             'confidence': confidence,
@@ -170,4 +184,8 @@ class JobsTerritoryBot:
     
     def clear_history(self):
         """Clear conversation history."""
-        self.conversation_history = []
\ No newline at end of file
+        self.conversation_history = []
+    
+    def cache_stats(self) -> Optional[Dict]:
+        """Hit rate and size of the response cache (None when caching is off)."""
+        return self.response_cache.stats() if self.response_cache is not None else None
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Typo correction for chatbot queries
+A SymSpell-style deletion dictionary built once from the knowledge base
+vocabulary: every vocabulary word is indexed under all strings obtained by
+deleting up to max_distance characters. Correcting a query word then only
+needs the deletions of that word and a few dictionary lookups, independent
+of the size of the vocabulary.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+MAX_MEMOIZED_CORRECTIONS = 100000
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings obtained by deleting up to max_distance characters from word"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            if len(item) <= 1:
+                continue
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions
+    and adjacent transpositions), or max_distance + 1 once it is exceeded.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous: Optional[List[int]] = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyCorrector:
+    """
+    Corrects misspelled words to the closest vocabulary word.
+
+    Only words that are not already known are corrected, and only when they
+    are at least min_length characters long: one edit is allowed below
+    long_word_length characters, max_distance edits from there on (two
+    edits on a shorter word too often turn a real word into a different one,
+    e.g. "details" into "retail"). Ties are broken by how often the
+    candidate occurs in the vocabulary, then alphabetically.
+    """
+
+    def __init__(self, vocabulary: Dict[str, int], known_words: Iterable[str] = (),
+                 max_distance: int = 2, min_length: int = 4, long_word_length: int = 8):
+        self.vocabulary = vocabulary
+        self.known_words = set(known_words) | set(vocabulary)
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.long_word_length = long_word_length
+        self._deletes: Dict[str, List[str]] = {}
+        for word in vocabulary:
+            if len(word) < self.min_length - 1:
+                continue
+            for deletion in _deletes(word, max_distance):
+                self._deletes.setdefault(deletion, []).append(word)
+        self._corrections: Dict[str, str] = {}
+
+    def allowed_distance(self, word: str) -> int:
+        return min(1, self.max_distance) if len(word) < self.long_word_length else self.max_distance
+
+    def correct(self, word: str) -> str:
+        """The closest vocabulary word, or the word itself if it is known or nothing is close"""
+        if word in self.known_words or len(word) < self.min_length or not word.isalpha():
+            return word
+        cached = self._corrections.get(word)
+        if cached is not None:
+            return cached
+
+        max_distance = self.allowed_distance(word)
+        best = word
+        best_key = None
+        seen = set()
+        for deletion in _deletes(word, max_distance):
+            for candidate in self._deletes.get(deletion, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(word, candidate, max_distance)
+                if distance > max_distance:
+                    continue
+                key = (distance, -self.vocabulary[candidate], candidate)
+                if best_key is None or key < best_key:
+                    best, best_key = candidate, key
+        # Memoize corrections of unknown words, up to a fixed number of them
+        if len(self._corrections) < MAX_MEMOIZED_CORRECTIONS:
+            self._corrections[word] = best
+        return best
+
+    def clear_corrections(self):
+        """Forget memoized corrections (they are rebuilt as queries come in)"""
+        self._corrections.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Vocabulary size, deletion index size and number of memoized corrections"""
+        return {
+            "vocabulary": len(self.vocabulary),
+            "deletion_keys": len(self._deletes),
+            "memoized_corrections": len(self._corrections)
+        }
+
+    def correct_text(self, normalized_text: str) -> str:
+        """Correct every word of an already normalized text"""
+        words = normalized_text.split()
+        corrected = [self.correct(word) for word in words]
+        return normalized_text if corrected == words else " ".join(corrected)
@@ -0,0 +1,48 @@
+"""
+Intent routing for fixed chatbot intents (greetings, goodbyes, ...)
+The intent table lives in the knowledge base file. All phrases of all
+intents are compiled into one phrase automaton that only matches whole
+words, so one scan of the query finds its intent however many intents and
+phrases there are.
+"""
+
+from typing import Dict, List, Optional
+
+from phrase_matching import PhraseAutomaton
+from utils import normalize_text
+
+
+class IntentRouter:
+    """
+    Matches queries against {"intent": {"phrases": [...], "response": "..."}}.
+
+    Phrases match on word boundaries ("hi" matches "hi there" but not
+    "hiring" or "this"). When a query contains phrases of several intents,
+    the intent listed first wins. "response" is optional.
+    """
+
+    def __init__(self, intents: Dict[str, Dict]):
+        self.names: List[str] = list(intents)
+        self.responses: Dict[str, str] = {}
+        automaton = PhraseAutomaton()
+        for priority, (name, spec) in enumerate(intents.items()):
+            for phrase in spec.get("phrases", []):
+                normalized = normalize_text(phrase)
+                if normalized:
+                    # normalize_text leaves single spaces between words, so
+                    # padding both sides with a space anchors to word boundaries
+                    automaton.add(f" {normalized} ", (priority, name))
+            if spec.get("response"):
+                self.responses[name] = spec["response"]
+        self.automaton = automaton.build()
+
+    def match(self, text: str) -> Optional[str]:
+        """The highest priority intent with a phrase in text, or None"""
+        normalized = normalize_text(text)
+        if not normalized or not len(self.automaton):
+            return None
+        found = self.automaton.find(f" {normalized} ")
+        return min(found)[1] if found else None
+
+    def response(self, intent: str) -> Optional[str]:
+        return self.responses.get(intent)
@@ -0,0 +1,260 @@
+"""
+In-process work queue and job manager for large CV-to-JD matching runs
+Runs on a single box: no external broker, bounded concurrency and a
+priority lane so interactive single matches are not stuck behind batches
+"""
+
+import itertools
+import logging
+import queue
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lower value runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_CANCELLED = "cancelled"
+
+
+class JobLimitError(Exception):
+    """Raised when a job cannot be created or extended because a limit was hit"""
+
+
+class WorkQueue:
+    """
+    Fixed pool of worker threads pulling callables from a priority queue.
+
+    Work with the same priority runs in submission order. Threads are started
+    lazily on the first submit so that a parent process can load models and
+    fork workers before any thread exists.
+    """
+
+    def __init__(self, max_workers: int = 4, name: str = "ats-work"):
+        self.max_workers = max_workers
+        self.name = name
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.max_workers):
+                thread = threading.Thread(target=self._worker, name=f"{self.name}-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, fn: Callable, *args, priority: int = PRIORITY_BATCH, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs) and return a concurrent.futures.Future for its result"""
+        if self._shutdown:
+            raise RuntimeError("Cannot submit to a work queue that has been shut down")
+        self._ensure_started()
+        future = Future()
+        self._queue.put((priority, next(self._sequence), future, fn, args, kwargs))
+        return future
+
+    def qsize(self) -> int:
+        """Number of queued (not yet running) work items"""
+        return self._queue.qsize()
+
+    def _worker(self):
+        while True:
+            _, _, future, fn, args, kwargs = self._queue.get()
+            if future is None:  # Shutdown sentinel
+                break
+            if not future.set_running_or_notify_cancel():
+                continue  # Cancelled while queued
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers once the already queued work has been drained"""
+        self._shutdown = True
+        for _ in self._threads:
+            self._queue.put((sys.maxsize, next(self._sequence), None, None, None, None))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+
+class MatchJob:
+    """State of one matching job: progress counters and collected result lines"""
+
+    def __init__(self, job_id: str, payload: Any, metadata: Optional[Dict] = None):
+        self.id = job_id
+        self.payload = payload
+        self.metadata = metadata or {}
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.cancelled = False
+        self.results: List[Dict] = []
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def status(self) -> str:
+        if self.cancelled:
+            return JOB_CANCELLED
+        if self.total and self.done >= self.total:
+            return JOB_COMPLETED
+        return JOB_RUNNING
+
+    @property
+    def finished(self) -> bool:
+        return self.status != JOB_RUNNING
+
+    def progress(self) -> Dict:
+        """Snapshot of the job's progress, safe to serialize"""
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "done": self.done,
+                "total": self.total,
+                "failed": self.failed,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at,
+                **self.metadata
+            }
+
+    def page(self, offset: int = 0, limit: int = 100) -> List[Dict]:
+        """Result lines in completion order"""
+        with self._lock:
+            return self.results[offset:offset + limit]
+
+    def _forget(self, index: int):
+        with self._lock:
+            self._futures.pop(index, None)
+
+    def _record(self, line: Dict):
+        with self._lock:
+            if self.cancelled:
+                return
+            self.results.append(line)
+            self.done += 1
+            if line.get("error"):
+                self.failed += 1
+            if self.done >= self.total:
+                self.finished_at = time.time()
+
+
+class JobManager:
+    """
+    Creates jobs, feeds their items to a WorkQueue and tracks progress.
+
+    `process_item(payload, item)` does the actual work for one item and must
+    return a result line (a dict); an exception is turned into a line with an
+    `error` field so one bad file never fails the whole job.
+    """
+
+    def __init__(self, work_queue: WorkQueue, process_item: Callable[[Any, Dict], Dict],
+                 max_jobs: int = 100, max_items_per_job: int = 10000,
+                 retention_seconds: float = 3600.0):
+        self.work_queue = work_queue
+        self.process_item = process_item
+        self.max_jobs = max_jobs
+        self.max_items_per_job = max_items_per_job
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[str, MatchJob] = {}
+        self._lock = threading.Lock()
+
+    def create_job(self, payload: Any, metadata: Optional[Dict] = None) -> MatchJob:
+        """Register a new job; items are added with add_items()"""
+        with self._lock:
+            self._prune()
+            if len(self._jobs) >= self.max_jobs:
+                raise JobLimitError(f"Too many jobs in progress. Maximum {self.max_jobs} retained jobs.")
+            job = MatchJob(uuid.uuid4().hex, payload, metadata)
+            self._jobs[job.id] = job
+        logger.info(f"Created matching job {job.id}")
+        return job
+
+    def get_job(self, job_id: str) -> MatchJob:
+        """Look up a job, raising KeyError if it is unknown or has expired"""
+        return self._jobs[job_id]
+
+    def has_job(self, job_id: str) -> bool:
+        """Whether a job is still registered (not deleted or expired)"""
+        return job_id in self._jobs
+
+    def add_items(self, job_id: str, items: List[Dict]) -> MatchJob:
+        """Queue more items for a job at batch priority"""
+        job = self.get_job(job_id)
+        with job._lock:
+            if job.cancelled:
+                raise JobLimitError("Cannot add items to a cancelled job")
+            if job.total + len(items) > self.max_items_per_job:
+                raise JobLimitError(f"Too many items for one job. Maximum {self.max_items_per_job}.")
+            first_index = job.total
+            job.total += len(items)
+            job.finished_at = None
+        for offset, item in enumerate(items):
+            index = first_index + offset
+            future = self.work_queue.submit(self._run_item, job, index, item, priority=PRIORITY_BATCH)
+            with job._lock:
+                job._futures[index] = future
+            future.add_done_callback(lambda f, i=index: job._forget(i))
+        return job
+
+    def delete_job(self, job_id: str):
+        """Cancel a job and forget it at once, e.g. when its first chunk was rejected"""
+        self.cancel_job(job_id)
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def cancel_job(self, job_id: str) -> MatchJob:
+        """Cancel a job: queued items are dropped, running items finish but are discarded"""
+        job = self.get_job(job_id)
+        with job._lock:
+            job.cancelled = True
+            job.finished_at = time.time()
+            futures = list(job._futures.values())
+            job._futures.clear()
+        for future in futures:
+            future.cancel()
+        logger.info(f"Cancelled matching job {job.id}")
+        return job
+
+    def _run_item(self, job: MatchJob, index: int, item: Dict):
+        if job.cancelled:
+            return
+        try:
+            line = self.process_item(job.payload, item)
+        except Exception as e:
+            logger.error(f"Job {job.id} item {index} failed: {e}")
+            line = {"error": str(e)}
+        job._record({"index": index, **line})
+
+    def _prune(self):
+        """
+        Forget finished jobs older than the retention period, and jobs that
+        never got any items within it (caller holds the lock)
+        """
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if (job.finished and job.finished_at is not None and job.finished_at < cutoff)
+                   or (job.total == 0 and job.created_at < cutoff)]
+        for job_id in expired:
+            del self._jobs[job_id]
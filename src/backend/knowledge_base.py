@@ -1,66 +1,344 @@
 import json
+import math
 import os
-from typing import Dict, List, Tuple, Optional
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Tuple, Optional
+
+from fuzzy import FuzzyCorrector
+from intents import IntentRouter
+from phrase_matching import PhraseAutomaton
+from semantic import LatencyBudget, SemanticIndex
+from utils import normalize_text, search_terms, stem_word, STOP_WORDS
+
+# Top-level keys of the data file holding the synonym map and the intent
+# table rather than a category
+SYNONYMS_KEY = "synonyms"
+INTENTS_KEY = "intents"
+RESERVED_KEYS = (SYNONYMS_KEY, INTENTS_KEY)
+
+def canonical_term_map(synonyms: Dict[str, List[str]]) -> Dict[str, str]:
+    """
+    Map the search term of every synonym to the term of its canonical word,
+    e.g. {"compensation": "salary", "ctc": "salary"}. A word listed under
+    several canonical words keeps the first.
+    """
+    canonical_terms: Dict[str, str] = {}
+    for canonical, variants in synonyms.items():
+        canonical_term = stem_word(normalize_text(canonical))
+        for word in [canonical, *variants]:
+            for term in (stem_word(w) for w in normalize_text(word).split()):
+                canonical_terms.setdefault(term, canonical_term)
+    return canonical_terms
+
+class SearchIndex:
+    """
+    Inverted index over knowledge base entries, scored with BM25.
+    
+    Each entry is indexed by its keywords and its answer text. Keyword terms
+    count KEYWORD_WEIGHT times as much as answer terms, so an entry whose
+    keywords mention a term beats one that only mentions it in passing.
+    Keyword phrases are compiled into one Aho-Corasick automaton, so a
+    single scan of the query finds every exact-phrase hit of every entry,
+    including short keywords such as "cv" that never become terms. A query
+    only touches the posting lists of its own terms. Misspelled query
+    words are first corrected against the keyword vocabulary, and synonyms
+    are mapped to one canonical term on both sides ("ctc" and
+    "compensation" are indexed and looked up as "salary").
+    """
+    
+    K1 = 1.2
+    B = 0.75
+    KEYWORD_WEIGHT = 3
+    
+    def __init__(self, entries: List[Tuple[List[str], str, str]], synonyms: Optional[Dict[str, List[str]]] = None):
+        self.entries = entries
+        self.canonical_terms = canonical_term_map(synonyms or {})
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        phrases = PhraseAutomaton()
+        keyword_vocabulary = Counter()
+        known_words = set(STOP_WORDS)
+        for canonical, variants in (synonyms or {}).items():
+            for word in [canonical, *variants]:
+                keyword_vocabulary.update(normalize_text(word).split())
+        lengths = []
+        for entry_id, (keywords, answer, _) in enumerate(entries):
+            term_counts = Counter()
+            for keyword in keywords:
+                for term in search_terms(keyword, self.canonical_terms):
+                    term_counts[term] += self.KEYWORD_WEIGHT
+            term_counts.update(search_terms(answer, self.canonical_terms))
+            for term, count in term_counts.items():
+                self.postings.setdefault(term, []).append((entry_id, count))
+            lengths.append(sum(term_counts.values()))
+            # Normalized keyword phrases with their entry and exact-match bonus
+            for keyword in keywords:
+                phrase = normalize_text(keyword)
+                if phrase:
+                    phrases.add(phrase, (entry_id, len(phrase.split()) * 2))
+                    keyword_vocabulary.update(phrase.split())
+            known_words.update(normalize_text(answer).split())
+        self.phrases = phrases.build()
+        self.corrector = FuzzyCorrector(keyword_vocabulary, known_words)
+        self.lengths = lengths
+        self.average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        count = len(entries)
+        self.idf = {term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for term, postings in self.postings.items()}
+    
+    def bm25(self, terms: List[str]) -> Dict[int, float]:
+        """BM25 score of every entry containing at least one query term"""
+        scores: Dict[int, float] = {}
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf[term]
+            for entry_id, frequency in postings:
+                norm = self.K1 * (1 - self.B + self.B * self.lengths[entry_id] / self.average_length)
+                scores[entry_id] = scores.get(entry_id, 0.0) + idf * frequency * (self.K1 + 1) / (frequency + norm)
+        return scores
+    
+    def phrase_scores(self, normalized_query: str) -> Dict[int, int]:
+        """Exact-phrase bonus per entry, from one scan of the normalized query"""
+        scores: Dict[int, int] = {}
+        for entry_id, bonus in self.phrases.find(normalized_query):
+            scores[entry_id] = scores.get(entry_id, 0) + bonus
+        return scores
+    
+    def scores(self, query: str) -> Dict[int, float]:
+        """
+        Lexical score per matching entry id: the exact-phrase bonus (2 per
+        word of each entry keyword found verbatim in the query) plus the
+        BM25 score averaged over the query terms.
+        """
+        normalized_query = self.corrector.correct_text(normalize_text(query))
+        terms = search_terms(normalized_query, self.canonical_terms)
+        if not terms:
+            return {}
+        bm25_scores = self.bm25(terms)
+        phrase_scores = self.phrase_scores(normalized_query)
+        return {entry_id: phrase_scores.get(entry_id, 0) + bm25_scores.get(entry_id, 0.0) / len(terms)
+                for entry_id in bm25_scores.keys() | phrase_scores.keys()}
+    
+    def ranked(self, scores: Dict[int, float]) -> List[Tuple[str, float, str]]:
+        """(answer, score, category) tuples for the positive scores, best first"""
+        results = []
+        for entry_id, score in scores.items():
+            if score > 0:
+                _, answer, category = self.entries[entry_id]
+                results.append((answer, score, category))
+        results.sort(key=lambda x: x[1], reverse=True)
+        return results
+    
+    def search(self, query: str) -> List[Tuple[str, float, str]]:
+        """(answer, score, category) tuples for entries matching the query, best first."""
+        return self.ranked(self.scores(query))
+
+class KnowledgeSnapshot:
+    """
+    One loaded version of the knowledge base: content, entries, indexes and intents.
+    
+    A snapshot is never modified after it is built. Reloads build a new one
+    and swap it in with a single assignment, so a query that has picked up
+    a snapshot sees a consistent index however long it runs.
+    """
+    
+    __slots__ = ("content", "entries", "synonyms", "index", "semantic", "intents", "version", "file_state", "loaded_at")
+    
+    def __init__(self, content: Dict, version: int, file_state: Optional[Tuple[int, int]],
+                 vectorize: Optional[Callable] = None):
+        self.content = content
+        self.entries = self._build_entries(content)
+        self.synonyms: Dict[str, List[str]] = content.get(SYNONYMS_KEY, {})
+        self.index = SearchIndex(self.entries, self.synonyms)
+        # Entry vectors are computed here, once per version, never per query
+        self.semantic = SemanticIndex(self.entries, vectorize, SearchIndex.KEYWORD_WEIGHT) if vectorize else None
+        self.intents = IntentRouter(content.get(INTENTS_KEY, {}))
+        self.version = version
+        self.file_state = file_state
+        self.loaded_at = time.time()
+    
+    @staticmethod
+    def _build_entries(content: Dict) -> List[Tuple[List[str], str, str]]:
+        entries = []
+        
+        for category, subcategories in content.items():
+            if category in RESERVED_KEYS:
+                continue
+            for subcategory, data in subcategories.items():
+                if isinstance(data, dict) and 'keywords' in data and 'answer' in data:
+                    keywords = data['keywords']
+                    answer = data['answer']
+                    full_category = f"{category}.{subcategory}"
+                    entries.append((keywords, answer, full_category))
+        
+        return entries
 
 class KnowledgeBase:
-    def __init__(self, data_file: str = "data/jobsterritory_content.json"):
+    def __init__(self, data_file: str = "data/jobsterritory_content.json", semantic_budget_ms: float = 8.0):
         self.data_file = data_file
-        self.content = {}
+        self._snapshot = KnowledgeSnapshot({}, 0, None)
+        # Semantic search is off until enable_semantic_search() is given a vectorizer;
+        # it is skipped for a while whenever its p99 latency exceeds the budget
+        self._vectorize: Optional[Callable] = None
+        self.semantic_budget = LatencyBudget(semantic_budget_ms / 1000)
+        self._reload_lock = threading.Lock()
+        self._reload_listeners: List[Callable[["KnowledgeBase"], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self._failed_file_state: Optional[Tuple[int, int]] = None
         self.load_content()
     
+    @property
+    def content(self) -> Dict:
+        return self._snapshot.content
+    
+    @property
+    def entries(self) -> List[Tuple[List[str], str, str]]:
+        return self._snapshot.entries
+    
+    @property
+    def index(self) -> SearchIndex:
+        return self._snapshot.index
+    
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+    
+    def _file_state(self) -> Optional[Tuple[int, int]]:
+        """(mtime, size) of the data file, or None if it does not exist"""
+        try:
+            stat = os.stat(self.data_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
     def load_content(self):
         """Load knowledge base content from JSON file."""
+        file_state = self._file_state()
         try:
             if os.path.exists(self.data_file):
                 with open(self.data_file, 'r', encoding='utf-8') as f:
-                    self.content = json.load(f)
-                print(f"Knowledge base loaded successfully with {len(self.content)} categories")
+                    content = json.load(f)
+                categories = sum(1 for key in content if key not in RESERVED_KEYS)
+                print(f"Knowledge base loaded successfully with {categories} categories")
             else:
                 print(f"Warning: Knowledge base file {self.data_file} not found")
-                self.content = {}
+                content = {}
         except Exception as e:
             print(f"Error loading knowledge base: {e}")
-            self.content = {}
+            content = {}
+        
+        # Build the entry list and search index once per load
+        self._snapshot = KnowledgeSnapshot(content, self._snapshot.version + 1, file_state, self._vectorize)
     
-    def get_all_entries(self) -> List[Tuple[List[str], str, str]]:
+    def reload(self, force: bool = False) -> bool:
         """
-        Get all entries from knowledge base as (keywords, answer, category) tuples.
+        Rebuild from the data file if it changed (or always, with force) and
+        swap the new version in. A file that fails to load keeps the current
+        version in service. Returns True if a new version was swapped in.
         """
-        entries = []
+        with self._reload_lock:
+            file_state = self._file_state()
+            if not force and file_state in (self._snapshot.file_state, self._failed_file_state):
+                return False
+            try:
+                with open(self.data_file, 'r', encoding='utf-8') as f:
+                    content = json.load(f)
+                snapshot = KnowledgeSnapshot(content, self._snapshot.version + 1, file_state, self._vectorize)
+            except Exception as e:
+                print(f"Error reloading knowledge base, keeping version {self._snapshot.version}: {e}")
+                # Remember the bad file so that it is not retried until it changes again
+                self._failed_file_state = file_state
+                return False
+            self._snapshot = snapshot
+            print(f"Knowledge base reloaded: version {snapshot.version} with {len(snapshot.entries)} entries")
+        self._notify_reload_listeners()
+        return True
+    
+    def enable_semantic_search(self, vectorize: Callable):
+        """
+        Blend vector similarity into search results from now on. The current
+        content is re-indexed with entry vectors as a new version.
+        """
+        with self._reload_lock:
+            self._vectorize = vectorize
+            snapshot = self._snapshot
+            self._snapshot = KnowledgeSnapshot(snapshot.content, snapshot.version + 1, snapshot.file_state, vectorize)
+        self._notify_reload_listeners()
+    
+    def _notify_reload_listeners(self):
+        for listener in list(self._reload_listeners):
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"Knowledge base reload listener failed: {e}")
+    
+    def add_reload_listener(self, listener: Callable[["KnowledgeBase"], None]):
+        """Call listener(knowledge_base) after each successful reload"""
+        self._reload_listeners.append(listener)
+    
+    def start_watching(self, interval_seconds: float = 5.0):
+        """Poll the data file's mtime in a background thread and reload when it changes"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
         
-        for category, subcategories in self.content.items():
-            for subcategory, data in subcategories.items():
-                if isinstance(data, dict) and 'keywords' in data and 'answer' in data:
-                    keywords = data['keywords']
-                    answer = data['answer']
-                    full_category = f"{category}.{subcategory}"
-                    entries.append((keywords, answer, full_category))
+        def watch():
+            while not self._stop_watching.wait(interval_seconds):
+                self.reload()
         
-        return entries
+        self._watcher = threading.Thread(target=watch, name="kb-watcher", daemon=True)
+        self._watcher.start()
+    
+    def stop_watching(self):
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+    
+    def get_all_entries(self) -> List[Tuple[List[str], str, str]]:
+        """
+        Get all entries from knowledge base as (keywords, answer, category) tuples.
+        """
+        return list(self._snapshot.entries)
     
     def search_content(self, query: str) -> List[Tuple[str, float, str]]:
         """
         Search for relevant content based on query.
         Returns list of (answer, score, category) tuples sorted by relevance.
         """
-        from utils import extract_keywords, calculate_match_score, normalize_text
-        
-        user_keywords = extract_keywords(query)
-        user_text_normalized = normalize_text(query)
-        
-        results = []
-        
-        for keywords, answer, category in self.get_all_entries():
-            # Calculate match score
-            score = calculate_match_score(user_keywords, keywords, query, ' '.join(keywords))
-            
-            if score > 0:
-                results.append((answer, score, category))
-        
-        # Sort by score (descending)
-        results.sort(key=lambda x: x[1], reverse=True)
-        
-        return results
+        snapshot = self._snapshot
+        scores = snapshot.index.scores(query)
+        if snapshot.semantic is not None and self.semantic_budget.allow():
+            start = time.perf_counter()
+            scores = snapshot.semantic.blend(scores, query)
+            self.semantic_budget.record(time.perf_counter() - start)
+        return snapshot.index.ranked(scores)
+    
+    def stats(self) -> Dict:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version,
+            "entries": len(snapshot.entries),
+            "loaded_at": snapshot.loaded_at,
+            "semantic": self.semantic_budget.stats() if snapshot.semantic is not None else None,
+            "watching": self._watcher is not None and self._watcher.is_alive()
+        }
+    
+    def get_synonyms(self, word: str) -> List[str]:
+        """Synonyms listed for a canonical word in the data file."""
+        return list(self._snapshot.synonyms.get(word.lower(), []))
+    
+    def match_intent(self, text: str) -> Optional[str]:
+        """Name of the fixed intent (e.g. "greeting") the text expresses, or None."""
+        return self._snapshot.intents.match(text)
+    
+    def get_intent_response(self, intent: str) -> Optional[str]:
+        """Canned response configured for an intent in the data file, if any."""
+        return self._snapshot.intents.response(intent)
     
     def get_fallback_suggestions(self) -> List[str]:
         """Get list of suggested topics when no match is found."""
@@ -81,5 +359,5 @@ class KnowledgeBase:
         parts = category.split('.')
         if len(parts) == 2:
             main_cat, sub_cat = parts
-            return self.content.get(main_cat, {}).get(sub_cat)
+            return self._snapshot.content.get(main_cat, {}).get(sub_cat)
         return None
\ No newline at end of file
@@ -3,26 +3,149 @@ FastAPI Backend for Advanced CV-to-JD Matching System
 Provides ephemeral, high-accuracy matching without persistent storage
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse, Response
+from pydantic import BaseModel
+import asyncio
+import json
 import logging
-from typing import Dict, Any
+import signal
+import time
+from typing import Dict, Any, List, Optional, Tuple
 import os
 
 # Import our enhanced ATS core module
-from ats_core import parse_document, calculate_match_score, initialize_nlp
+import ats_core
+from ats_core import parse_document, calculate_match_score, initialize_nlp, enable_micro_batching, warm_up, nlp_status, build_match_line
+from job_queue import WorkQueue, JobManager, JobLimitError, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+from admission import AdmissionController, AdmissionMiddleware
+from metrics import REGISTRY, REQUEST_SECONDS
+from profiling import RequestProfile, run_profiled, start_memory_tracing
+from memstats import process_memory
+from chatbot_logic import JobsTerritoryBot
+from knowledge_base import KnowledgeBase
+from session_store import SessionStore
+from semantic import spacy_vectorizer
+from serialization import dumps, parse_fields, select_fields, render_json, JSON_BACKEND
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when available (see serialization.py)"""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Advanced ATS Matching API",
     description="High-accuracy CV-to-JD matching with comprehensive analysis",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
+)
+
+# Supported file types
+SUPPORTED_FILE_TYPES = {'.pdf', '.docx', '.doc', '.txt'}
+
+# Worker pool for document parsing so that independent documents (e.g. the JD
+# and the CV of a match request) are parsed concurrently off the event loop.
+# Interactive requests use a priority lane ahead of batch and job work.
+PARSE_WORKERS = int(os.getenv("ATS_PARSE_WORKERS", "4"))
+WORK_QUEUE = WorkQueue(max_workers=PARSE_WORKERS, name="ats-parse")
+
+# Batch matching limits: at most BATCH_MAX_IN_FLIGHT resumes are read and
+# parsed at any time, and a single request may carry up to BATCH_MAX_FILES
+BATCH_MAX_IN_FLIGHT = int(os.getenv("ATS_BATCH_MAX_IN_FLIGHT", "4"))
+BATCH_MAX_FILES = int(os.getenv("ATS_BATCH_MAX_FILES", "500"))
+
+# Asynchronous matching jobs for runs too large for a single request
+JOB_MAX_JOBS = int(os.getenv("ATS_JOB_MAX_JOBS", "100"))
+JOB_MAX_ITEMS = int(os.getenv("ATS_JOB_MAX_ITEMS", "10000"))
+JOB_RETENTION_SECONDS = float(os.getenv("ATS_JOB_RETENTION_SECONDS", "3600"))
+JOB_EVENTS_POLL_SECONDS = 0.5
+
+# Run the pipeline over built-in samples after loading the models, before
+# reporting ready
+WARMUP_ENABLED = os.getenv("ATS_WARMUP", "1") == "1"
+
+# Micro-batching of spaCy calls across concurrent requests. A window of 0 ms
+# disables it; see benchmarks/microbatch_load.py for the throughput/latency trade-off
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("ATS_MICROBATCH_MAX_WAIT_MS", "0"))
+MICROBATCH_MAX_SIZE = int(os.getenv("ATS_MICROBATCH_MAX_SIZE", "16"))
+
+# Per-request profiling: profile=true adds a stage/counter breakdown to the
+# response; cProfile dumps (profile_dump=true) are an admin-only feature
+PROFILE_DUMPS_ENABLED = os.getenv("ATS_ENABLE_PROFILE_DUMPS", "0") == "1"
+PROFILE_DUMP_DIR = os.getenv("ATS_PROFILE_DUMP_DIR", "profiles")
+# Per-stage memory accounting with tracemalloc (slows every request down, so
+# off by default): peak/retained histograms per stage, and with profile=true
+# the top allocation sites of each stage. While on, parses and matches run one
+# at a time in the process (the JD and CV of a match are no longer parsed in
+# parallel), so don't read latency or concurrency figures from such a worker
+MEMORY_TRACING = os.getenv("ATS_MEMORY_TRACING", "0") == "1"
+MEMORY_TRACE_FRAMES = int(os.getenv("ATS_MEMORY_TRACE_FRAMES", "1"))
+MEMORY_TOP_SITES = int(os.getenv("ATS_MEMORY_TOP_SITES", "5"))
+if MEMORY_TRACING:
+    start_memory_tracing(MEMORY_TRACE_FRAMES)
+
+# Chatbot: one knowledge base and bot shared by all sessions; per-visitor
+# history lives in a bounded session store with an idle TTL
+CHAT_KB_FILE = os.getenv(
+    "CHAT_KB_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "jobsterritory_content.json")
 )
+CHAT_MAX_SESSIONS = int(os.getenv("CHAT_MAX_SESSIONS", "50000"))
+CHAT_SESSION_TTL_SECONDS = float(os.getenv("CHAT_SESSION_TTL_SECONDS", "1800"))
+CHAT_MAX_MESSAGE_CHARS = int(os.getenv("CHAT_MAX_MESSAGE_CHARS", "1000"))
+CHAT_MAX_SESSION_ID_CHARS = 64
+# Answers cached by normalized query (0 disables)
+CHAT_RESPONSE_CACHE_SIZE = int(os.getenv("CHAT_RESPONSE_CACHE_SIZE", "2048"))
+# Poll the knowledge base file and hot-reload it on change (0 disables; SIGHUP always reloads)
+CHAT_KB_RELOAD_SECONDS = float(os.getenv("CHAT_KB_RELOAD_SECONDS", "5"))
+# Blend word-vector similarity into chatbot search when the spaCy model has
+# vectors; skipped while its p99 latency is over the budget
+CHAT_SEMANTIC_SEARCH = os.getenv("CHAT_SEMANTIC_SEARCH", "1") == "1"
+CHAT_SEMANTIC_P99_BUDGET_MS = float(os.getenv("CHAT_SEMANTIC_P99_BUDGET_MS", "8"))
+
+# Admission control: bounded concurrency and wait queue per route, so that a
+# spike gets fast 503s instead of slowing every request down together
+MATCH_ADMISSION = AdmissionController(
+    "match",
+    max_concurrency=int(os.getenv("ATS_MATCH_MAX_CONCURRENCY", str(max(1, PARSE_WORKERS // 2)))),
+    max_queue=int(os.getenv("ATS_MATCH_MAX_QUEUE", "16")),
+    queue_timeout=float(os.getenv("ATS_MATCH_QUEUE_TIMEOUT", "10")),
+    retry_after=int(os.getenv("ATS_MATCH_RETRY_AFTER", "2"))
+)
+PARSE_ADMISSION = AdmissionController(
+    "parse",
+    max_concurrency=int(os.getenv("ATS_PARSE_MAX_CONCURRENCY", str(PARSE_WORKERS))),
+    max_queue=int(os.getenv("ATS_PARSE_MAX_QUEUE", "32")),
+    queue_timeout=float(os.getenv("ATS_PARSE_QUEUE_TIMEOUT", "10")),
+    retry_after=int(os.getenv("ATS_PARSE_RETRY_AFTER", "1"))
+)
+# Batch matching streams and job uploads: few at a time, since each one
+# carries many resumes; polling, paging and cancelling jobs are not limited
+BATCH_ADMISSION = AdmissionController(
+    "batch",
+    max_concurrency=int(os.getenv("ATS_BATCH_MAX_CONCURRENCY", "2")),
+    max_queue=int(os.getenv("ATS_BATCH_MAX_QUEUE", "4")),
+    queue_timeout=float(os.getenv("ATS_BATCH_QUEUE_TIMEOUT", "10")),
+    retry_after=int(os.getenv("ATS_BATCH_RETRY_AFTER", "5"))
+)
+
+# Admission runs as ASGI middleware so that a rejected request is answered
+# before its uploads are read. It is added before CORS, so CORS wraps it and
+# 503s still carry CORS headers.
+app.add_middleware(AdmissionMiddleware, routes=[
+    ("POST", r"/api/ats/match", MATCH_ADMISSION),
+    ("POST", r"/api/ats/parse", PARSE_ADMISSION),
+    ("POST", r"/api/ats/match/batch", BATCH_ADMISSION),
+    ("POST", r"/api/ats/jobs", BATCH_ADMISSION),
+    ("POST", r"/api/ats/jobs/[^/]+/resumes", BATCH_ADMISSION)
+])
 
 # Configure CORS
 app.add_middleware(
@@ -33,8 +156,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Supported file types
-SUPPORTED_FILE_TYPES = {'.pdf', '.docx', '.doc', '.txt'}
+CHAT_BOT = JobsTerritoryBot(KnowledgeBase(CHAT_KB_FILE, semantic_budget_ms=CHAT_SEMANTIC_P99_BUDGET_MS),
+                            response_cache_size=CHAT_RESPONSE_CACHE_SIZE)
+CHAT_SESSIONS = SessionStore(max_sessions=CHAT_MAX_SESSIONS, idle_ttl_seconds=CHAT_SESSION_TTL_SECONDS)
+
+# Scrape-time metrics for the limiter, work queue and micro-batcher
+def _admission_values(attribute: str) -> Dict[Tuple, float]:
+    return {(c.name,): getattr(c, attribute) for c in (MATCH_ADMISSION, PARSE_ADMISSION, BATCH_ADMISSION)}
+
+REGISTRY.callback("ats_admission_active", "Requests currently holding an admission slot",
+                  ("route",), lambda: _admission_values("active"))
+REGISTRY.callback("ats_admission_queue_depth", "Requests waiting for an admission slot",
+                  ("route",), lambda: _admission_values("queue_depth"))
+REGISTRY.callback("ats_admission_admitted_total", "Requests admitted",
+                  ("route",), lambda: _admission_values("admitted_total"), metric_type="counter")
+REGISTRY.callback("ats_admission_rejected_total", "Requests rejected with 503",
+                  ("route",), lambda: _admission_values("rejected_total"), metric_type="counter")
+REGISTRY.callback("ats_admission_wait_seconds_total", "Total time admitted requests spent queueing",
+                  ("route",), lambda: _admission_values("wait_seconds_total"), metric_type="counter")
+REGISTRY.callback("ats_work_queue_depth", "Parse/score work items waiting for a worker",
+                  (), lambda: {(): WORK_QUEUE.qsize()})
+REGISTRY.callback("ats_microbatch_items_total", "Documents processed through the spaCy micro-batcher",
+                  (), lambda: {(): ats_core.doc_batcher.items_total if ats_core.doc_batcher else 0}, metric_type="counter")
+REGISTRY.callback("ats_microbatch_batches_total", "nlp.pipe batches run by the micro-batcher",
+                  (), lambda: {(): ats_core.doc_batcher.batches_total if ats_core.doc_batcher else 0}, metric_type="counter")
+REGISTRY.callback("chat_sessions", "Active chat sessions in the session store",
+                  (), lambda: {(): len(CHAT_SESSIONS)})
+REGISTRY.callback("chat_sessions_evicted_total", "Chat sessions dropped, by reason",
+                  ("reason",), lambda: {("capacity",): CHAT_SESSIONS.stats()["evicted"],
+                                        ("idle",): CHAT_SESSIONS.stats()["expired"]}, metric_type="counter")
+def _chat_cache_value(key: str) -> Dict[Tuple, float]:
+    stats = CHAT_BOT.cache_stats()
+    return {(): stats[key]} if stats else {}
+
+REGISTRY.callback("chat_response_cache_hits_total", "Chatbot answers served from the response cache",
+                  (), lambda: _chat_cache_value("hits"), metric_type="counter")
+REGISTRY.callback("chat_response_cache_misses_total", "Chatbot answers computed because they were not cached",
+                  (), lambda: _chat_cache_value("misses"), metric_type="counter")
+REGISTRY.callback("chat_response_cache_entries", "Answers currently in the chatbot response cache",
+                  (), lambda: _chat_cache_value("size"))
+REGISTRY.callback("chat_knowledge_base_version", "Version of the loaded knowledge base (increments on each reload)",
+                  (), lambda: {(): CHAT_BOT.knowledge_base.version})
+REGISTRY.callback("chat_semantic_search_total", "Chatbot searches by whether semantic ranking ran or was skipped over budget",
+                  ("outcome",), lambda: {("ran",): CHAT_BOT.knowledge_base.semantic_budget.runs,
+                                         ("skipped",): CHAT_BOT.knowledge_base.semantic_budget.skipped},
+                  metric_type="counter")
+REGISTRY.callback("ats_process_memory_bytes", "Memory of this worker process by kind (rss, pss, ...)",
+                  ("kind",), lambda: {(kind,): value for kind, value in (process_memory() or {}).items()})
 
 def get_file_extension(filename: str) -> str:
     """Extract file extension from filename"""
@@ -58,20 +226,204 @@ def validate_file(file: UploadFile) -> str:
     
     return file_ext.lstrip('.')
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize NLP models on startup"""
-    logger.info("Initializing NLP models...")
+def _elapsed_ms(start: float) -> float:
+    """Milliseconds elapsed since a time.perf_counter() reading"""
+    return round((time.perf_counter() - start) * 1000, 2)
+
+def _timed_parse(file_content: bytes, file_type: str, is_jd: bool,
+                 profile: Optional[RequestProfile] = None) -> Tuple[Dict[str, Any], float]:
+    """Parse a document and return it together with the parse duration in ms"""
+    start = time.perf_counter()
+    parsed = run_profiled(profile, parse_document, file_content, file_type, is_jd=is_jd)
+    return parsed, _elapsed_ms(start)
+
+def create_request_profile(profile: bool, profile_dump: bool) -> Optional[RequestProfile]:
+    """Profile for a request that asked for one; cProfile dumps need the admin flag"""
+    if profile_dump and not PROFILE_DUMPS_ENABLED:
+        raise HTTPException(status_code=403, detail="cProfile dumps are disabled on this server")
+    if not (profile or profile_dump):
+        return None
+    return RequestProfile(record_cprofile=profile_dump, memory_top_sites=MEMORY_TOP_SITES if MEMORY_TRACING else 0)
+
+def profile_section(profile: Optional[RequestProfile], name: str) -> Optional[RequestProfile]:
+    """Section of a request profile, or None when profiling is off"""
+    return profile.section(name) if profile is not None else None
+
+def profile_report(profile: RequestProfile, label: str) -> Dict[str, Any]:
+    """Breakdown for the response metadata, writing the cProfile dump if one was recorded"""
+    report = profile.to_dict()
+    if profile.record_cprofile:
+        report["cprofile_dump"] = profile.dump_cprofile(PROFILE_DUMP_DIR, label)
+    return report
+
+def json_response(content: Dict[str, Any], route: str, fields: Optional[str] = None) -> Response:
+    """Serialize a response, keeping only the requested fields, and record its size"""
+    body = render_json(select_fields(content, parse_fields(fields)), route)
+    return Response(content=body, media_type="application/json")
+
+async def run_in_parse_pool(func, *args, priority: int = PRIORITY_INTERACTIVE, **kwargs):
+    """Run a blocking parse/score function on the parse worker pool"""
+    return await asyncio.wrap_future(WORK_QUEUE.submit(func, *args, priority=priority, **kwargs))
+
+async def _match_batch_item(parsed_jd: Dict[str, Any], upload: UploadFile) -> Dict[str, Any]:
+    """Read, parse and score one resume of a batch; errors are reported per file"""
+    try:
+        cv_file_type = validate_file(upload)
+        cv_content = await upload.read()
+        return await run_in_parse_pool(
+            build_match_line, parsed_jd, upload.filename, cv_content, cv_file_type, priority=PRIORITY_BATCH
+        )
+    except HTTPException as e:
+        return {"filename": upload.filename, "score": None, "breakdown": None, "error": e.detail}
+    finally:
+        # Release the spooled upload as soon as this resume is done
+        await upload.close()
+
+def _process_job_item(parsed_jd: Dict[str, Any], item: Dict[str, Any]) -> Dict[str, Any]:
+    """JobManager callback: score one queued resume of a matching job"""
+    if item.get("error"):
+        return {"filename": item["filename"], "score": None, "breakdown": None, "error": item["error"]}
+    return build_match_line(parsed_jd, item["filename"], item["content"], item["file_type"])
+
+JOB_MANAGER = JobManager(
+    WORK_QUEUE,
+    _process_job_item,
+    max_jobs=JOB_MAX_JOBS,
+    max_items_per_job=JOB_MAX_ITEMS,
+    retention_seconds=JOB_RETENTION_SECONDS
+)
+
+async def read_job_items(uploads: List[UploadFile]) -> List[Dict[str, Any]]:
+    """Read uploaded resumes into job items; invalid files become error items"""
+    items = []
+    for upload in uploads:
+        try:
+            file_type = validate_file(upload)
+            items.append({"filename": upload.filename, "content": await upload.read(), "file_type": file_type})
+        except HTTPException as e:
+            items.append({"filename": upload.filename, "error": e.detail})
+        finally:
+            await upload.close()
+    return items
+
+def get_job_or_404(job_id: str):
+    """Look up a matching job or raise a 404"""
+    try:
+        return JOB_MANAGER.get_job(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+async def stream_batch_results(parsed_jd: Dict[str, Any], uploads: List[UploadFile]):
+    """
+    Yield one NDJSON line per resume in completion order.
+    
+    At most BATCH_MAX_IN_FLIGHT resumes are in progress at once and new work is
+    only started after a finished line has been handed to the server. A slow
+    client therefore stalls the generator (the ASGI server stops pulling while
+    its write buffer is full) instead of letting results pile up in memory.
+    """
+    remaining = iter(uploads)
+    pending = set()
+    
+    def fill():
+        for upload in remaining:
+            pending.add(asyncio.ensure_future(_match_batch_item(parsed_jd, upload)))
+            if len(pending) >= BATCH_MAX_IN_FLIGHT:
+                break
+    
+    try:
+        fill()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield dumps(task.result()) + b"\n"
+            fill()
+    finally:
+        # Client went away or the stream was aborted: stop outstanding work
+        for task in pending:
+            task.cancel()
+
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    """Observe request latency for the ATS API routes"""
+    if not request.url.path.startswith("/api/ats/"):
+        return await call_next(request)
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    REQUEST_SECONDS.observe(
+        time.perf_counter() - start,
+        route=route.path if route is not None else "unmatched",
+        status=str(response.status_code)
+    )
+    return response
+
+# Readiness state, separate from liveness (/api/health)
+readiness = {"state": "loading", "model_loading": None}
+
+def load_models():
+    """Load NLP models (a no-op if already loaded, e.g. by a preforking parent) and warm up"""
     if initialize_nlp():
         logger.info("NLP models initialized successfully")
+        if MICROBATCH_MAX_WAIT_MS > 0:
+            enable_micro_batching(max_batch_size=MICROBATCH_MAX_SIZE, max_wait_ms=MICROBATCH_MAX_WAIT_MS)
+        if WARMUP_ENABLED and not nlp_status()["warmed_up"]:
+            warm_up()
+        if CHAT_SEMANTIC_SEARCH:
+            enable_semantic_chat_search()
+        readiness["state"] = "ready"
     else:
         logger.error("Failed to initialize NLP models")
+        readiness["state"] = "unavailable"
+
+def enable_semantic_chat_search():
+    """Index the knowledge base with the loaded spaCy model's word vectors, if it has any"""
+    vectorize = spacy_vectorizer(ats_core.nlp)
+    if vectorize is None:
+        logger.info(f"Chatbot semantic search off: no word vectors in '{ats_core.SPACY_MODEL}' or numpy missing")
+        return
+    CHAT_BOT.knowledge_base.enable_semantic_search(vectorize)
+    logger.info("Chatbot semantic search enabled")
+
+@app.on_event("startup")
+async def startup_event():
+    """Start loading NLP models without blocking the server from accepting connections"""
+    logger.info("Initializing NLP models...")
+    loop = asyncio.get_running_loop()
+    readiness["model_loading"] = loop.run_in_executor(None, load_models)
+    
+    # Knowledge base hot reload, always off the request path
+    knowledge_base = CHAT_BOT.knowledge_base
+    if CHAT_KB_RELOAD_SECONDS > 0:
+        knowledge_base.start_watching(CHAT_KB_RELOAD_SECONDS)
+    try:
+        loop.add_signal_handler(signal.SIGHUP, lambda: loop.run_in_executor(None, knowledge_base.reload, True))
+    except (AttributeError, NotImplementedError, RuntimeError):
+        logger.info("SIGHUP reload not available on this platform")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background watchers"""
+    CHAT_BOT.knowledge_base.stop_watching()
 
 @app.get("/")
 async def root():
     """Health check endpoint"""
     return {"message": "Advanced ATS Matching API is running", "status": "healthy"}
 
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness probe: 200 once models are loaded and warmed up, 503 until then"""
+    body = {"status": readiness["state"], "nlp": nlp_status()}
+    if readiness["state"] != "ready":
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics: stage latency histograms, fallback counters and load gauges"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/health")
 async def health_check():
     """Detailed health check"""
@@ -88,14 +440,29 @@ async def health_check():
             "Academic info extraction",
             "Responsibility matching",
             "Ephemeral processing"
-        ]
+        ],
+        "admission": {
+            "match": MATCH_ADMISSION.stats(),
+            "parse": PARSE_ADMISSION.stats(),
+            "batch": BATCH_ADMISSION.stats()
+        },
+        "pid": os.getpid(),
+        "work_queue_depth": WORK_QUEUE.qsize(),
+        "json_backend": JSON_BACKEND,
+        "micro_batching": ats_core.doc_batcher.stats() if ats_core.doc_batcher else None,
+        "chat_sessions": CHAT_SESSIONS.stats(),
+        "knowledge_base": CHAT_BOT.knowledge_base.stats(),
+        "chat_response_cache": CHAT_BOT.cache_stats()
     }
 
 @app.post("/api/ats/match")
 async def match_cv_to_jd(
     jd_file: UploadFile = File(..., description="Job Description file (PDF, DOCX, or TXT)"),
-    resume_file: UploadFile = File(..., description="Resume/CV file (PDF, DOCX, or TXT)")
-) -> Dict[str, Any]:
+    resume_file: UploadFile = File(..., description="Resume/CV file (PDF, DOCX, or TXT)"),
+    profile: bool = False,
+    profile_dump: bool = False,
+    fields: Optional[str] = None
+) -> Response:
     """
     Advanced CV-to-JD matching endpoint with comprehensive analysis
     
@@ -110,18 +477,25 @@ async def match_cv_to_jd(
     - Academic qualifications review
     - JD responsibilities matching
     - Detailed feedback for recruiters
+    
+    With profile=true, metadata.timings.profile breaks the request down by
+    stage with spaCy call, sentence and regex match counts. fields=score,matched_skills
+    returns only those keys (dotted paths such as metadata.timings work too).
     """
     
     try:
+        request_profile = create_request_profile(profile, profile_dump)
         logger.info(f"Processing match request: JD={jd_file.filename}, CV={resume_file.filename}")
         
         # Validate both files
         jd_file_type = validate_file(jd_file)
         cv_file_type = validate_file(resume_file)
         
-        # Read file contents into memory (ephemeral processing)
-        jd_content = await jd_file.read()
-        cv_content = await resume_file.read()
+        request_start = time.perf_counter()
+        
+        # Read both uploads concurrently (ephemeral processing)
+        jd_content, cv_content = await asyncio.gather(jd_file.read(), resume_file.read())
+        read_ms = _elapsed_ms(request_start)
         
         # Validate file contents
         if not jd_content:
@@ -131,29 +505,39 @@ async def match_cv_to_jd(
         
         logger.info(f"Files read successfully. JD: {len(jd_content)} bytes, CV: {len(cv_content)} bytes")
         
-        # Parse Job Description
-        try:
-            parsed_jd = parse_document(jd_content, jd_file_type, is_jd=True)
-            logger.info(f"JD parsed successfully. Skills found: {len(parsed_jd.get('skills', []))}")
-        except Exception as e:
-            logger.error(f"Failed to parse JD: {e}")
-            raise HTTPException(status_code=422, detail=f"Failed to parse Job Description: {str(e)}")
+        # Parse Job Description and CV/Resume concurrently; they are independent
+        # until scoring, so we only join here
+        parse_start = time.perf_counter()
+        jd_outcome, cv_outcome = await asyncio.gather(
+            run_in_parse_pool(_timed_parse, jd_content, jd_file_type, True, profile_section(request_profile, "jd")),
+            run_in_parse_pool(_timed_parse, cv_content, cv_file_type, False, profile_section(request_profile, "cv")),
+            return_exceptions=True
+        )
+        parse_wall_ms = _elapsed_ms(parse_start)
         
-        # Parse CV/Resume
-        try:
-            parsed_cv = parse_document(cv_content, cv_file_type, is_jd=False)
-            logger.info(f"CV parsed successfully. Skills found: {len(parsed_cv.get('skills', []))}")
-        except Exception as e:
-            logger.error(f"Failed to parse CV: {e}")
-            raise HTTPException(status_code=422, detail=f"Failed to parse Resume/CV: {str(e)}")
+        if isinstance(jd_outcome, Exception):
+            logger.error(f"Failed to parse JD: {jd_outcome}")
+            raise HTTPException(status_code=422, detail=f"Failed to parse Job Description: {str(jd_outcome)}")
+        if isinstance(cv_outcome, Exception):
+            logger.error(f"Failed to parse CV: {cv_outcome}")
+            raise HTTPException(status_code=422, detail=f"Failed to parse Resume/CV: {str(cv_outcome)}")
+        
+        parsed_jd, parse_jd_ms = jd_outcome
+        parsed_cv, parse_cv_ms = cv_outcome
+        logger.info(f"JD parsed successfully. Skills found: {len(parsed_jd.get('skills', []))}")
+        logger.info(f"CV parsed successfully. Skills found: {len(parsed_cv.get('skills', []))}")
         
         # Calculate comprehensive match score
+        score_start = time.perf_counter()
         try:
-            match_result = calculate_match_score(parsed_jd, parsed_cv)
+            match_result = await run_in_parse_pool(
+                run_profiled, profile_section(request_profile, "match"), calculate_match_score, parsed_jd, parsed_cv
+            )
             logger.info(f"Match calculation completed. Score: {match_result.get('score', 0)}")
         except Exception as e:
             logger.error(f"Failed to calculate match score: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to calculate match score: {str(e)}")
+        score_ms = _elapsed_ms(score_start)
         
         # Enhance result with metadata
         enhanced_result = {
@@ -166,12 +550,23 @@ async def match_cv_to_jd(
                 "jd_experience_years": parsed_jd.get('experience', {}).get('years_of_experience', 0),
                 "cv_experience_years": parsed_cv.get('experience', {}).get('years_of_experience', 0),
                 "jd_responsibilities_count": len(parsed_jd.get('key_responsibilities', [])),
+                "timings": {
+                    "read_ms": read_ms,
+                    "parse_jd_ms": parse_jd_ms,
+                    "parse_cv_ms": parse_cv_ms,
+                    "parse_wall_ms": parse_wall_ms,
+                    "score_ms": score_ms,
+                    "total_ms": _elapsed_ms(request_start)
+                },
                 "processing_note": "Files processed in-memory only. No data stored on server."
             }
         }
         
+        if request_profile is not None:
+            enhanced_result["metadata"]["timings"]["profile"] = profile_report(request_profile, "match")
+        
         logger.info("Match request completed successfully")
-        return enhanced_result
+        return json_response(enhanced_result, "/api/ats/match", fields)
         
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -180,17 +575,161 @@ async def match_cv_to_jd(
         logger.error(f"Unexpected error in match endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@app.post("/api/ats/match/batch")
+async def match_batch(
+    jd_file: UploadFile = File(..., description="Job Description file (PDF, DOCX, or TXT)"),
+    resume_files: List[UploadFile] = File(..., description="Resume/CV files (PDF, DOCX, or TXT)")
+) -> StreamingResponse:
+    """
+    Match many CVs against one JD and stream the results back as NDJSON
+    
+    The JD is parsed once up front. Each resume then produces one line as soon
+    as it has been scored, containing the filename, score, a compact breakdown
+    and any per-file error. Lines arrive in completion order, not upload order.
+    """
+    
+    logger.info(f"Processing batch match request: JD={jd_file.filename}, CVs={len(resume_files)}")
+    
+    if len(resume_files) > BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many resume files: {len(resume_files)}. Maximum {BATCH_MAX_FILES} per request."
+        )
+    
+    jd_file_type = validate_file(jd_file)
+    jd_content = await jd_file.read()
+    if not jd_content:
+        raise HTTPException(status_code=400, detail="JD file is empty")
+    
+    try:
+        parsed_jd = await run_in_parse_pool(parse_document, jd_content, jd_file_type, is_jd=True)
+    except Exception as e:
+        logger.error(f"Failed to parse JD: {e}")
+        raise HTTPException(status_code=422, detail=f"Failed to parse Job Description: {str(e)}")
+    
+    return StreamingResponse(
+        stream_batch_results(parsed_jd, resume_files),
+        media_type="application/x-ndjson"
+    )
+
+@app.post("/api/ats/jobs", status_code=202)
+async def create_match_job(
+    jd_file: UploadFile = File(..., description="Job Description file (PDF, DOCX, or TXT)"),
+    resume_files: List[UploadFile] = File([], description="First chunk of Resume/CV files")
+) -> Dict[str, Any]:
+    """
+    Start an asynchronous matching job for one JD
+    
+    Resumes can be sent with this request and/or in further chunks through
+    POST /api/ats/jobs/{job_id}/resumes. Poll GET /api/ats/jobs/{job_id} or
+    subscribe to /events for progress, page through /results, and DELETE the
+    job to cancel it.
+    """
+    
+    jd_file_type = validate_file(jd_file)
+    jd_content = await jd_file.read()
+    if not jd_content:
+        raise HTTPException(status_code=400, detail="JD file is empty")
+    
+    try:
+        parsed_jd = await run_in_parse_pool(parse_document, jd_content, jd_file_type, is_jd=True)
+    except Exception as e:
+        logger.error(f"Failed to parse JD: {e}")
+        raise HTTPException(status_code=422, detail=f"Failed to parse Job Description: {str(e)}")
+    
+    # Read the first chunk before registering the job, so that a failed read
+    # leaves no job behind. A job that never gets resumes expires after
+    # ATS_JOB_RETENTION_SECONDS
+    items = await read_job_items(resume_files) if resume_files else []
+    try:
+        job = JOB_MANAGER.create_job(parsed_jd, metadata={"jd_filename": jd_file.filename})
+    except JobLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    if items:
+        try:
+            JOB_MANAGER.add_items(job.id, items)
+        except JobLimitError as e:
+            JOB_MANAGER.delete_job(job.id)
+            raise HTTPException(status_code=429, detail=str(e))
+    
+    return job.progress()
+
+@app.post("/api/ats/jobs/{job_id}/resumes", status_code=202)
+async def add_job_resumes(
+    job_id: str,
+    resume_files: List[UploadFile] = File(..., description="Resume/CV files (PDF, DOCX, or TXT)")
+) -> Dict[str, Any]:
+    """Add another chunk of resumes to an existing matching job"""
+    job = get_job_or_404(job_id)
+    try:
+        JOB_MANAGER.add_items(job.id, await read_job_items(resume_files))
+    except JobLimitError as e:
+        raise HTTPException(status_code=409 if job.cancelled else 429, detail=str(e))
+    return job.progress()
+
+@app.get("/api/ats/jobs/{job_id}")
+async def get_job_progress(job_id: str) -> Dict[str, Any]:
+    """Progress of a matching job (done and total)"""
+    return get_job_or_404(job_id).progress()
+
+@app.get("/api/ats/jobs/{job_id}/events")
+async def stream_job_events(job_id: str) -> StreamingResponse:
+    """Server-sent events with job progress until the job completes or is cancelled"""
+    job = get_job_or_404(job_id)
+    
+    async def events():
+        last = None
+        while True:
+            progress = job.progress()
+            if progress != last:
+                yield f"event: progress\ndata: {json.dumps(progress)}\n\n"
+                last = progress
+            if progress["status"] != "running" or not JOB_MANAGER.has_job(job.id):
+                break
+            await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/api/ats/jobs/{job_id}/results")
+async def get_job_results(job_id: str, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+    """Page through a job's result lines in completion order"""
+    job = get_job_or_404(job_id)
+    if offset < 0 or limit < 1 or limit > 1000:
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and limit between 1 and 1000")
+    results = job.page(offset, limit)
+    return {
+        **job.progress(),
+        "offset": offset,
+        "limit": limit,
+        "results": results,
+        "next_offset": offset + len(results)
+    }
+
+@app.delete("/api/ats/jobs/{job_id}")
+async def cancel_match_job(job_id: str) -> Dict[str, Any]:
+    """Cancel a matching job; queued resumes are dropped"""
+    get_job_or_404(job_id)
+    return JOB_MANAGER.cancel_job(job_id).progress()
+
 @app.post("/api/ats/parse")
 async def parse_single_document(
     file: UploadFile = File(..., description="Document to parse (PDF, DOCX, or TXT)"),
-    is_jd: bool = False
-) -> Dict[str, Any]:
+    is_jd: bool = False,
+    profile: bool = False,
+    profile_dump: bool = False,
+    include_text: bool = False,
+    fields: Optional[str] = None
+) -> Response:
     """
     Parse a single document (JD or CV) and return extracted information
-    Useful for testing and debugging parsing capabilities
+    Useful for testing and debugging parsing capabilities; profile=true adds
+    a metadata.timings breakdown. The full text is only returned with
+    include_text=true (a 500-character preview otherwise), and fields=skills,experience
+    returns only those keys.
     """
     
     try:
+        request_profile = create_request_profile(profile, profile_dump)
         logger.info(f"Parsing single document: {file.filename}, is_jd={is_jd}")
         
         # Validate file
@@ -201,8 +740,8 @@ async def parse_single_document(
         if not file_content:
             raise HTTPException(status_code=400, detail="File is empty")
         
-        # Parse document
-        parsed_result = parse_document(file_content, file_type, is_jd=is_jd)
+        # Parse document off the event loop
+        parsed_result, parse_ms = await run_in_parse_pool(_timed_parse, file_content, file_type, is_jd, request_profile)
         
         # Add metadata
         result = {
@@ -216,13 +755,18 @@ async def parse_single_document(
             }
         }
         
+        if request_profile is not None:
+            result["metadata"]["timings"] = {"parse_ms": parse_ms, "profile": profile_report(request_profile, "parse")}
+        
         # Remove full text from response to keep it manageable
         if 'text' in result:
             result['text_preview'] = result['text'][:500] + "..." if len(result['text']) > 500 else result['text']
-            del result['text']
+            if not include_text:
+                del result['text']
+                result.pop('cleaned_text', None)
         
         logger.info("Document parsing completed successfully")
-        return result
+        return json_response(result, "/api/ats/parse", fields)
         
     except HTTPException:
         raise
@@ -230,6 +774,54 @@ async def parse_single_document(
         logger.error(f"Error parsing document: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to parse document: {str(e)}")
 
+class ChatRequest(BaseModel):
+    message: str
+    session_id: Optional[str] = None
+
+def get_chat_session_or_404(session_id: str):
+    """Look up a chat session or raise a 404"""
+    session = CHAT_SESSIONS.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Chat session not found: {session_id}")
+    return session
+
+@app.post("/api/chat")
+async def chat(request: ChatRequest) -> Dict[str, Any]:
+    """
+    Answer a visitor's question about Jobs Territory
+    
+    Send the session_id from the previous reply to continue a conversation;
+    without one (or with an unknown or expired one) a new session is started
+    under a new server-generated ID.
+    """
+    if len(request.message) > CHAT_MAX_MESSAGE_CHARS:
+        raise HTTPException(status_code=400, detail=f"Message too long. Maximum {CHAT_MAX_MESSAGE_CHARS} characters.")
+    if request.session_id and len(request.session_id) > CHAT_MAX_SESSION_ID_CHARS:
+        raise HTTPException(status_code=400, detail="Invalid session_id")
+    
+    session = CHAT_SESSIONS.get_or_create(request.session_id)
+    # BM25 search, spelling correction and semantic scoring are CPU work
+    result = await run_in_parse_pool(CHAT_BOT.process_query, request.message, history=session.history)
+    return {"session_id": session.session_id, **result}
+
+@app.get("/api/chat/suggestions")
+async def chat_suggestions() -> Dict[str, Any]:
+    """Topics the chatbot can help with"""
+    return {"suggestions": CHAT_BOT.knowledge_base.get_fallback_suggestions()}
+
+@app.get("/api/chat/{session_id}/history")
+async def chat_history(session_id: str) -> Dict[str, Any]:
+    """Recent conversation turns of a session"""
+    session = get_chat_session_or_404(session_id)
+    return {"session_id": session_id, "history": list(session.history)}
+
+@app.delete("/api/chat/{session_id}")
+async def end_chat(session_id: str) -> Dict[str, Any]:
+    """End a session and discard its history"""
+    if not CHAT_SESSIONS.delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Chat session not found: {session_id}")
+    return {"session_id": session_id, "deleted": True}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Process memory figures from /proc for the ATS backend
+RSS counts every resident page, including pages shared with other workers
+after a fork. PSS divides each shared page by the number of processes that
+map it, so the PSS values of all workers add up to the real footprint.
+"""
+
+import os
+from typing import Dict, Optional, Union
+
+# smaps_rollup fields reported, in bytes, under lower-case names
+SMAPS_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared_clean",
+    "Shared_Dirty": "shared_dirty",
+    "Private_Clean": "private_clean",
+    "Private_Dirty": "private_dirty",
+    "Swap": "swap"
+}
+
+
+def parse_smaps(text: str) -> Dict[str, int]:
+    """
+    Sum the memory fields of /proc/<pid>/smaps_rollup (or smaps) output.
+
+    smaps_rollup has a single block; smaps has one block per mapping, so
+    values are summed across blocks in both cases.
+    """
+    totals = {name: 0 for name in SMAPS_FIELDS.values()}
+    for line in text.splitlines():
+        key, _, rest = line.partition(":")
+        name = SMAPS_FIELDS.get(key)
+        if name is None:
+            continue
+        parts = rest.split()
+        if parts:
+            totals[name] += int(parts[0]) * 1024
+    return totals
+
+
+def process_memory(pid: Union[int, str] = "self") -> Optional[Dict[str, int]]:
+    """
+    RSS, PSS, shared and private memory of a process in bytes.
+
+    Returns None where /proc is not available (non-Linux) or the process
+    has exited.
+    """
+    for name in ("smaps_rollup", "smaps"):
+        try:
+            with open(os.path.join("/proc", str(pid), name), encoding="utf-8") as f:
+                return parse_smaps(f.read())
+        except FileNotFoundError:
+            continue
+        except (PermissionError, ProcessLookupError, OSError):
+            return None
+    return None
+
+
+def format_bytes(value: int) -> str:
+    """Human-readable size in MiB"""
+    return f"{value / (1024 * 1024):.1f} MiB"
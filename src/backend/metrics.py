@@ -0,0 +1,298 @@
+"""
+Lightweight Prometheus-style metrics for the ATS backend
+Counters, histograms and callback metrics rendered in the Prometheus text
+exposition format; cheap enough (one lock and a bisect per observation)
+to stay enabled in production
+"""
+
+import bisect
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from profiling import current_profile, StageMemory
+
+# Latency buckets in seconds, from sub-millisecond regex passes to multi-second PDFs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Response size buckets in bytes, from a selected field or two up to full parse results
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Per-stage memory buckets in bytes, from a regex pass up to a large PDF's object tree
+MEMORY_BUCKETS = (16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864, 268435456, 1073741824)
+
+_INF_BUCKET = 'le="+Inf"'
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing counter with optional labels"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels.get(name, "") for name in self.label_names), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets and optional labels"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(tuple(labels.get(name, "") for name in self.label_names))
+        return int(state[-1]) if state else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, _INF_BUCKET)} {int(state[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(float(state[-2]))}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {int(state[-1])}")
+        return lines
+
+
+class CallbackMetric:
+    """Gauge or counter whose values are read from a callback at scrape time"""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str],
+                 callback: Callable[[], Dict[Tuple, float]], metric_type: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.callback = callback
+        self.metric_type = metric_type
+
+    def samples(self) -> List[str]:
+        values = self.callback()
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+                for key, value in sorted(values.items())]
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def callback(self, name: str, documentation: str, labels: Sequence[str],
+                 callback: Callable[[], Dict[Tuple, float]], metric_type: str = "gauge") -> CallbackMetric:
+        """Register (or replace) a metric computed from a callback at scrape time"""
+        metric = CallbackMetric(name, documentation, labels, callback, metric_type)
+        with self._lock:
+            self._metrics[name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# tracemalloc's counters are process-wide. While it is tracing, a timer
+# holds this lock for its with block, so the stages of different timers
+# (e.g. the JD and CV of one match, parsed on two pool threads) run one at a
+# time and each stage's memory figures are its own. Reentrant, so a timed
+# function may call another one.
+_MEMORY_STAGE_LOCK = threading.RLock()
+
+
+class StageTimer:
+    """
+    Time consecutive stages of one function with a single clock.
+
+    Each lap(stage) observes the time since the previous lap (or since the
+    timer was created) into the histogram under the given stage label, and
+    into the active request profile when profiling was requested. While
+    tracemalloc is running, laps inside `with StageTimer(...) as timer:` also
+    record the stage's peak and retained memory, and such blocks run one at
+    a time across threads.
+    """
+
+    def __init__(self, histogram: Histogram, label: str, **labels):
+        self.histogram = histogram
+        self.label = label
+        self.labels = labels
+        self.profile = current_profile()
+        self.memory = None
+        self._last = time.perf_counter()
+
+    def __enter__(self) -> "StageTimer":
+        if tracemalloc.is_tracing():
+            _MEMORY_STAGE_LOCK.acquire()
+            self.memory = StageMemory(self.profile.memory_top_sites if self.profile is not None else 0)
+        # Waiting for the lock is not part of the first stage's time
+        self._last = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.memory is not None:
+            self.memory = None
+            _MEMORY_STAGE_LOCK.release()
+
+    def lap(self, stage: str) -> float:
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        self.histogram.observe(elapsed, **{self.label: stage}, **self.labels)
+        if self.profile is not None:
+            self.profile.add_stage(stage, elapsed)
+        if self.memory is not None:
+            self.record_memory(stage)
+        return elapsed
+
+    def record_memory(self, stage: str):
+        peak_bytes, retained_bytes, sites = self.memory.lap()
+        STAGE_MEMORY_PEAK_BYTES.observe(peak_bytes, stage=stage)
+        STAGE_MEMORY_RETAINED_BYTES.observe(max(0, retained_bytes), stage=stage)
+        if self.profile is not None:
+            self.profile.add_memory(stage, peak_bytes, retained_bytes, sites)
+        # Memory accounting is not part of the next stage's time
+        self._last = time.perf_counter()
+
+
+# Process-wide registry and the metrics shared across modules
+REGISTRY = MetricsRegistry()
+
+PARSE_STAGE_SECONDS = REGISTRY.histogram(
+    "ats_parse_stage_duration_seconds",
+    "Duration of each parse_document stage",
+    labels=("stage", "file_type")
+)
+MATCH_COMPONENT_SECONDS = REGISTRY.histogram(
+    "ats_match_component_duration_seconds",
+    "Duration of each calculate_match_score component",
+    labels=("component",)
+)
+FALLBACKS_TOTAL = REGISTRY.counter(
+    "ats_fallbacks_total",
+    "Times a degraded code path was taken (NLP not loaded, empty text, ...)",
+    labels=("reason",)
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "ats_request_duration_seconds",
+    "End-to-end duration of ATS API requests",
+    labels=("route", "status")
+)
+RESPONSE_BYTES = REGISTRY.histogram(
+    "ats_response_size_bytes",
+    "Size of serialized JSON response bodies",
+    labels=("route",),
+    buckets=SIZE_BUCKETS
+)
+STAGE_MEMORY_PEAK_BYTES = REGISTRY.histogram(
+    "ats_stage_memory_peak_bytes",
+    "Peak traced memory above the stage's starting point, per parse stage or match component (ATS_MEMORY_TRACING)",
+    labels=("stage",),
+    buckets=MEMORY_BUCKETS
+)
+STAGE_MEMORY_RETAINED_BYTES = REGISTRY.histogram(
+    "ats_stage_memory_retained_bytes",
+    "Traced memory still allocated when a parse stage or match component ends (ATS_MEMORY_TRACING)",
+    labels=("stage",),
+    buckets=MEMORY_BUCKETS
+)
+SERIALIZATION_SECONDS = REGISTRY.histogram(
+    "ats_response_serialization_seconds",
+    "Time spent serializing JSON response bodies",
+    labels=("route", "backend")
+)
+
+
+def count_fallback(reason: str):
+    """Record that a fallback code path was taken"""
+    FALLBACKS_TOTAL.inc(reason=reason)
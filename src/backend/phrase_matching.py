@@ -0,0 +1,94 @@
+"""
+Multi-phrase matching with an Aho-Corasick automaton
+All phrases are compiled into one automaton, so a single left-to-right scan
+of a text finds every phrase that occurs in it as a substring, however many
+phrases there are.
+"""
+
+from typing import Dict, Generic, Iterable, List, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class PhraseAutomaton(Generic[T]):
+    """
+    Aho-Corasick automaton mapping phrases to attached values.
+
+    add() phrases with a value each (the same phrase may be added several
+    times), then build() once. find() returns the values of every phrase
+    occurring in a text, once per added phrase, with the same substring
+    semantics as `phrase in text`.
+    """
+
+    def __init__(self):
+        # State 0 is the root; each state has goto edges, a failure link and
+        # the ids of the phrases that end there (including via failure links)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+        self._values: List[T] = []
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, phrase: str, value: T):
+        if self._built:
+            raise RuntimeError("Cannot add phrases after build()")
+        if not phrase:
+            return
+        state = 0
+        for char in phrase:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append(len(self._values))
+        self._values.append(value)
+
+    def build(self) -> "PhraseAutomaton[T]":
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+        self._built = True
+        return self
+
+    def find_ids(self, text: str) -> Set[int]:
+        """Ids (in insertion order numbering) of the phrases occurring in text"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+    def find(self, text: str) -> List[T]:
+        """Values of the phrases occurring in text, one per added phrase"""
+        values = self._values
+        return [values[phrase_id] for phrase_id in sorted(self.find_ids(text))]
+
+    @classmethod
+    def from_phrases(cls, phrases: Iterable[Tuple[str, T]]) -> "PhraseAutomaton[T]":
+        automaton = cls()
+        for phrase, value in phrases:
+            automaton.add(phrase, value)
+        return automaton.build()
@@ -0,0 +1,225 @@
+"""
+Per-request profiling for the ATS endpoints
+A RequestProfile collects stage durations and work counters (spaCy calls,
+sentences processed, regex matches per extractor) for one request, and can
+optionally record a cProfile dump. When no profile is active every hook is
+a single context-variable lookup.
+
+With tracemalloc running (start_memory_tracing), stages also account for
+memory: StageMemory measures the peak and retained traced allocations of
+each stage and, for profiled requests, the top allocation sites.
+"""
+
+import cProfile
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("ats_request_profile", default=None)
+
+
+def current_profile() -> Optional["RequestProfile"]:
+    """The profile of the request being processed in this context, if profiling was requested"""
+    return _current_profile.get()
+
+
+class RequestProfile:
+    """
+    Stage timings and counters for one request.
+
+    A request that parses several documents concurrently uses one section per
+    document (e.g. "jd", "cv", "match"); sections share the root's cProfile
+    recorders so a single dump covers the whole request.
+    """
+
+    def __init__(self, record_cprofile: bool = False, memory_top_sites: int = 0,
+                 _root: Optional["RequestProfile"] = None):
+        self.record_cprofile = record_cprofile
+        self.memory_top_sites = memory_top_sites
+        self.stages_ms: Dict[str, float] = {}
+        self.stages_memory: Dict[str, Dict] = {}
+        self.counters: Dict[str, int] = {}
+        self.sections: Dict[str, "RequestProfile"] = {}
+        self._root = _root or self
+        self._profilers: List[cProfile.Profile] = []
+        self.cprofile_skipped = False
+        self._lock = threading.Lock()
+
+    def section(self, name: str) -> "RequestProfile":
+        """Child profile for one part of the request"""
+        with self._lock:
+            child = self.sections.get(name)
+            if child is None:
+                child = self.sections[name] = RequestProfile(self.record_cprofile, self.memory_top_sites,
+                                                             _root=self._root)
+            return child
+
+    def add_stage(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages_ms[stage] = self.stages_ms.get(stage, 0.0) + seconds * 1000
+
+    def count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def add_memory(self, stage: str, peak_bytes: int, retained_bytes: int, top_sites: List[Dict]):
+        with self._lock:
+            self.stages_memory[stage] = {
+                "peak_kb": round(peak_bytes / 1024, 1),
+                "retained_kb": round(retained_bytes / 1024, 1),
+                **({"top_sites": top_sites} if top_sites else {})
+            }
+
+    def _start_cprofile(self) -> Optional[cProfile.Profile]:
+        if not self.record_cprofile:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per process, so of the
+            # concurrent JD and CV parses (or requests) only one is recorded
+            self.cprofile_skipped = True
+            return None
+        with self._root._lock:
+            self._root._profilers.append(profiler)
+        return profiler
+
+    def to_dict(self) -> Dict:
+        """Serializable breakdown; regex match counters are grouped by extractor"""
+        counters = {}
+        regex_matches = {}
+        for name, value in sorted(self.counters.items()):
+            if name.startswith("regex_matches."):
+                regex_matches[name.split(".", 1)[1]] = value
+            else:
+                counters[name] = value
+        result = {
+            "stages_ms": {stage: round(ms, 3) for stage, ms in self.stages_ms.items()},
+            **counters,
+            "regex_matches": regex_matches
+        }
+        if self.stages_memory:
+            result["memory"] = dict(self.stages_memory)
+        if self.cprofile_skipped:
+            result["cprofile_skipped"] = True
+        for name, child in self.sections.items():
+            result[name] = child.to_dict()
+        return result
+
+    def dump_cprofile(self, directory: str, label: str = "request") -> Optional[str]:
+        """Merge the recorded cProfile data into one pstats file and return its path"""
+        root = self._root
+        if not root._profilers:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        stats = pstats.Stats(root._profilers[0])
+        for profiler in root._profilers[1:]:
+            stats.add(profiler)
+        path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}.pstats")
+        stats.dump_stats(path)
+        return path
+
+
+def run_profiled(profile: Optional[RequestProfile], fn: Callable, *args, **kwargs):
+    """Call fn with `profile` active in this thread (and under cProfile if requested)"""
+    if profile is None:
+        return fn(*args, **kwargs)
+    token = _current_profile.set(profile)
+    profiler = profile._start_cprofile()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        _current_profile.reset(token)
+
+
+def start_memory_tracing(frames: int = 1) -> bool:
+    """Start tracemalloc (if it is not running) so that stages account for memory"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    return True
+
+
+# Allocations made by tracemalloc itself or by the import system are not
+# attributed to a stage's allocation sites
+_SITE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")
+)
+
+
+def _site_name(filename: str, lineno: int) -> str:
+    return f"{os.sep.join(filename.split(os.sep)[-2:])}:{lineno}"
+
+
+# tracemalloc.reset_peak() is new in Python 3.9
+_CAN_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+
+
+class StageMemory:
+    """
+    Peak and retained traced memory of consecutive stages.
+
+    tracemalloc's counters are process-wide, so a stage's figures include
+    whatever other threads allocate meanwhile; StageTimer therefore runs
+    timed functions one at a time while tracing. Top allocation sites need a
+    snapshot per stage, so they are only collected when asked for
+    (top_sites > 0, i.e. for profiled requests).
+
+    Before Python 3.9 the peak cannot be reset per stage. A stage's peak is
+    then exact only when it sets a new process-wide peak; otherwise the
+    memory it still holds at the lap is reported as a lower bound.
+    """
+
+    def __init__(self, top_sites: int = 0):
+        self.top_sites = top_sites
+        self._snapshot = self._take_snapshot() if top_sites else None
+        self._reset()
+
+    def _reset(self):
+        if _CAN_RESET_PEAK:
+            tracemalloc.reset_peak()
+        self._start, self._peak = tracemalloc.get_traced_memory()
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_SITE_FILTERS)
+
+    def lap(self) -> Tuple[int, int, List[Dict]]:
+        """(peak bytes, retained bytes, top allocation sites) of the stage since the previous lap"""
+        current, peak = tracemalloc.get_traced_memory()
+        if not (_CAN_RESET_PEAK or peak > self._peak):
+            peak = current
+        peak_bytes = max(0, peak - self._start)
+        retained_bytes = current - self._start
+        sites = []
+        if self.top_sites:
+            snapshot = self._take_snapshot()
+            for stat in snapshot.compare_to(self._snapshot, "lineno")[:self.top_sites]:
+                if stat.size_diff <= 0:
+                    break
+                frame = stat.traceback[0]
+                sites.append({"site": _site_name(frame.filename, frame.lineno),
+                              "size_kb": round(stat.size_diff / 1024, 1), "blocks": stat.count_diff})
+            self._snapshot = snapshot
+        # The next stage starts after the snapshot, so its cost is not counted
+        self._reset()
+        return peak_bytes, retained_bytes, sites
+
+
+def count(counter: str, amount: int = 1):
+    """
+    Increment a counter on the active profile, if any. Loops that count per
+    match look the profile up once with current_profile() instead.
+    """
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.count(counter, amount)
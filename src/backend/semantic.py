@@ -0,0 +1,178 @@
+"""
+Semantic retrieval for the chatbot knowledge base
+Entry vectors (keywords and answer) are computed once per knowledge base
+version and stacked into one unit-normalized NumPy matrix, so a query costs
+one vectorization and one matrix-vector product. Vectors come from the static
+word vectors of the spaCy model ats_core loads (tokenizer only, no pipeline),
+which needs a model that ships vectors (en_core_web_md/lg, not _sm).
+
+NumPy is optional: without it, or without a model with vectors, the
+knowledge base simply stays lexical.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Blending: an entry's similarity above MIN_SIMILARITY is rescaled to 0..1 and
+# added to its lexical score with this weight, so a close paraphrase with no
+# keyword hit still reaches medium confidence
+SEMANTIC_WEIGHT = 1.5
+MIN_SIMILARITY = 0.6
+TOP_K = 5
+
+
+def spacy_vectorizer(nlp) -> Optional[Callable[[str], Optional["np.ndarray"]]]:
+    """
+    Mean static word vector of the content words of a text, using only the
+    model's tokenizer. None if NumPy is missing or the model has no vectors.
+    """
+    if np is None or nlp is None or not nlp.vocab.vectors.shape[0]:
+        return None
+
+    def vectorize(text: str) -> Optional["np.ndarray"]:
+        vectors = [token.vector for token in nlp.make_doc(text)
+                   if token.has_vector and not token.is_stop and not token.is_punct]
+        if not vectors:
+            return None
+        return np.mean(vectors, axis=0)
+
+    return vectorize
+
+
+def _unit(vector: Optional["np.ndarray"]) -> Optional["np.ndarray"]:
+    if vector is None:
+        return None
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else None
+
+
+class SemanticIndex:
+    """
+    Unit-normalized entry vectors for cosine top-k search.
+
+    An entry's vector is its keyword vector, weighted keyword_weight times,
+    plus its answer vector. Entries without any vector get a zero row and so
+    never match.
+    """
+
+    def __init__(self, entries: List[Tuple[List[str], str, str]],
+                 vectorize: Callable[[str], Optional["np.ndarray"]], keyword_weight: float = 3.0):
+        if np is None:
+            raise RuntimeError("numpy is required for semantic search")
+        self.vectorize = vectorize
+        rows = []
+        dimensions = 0
+        for keywords, answer, _ in entries:
+            keyword_vector = _unit(vectorize(" ".join(keywords)))
+            answer_vector = _unit(vectorize(answer))
+            parts = [v for v in (keyword_vector * keyword_weight if keyword_vector is not None else None,
+                                 answer_vector) if v is not None]
+            row = _unit(np.sum(parts, axis=0)) if parts else None
+            if row is not None:
+                dimensions = row.shape[0]
+            rows.append(row)
+        self.matrix = np.zeros((len(entries), dimensions), dtype=np.float32)
+        for entry_id, row in enumerate(rows):
+            if row is not None:
+                self.matrix[entry_id] = row
+
+    def top_k(self, query: str, k: int = TOP_K) -> List[Tuple[int, float]]:
+        """(entry id, cosine similarity) of the k most similar entries, best first"""
+        if not self.matrix.size:
+            return []
+        query_vector = _unit(self.vectorize(query))
+        if query_vector is None:
+            return []
+        similarities = self.matrix @ query_vector.astype(np.float32)
+        k = min(k, len(similarities))
+        if k < len(similarities):
+            candidates = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            candidates = np.arange(len(similarities))
+        candidates = candidates[np.argsort(-similarities[candidates])]
+        return [(int(entry_id), float(similarities[entry_id])) for entry_id in candidates]
+
+    def blend(self, lexical_scores: Dict[int, float], query: str) -> Dict[int, float]:
+        """Add the rescaled similarity of the top-k entries to the lexical scores"""
+        scores = dict(lexical_scores)
+        for entry_id, similarity in self.top_k(query):
+            if similarity > MIN_SIMILARITY:
+                bonus = SEMANTIC_WEIGHT * (similarity - MIN_SIMILARITY) / (1 - MIN_SIMILARITY)
+                scores[entry_id] = scores.get(entry_id, 0.0) + bonus
+        return scores
+
+
+class LatencyBudget:
+    """
+    Rolling percentile latency guard for an optional query stage.
+
+    record() the stage's duration after every run. Every check_every samples
+    the percentile over the last window samples is compared with the budget;
+    when it is over, allow() returns False for cooldown_seconds, after which
+    the window is cleared and the stage is tried again.
+    """
+
+    def __init__(self, budget_seconds: float, percentile: float = 0.99, window: int = 500,
+                 check_every: int = 50, cooldown_seconds: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.budget_seconds = budget_seconds
+        self.percentile = percentile
+        self.check_every = check_every
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._samples = deque(maxlen=window)
+        self._since_check = 0
+        self._paused_until: Optional[float] = None
+        self._lock = threading.Lock()
+        self.last_percentile: Optional[float] = None
+        self.runs = 0
+        self.skipped = 0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._paused_until is None:
+                return True
+            if self._clock() < self._paused_until:
+                self.skipped += 1
+                return False
+            self._paused_until = None
+            self._samples.clear()
+            self._since_check = 0
+            return True
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.runs += 1
+            self._samples.append(seconds)
+            self._since_check += 1
+            if self._since_check < self.check_every:
+                return
+            self._since_check = 0
+            ordered = sorted(self._samples)
+            self.last_percentile = ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+            if self.last_percentile > self.budget_seconds:
+                self._paused_until = self._clock() + self.cooldown_seconds
+                self.trips += 1
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_until is not None and self._clock() < self._paused_until
+
+    def stats(self) -> Dict:
+        return {
+            "budget_ms": round(self.budget_seconds * 1000, 3),
+            "percentile": self.percentile,
+            "last_percentile_ms": round(self.last_percentile * 1000, 3) if self.last_percentile is not None else None,
+            "paused": self.paused,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "trips": self.trips
+        }
@@ -0,0 +1,87 @@
+"""
+JSON serialization for the ATS API responses
+Uses orjson when it is installed (several times faster than the standard
+library on the nested match results) and falls back to a compact json.dumps
+otherwise. Also implements the `fields` selector that lets clients ask for a
+subset of a response, and records response size and serialization time.
+"""
+
+import json
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from metrics import RESPONSE_BYTES, SERIALIZATION_SECONDS
+
+try:
+    import orjson
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+    JSON_BACKEND = "json"
+
+# orjson handles non-str dict keys (e.g. int years) the way json.dumps does
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types neither encoder knows (sets, numpy scalars, ...)"""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[list]:
+    """Split a `fields` query parameter ("score,metadata.timings") into dotted paths"""
+    if not fields:
+        return None
+    paths = [path.strip() for path in fields.split(",") if path.strip()]
+    return paths or None
+
+
+def select_fields(content: Dict[str, Any], paths: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """
+    Keep only the requested keys of a response.
+
+    Each path is a top-level key or a dotted path into nested objects, e.g.
+    "metadata.timings.total_ms". Unknown paths are ignored; None keeps
+    everything.
+    """
+    if paths is None:
+        return content
+    selected: Dict[str, Any] = {}
+    for path in paths:
+        keys = path.split(".")
+        source = content
+        for key in keys:
+            if not isinstance(source, dict) or key not in source:
+                break
+            source = source[key]
+        else:
+            target = selected
+            for key in keys[:-1]:
+                existing = target.get(key)
+                if not isinstance(existing, dict):
+                    existing = target[key] = {}
+                target = existing
+            target[keys[-1]] = source
+    return selected
+
+
+def render_json(content: Any, route: str) -> bytes:
+    """Serialize a response body and record its size and serialization time"""
+    start = time.perf_counter()
+    body = dumps(content)
+    SERIALIZATION_SECONDS.observe(time.perf_counter() - start, route=route, backend=JSON_BACKEND)
+    RESPONSE_BYTES.observe(len(body), route=route)
+    return body
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Preforking server launcher for the ATS backend
+Loads the spaCy model, NLTK data and compiled matchers once in a parent
+process, warms the pipeline up, freezes the garbage collector and then forks
+the uvicorn workers. The workers share the model pages copy-on-write instead
+of each loading their own copy, and the parent reports each worker's PSS.
+
+Usage:
+    python server.py --workers 4 --port 8000
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+from memstats import process_memory, format_bytes
+
+logger = logging.getLogger("ats.server")
+
+# Defaults, overridable on the command line
+DEFAULT_WORKERS = int(os.getenv("ATS_WORKERS", "2"))
+DEFAULT_HOST = os.getenv("ATS_HOST", "0.0.0.0")
+DEFAULT_PORT = int(os.getenv("ATS_PORT", "8000"))
+DEFAULT_MEMORY_REPORT_SECONDS = float(os.getenv("ATS_MEMORY_REPORT_SECONDS", "60"))
+
+# Workers that die within this many seconds of starting are not restarted,
+# so a broken deployment does not fork in a tight loop
+MIN_WORKER_UPTIME_SECONDS = 5.0
+
+
+def exit_code(status: int) -> int:
+    """Exit code of a waitpid() status, negative for a signal (os.waitstatus_to_exitcode is 3.9+)"""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def preload_models(warmup: bool = True) -> bool:
+    """
+    Load and warm up the models in the parent before any worker is forked.
+
+    Micro-batching is left to the workers: its dispatcher thread would not
+    survive the fork.
+    """
+    import ats_core
+    if not ats_core.initialize_nlp():
+        logger.error("NLP models could not be loaded in the parent; workers will run without them")
+        return False
+    if warmup:
+        ats_core.warm_up()
+    return True
+
+
+def freeze_heap():
+    """
+    Move everything allocated so far into the GC's permanent generation.
+
+    Collections in the workers then never walk (and so never write to) the
+    objects inherited from the parent, which keeps their pages shared.
+    """
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Froze {gc.get_freeze_count()} objects before forking")
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Listening socket created in the parent and inherited by every worker"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, log_level: str):
+    """Worker body: serve the app on the inherited socket until told to stop"""
+    import uvicorn
+    from main import app
+
+    # uvicorn installs its own SIGINT/SIGTERM handlers for a graceful shutdown,
+    # and the app its SIGHUP (knowledge base reload) handler once started
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class PreforkServer:
+    """Forks the workers, restarts those that crash and reports their memory"""
+
+    def __init__(self, sock: socket.socket, workers: int, log_level: str = "info",
+                 memory_report_seconds: float = DEFAULT_MEMORY_REPORT_SECONDS):
+        self.sock = sock
+        self.workers = workers
+        self.log_level = log_level
+        self.memory_report_seconds = memory_report_seconds
+        self.children: Dict[int, float] = {}
+        self.stopping = False
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                run_worker(self.sock, self.log_level)
+            except BaseException:
+                logger.exception("Worker crashed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.children[pid] = time.monotonic()
+        logger.info(f"Started worker {pid}")
+        return pid
+
+    def report_memory(self):
+        """Log RSS and PSS of the parent and each worker"""
+        total_pss = 0
+        for label, pid in [("parent", os.getpid())] + [("worker", pid) for pid in sorted(self.children)]:
+            memory = process_memory(pid)
+            if memory is None:
+                continue
+            total_pss += memory["pss"]
+            shared = memory["shared_clean"] + memory["shared_dirty"]
+            logger.info(f"{label} {pid}: rss={format_bytes(memory['rss'])} pss={format_bytes(memory['pss'])} "
+                        f"shared={format_bytes(shared)} private_dirty={format_bytes(memory['private_dirty'])}")
+        logger.info(f"Total PSS across {len(self.children)} workers and the parent: {format_bytes(total_pss)}")
+
+    def stop(self, signum=None, frame=None):
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def forward(self, signum, frame=None):
+        """Pass a signal on to every worker (SIGHUP: reload the chatbot knowledge base)"""
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGHUP, self.forward)
+
+    def reap(self):
+        """Collect exited workers and replace those that ran long enough"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            started = self.children.pop(pid, None)
+            if started is None:
+                continue
+            logger.warning(f"Worker {pid} exited with status {exit_code(status)}")
+            if self.stopping:
+                continue
+            if time.monotonic() - started < MIN_WORKER_UPTIME_SECONDS:
+                logger.error(f"Worker {pid} exited right after starting; not restarting it")
+                continue
+            self.spawn()
+
+    def run(self) -> int:
+        self.install_signal_handlers()
+        for _ in range(self.workers):
+            self.spawn()
+
+        next_report = time.monotonic() + min(10.0, self.memory_report_seconds)
+        while self.children:
+            self.reap()
+            if self.stopping or not self.children:
+                time.sleep(0.1)
+                continue
+            if self.memory_report_seconds > 0 and time.monotonic() >= next_report:
+                self.report_memory()
+                next_report = time.monotonic() + self.memory_report_seconds
+            time.sleep(0.5)
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ATS API with preforked workers sharing one model copy")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Number of worker processes")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Address to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to bind")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip the warm-up run in the parent")
+    parser.add_argument("--memory-report-seconds", type=float, default=DEFAULT_MEMORY_REPORT_SECONDS,
+                        help="Interval between PSS reports (0 disables them)")
+    parser.add_argument("--log-level", default="info", help="Log level for the launcher and the workers")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper())
+    if not hasattr(os, "fork"):
+        logger.error("Preforking needs os.fork; run `uvicorn main:app --workers N` on this platform")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    preload_models(warmup=not args.no_warmup)
+    # Import the app in the parent too, so that module-level state is shared
+    import main as _app_module  # noqa: F401
+    logger.info(f"Models preloaded in {time.perf_counter() - start:.2f}s")
+
+    sock = bind_socket(args.host, args.port)
+    freeze_heap()
+    logger.info(f"Listening on {args.host}:{args.port} with {args.workers} workers")
+    sys.exit(PreforkServer(sock, args.workers, args.log_level, args.memory_report_seconds).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Chat session store for the Jobs Territory chatbot
+Keeps each visitor's recent conversation history under a session ID. The
+store is bounded (least recently used sessions are evicted) and idle
+sessions expire, so memory stays capped however many visitors there are.
+"""
+
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from cache import LRUCache
+
+
+class ChatSession:
+    """Conversation state of one visitor"""
+
+    __slots__ = ("session_id", "history", "created_at")
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.history: List[Dict[str, str]] = []
+        self.created_at = time.time()
+
+
+class SessionStore:
+    """Bounded, idle-expiring map of session ID to ChatSession"""
+
+    def __init__(self, max_sessions: int = 50000, idle_ttl_seconds: float = 1800):
+        self._sessions = LRUCache(max_sessions, ttl_seconds=idle_ttl_seconds)
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        """An existing session (refreshing its idle timer), or None"""
+        return self._sessions.get(session_id)
+
+    def get_or_create(self, session_id: Optional[str] = None) -> ChatSession:
+        """
+        The session with this ID, or a new one if it is unknown, expired or
+        not given. New sessions always get a server-generated ID, so clients
+        cannot choose (or guess and fixate) one.
+        """
+        if session_id:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                return session
+        session = ChatSession(uuid.uuid4().hex)
+        self._sessions.put(session.session_id, session)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict:
+        stats = self._sessions.stats()
+        return {
+            "sessions": stats["size"],
+            "max_sessions": stats["max_size"],
+            "evicted": stats["evictions"],
+            "expired": stats["expirations"]
+        }
@@ -1,6 +1,9 @@
 import re
 import string
-from typing import List
+from typing import Dict, List, Optional
+
+# Translation table deleting punctuation, built once instead of on every call
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation.replace(' ', ''))
 
 def normalize_text(text: str) -> str:
     """
@@ -13,41 +16,69 @@ def normalize_text(text: str) -> str:
     text = text.lower()
     
     # Remove punctuation except spaces
-    text = text.translate(str.maketrans('', '', string.punctuation.replace(' ', '')))
+    text = text.translate(_PUNCTUATION_TABLE)
     
     # Remove extra whitespace
     text = ' '.join(text.split())
     
     return text
 
+# Common stop words to filter out
+STOP_WORDS = frozenset({
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 'yours',
+    'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she', 'her', 'hers',
+    'herself', 'it', 'its', 'itself', 'they', 'them', 'their', 'theirs', 'themselves',
+    'what', 'which', 'who', 'whom', 'this', 'that', 'these', 'those', 'am', 'is', 'are',
+    'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having', 'do', 'does',
+    'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until',
+    'while', 'of', 'at', 'by', 'for', 'with', 'through', 'during', 'before', 'after',
+    'above', 'below', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again',
+    'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all',
+    'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor',
+    'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 's', 't', 'can', 'will',
+    'just', 'don', 'should', 'now', 'tell', 'about', 'know', 'want', 'need'
+})
+
 def extract_keywords(text: str) -> List[str]:
     """
     Extract meaningful keywords from text.
     """
-    # Common stop words to filter out
-    stop_words = {
-        'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 'yours',
-        'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she', 'her', 'hers',
-        'herself', 'it', 'its', 'itself', 'they', 'them', 'their', 'theirs', 'themselves',
-        'what', 'which', 'who', 'whom', 'this', 'that', 'these', 'those', 'am', 'is', 'are',
-        'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having', 'do', 'does',
-        'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until',
-        'while', 'of', 'at', 'by', 'for', 'with', 'through', 'during', 'before', 'after',
-        'above', 'below', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again',
-        'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all',
-        'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor',
-        'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 's', 't', 'can', 'will',
-        'just', 'don', 'should', 'now', 'tell', 'about', 'know', 'want', 'need'
-    }
-    
     normalized = normalize_text(text)
     words = normalized.split()
     
     # Filter out stop words and short words
-    keywords = [word for word in words if word not in stop_words and len(word) > 2]
+    keywords = [word for word in words if word not in STOP_WORDS and len(word) > 2]
     
     return keywords
 
+def stem_word(word: str) -> str:
+    """
+    Reduce a word to a crude stem so that simple variants match
+    ("fees"/"fee", "pricing"/"price", "jobs"/"job", "hiring"/"hire").
+    Only has to be consistent between indexed text and queries.
+    """
+    if len(word) > 4 and word.endswith('ies'):
+        word = word[:-3] + 'y'
+    elif len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+    if len(word) > 5 and word.endswith('ing'):
+        word = word[:-3]
+    elif len(word) > 4 and word.endswith('ed'):
+        word = word[:-2]
+    if len(word) > 3 and word.endswith('e'):
+        word = word[:-1]
+    return word
+
+def search_terms(text: str, canonical_terms: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Keywords of a text reduced to stems, as used by the knowledge base search index.
+    Stems listed in canonical_terms (synonyms) are replaced by their canonical term.
+    """
+    terms = [stem_word(word) for word in extract_keywords(text)]
+    if canonical_terms:
+        terms = [canonical_terms.get(term, term) for term in terms]
+    return terms
+
 def calculate_match_score(user_keywords: List[str], content_keywords: List[str], user_text: str, content_text: str) -> float:
     """
     Calculate relevance score between user input and content.
@@ -58,7 +89,6 @@ def calculate_match_score(user_keywords: List[str], content_keywords: List[str],
     # Check for exact phrase matches (higher weight)
     exact_phrase_score = 0
     user_text_normalized = normalize_text(user_text)
-    content_text_normalized = normalize_text(content_text)
     
     for content_keyword in content_keywords:
         if content_keyword in user_text_normalized:
@@ -76,22 +106,3 @@ def calculate_match_score(user_keywords: List[str], content_keywords: List[str],
     total_score = exact_phrase_score + keyword_score
     
     return total_score
-
-def get_synonyms(word: str) -> List[str]:
-    """
-    Get simple synonyms for common recruitment terms.
-    """
-    synonym_map = {
-        'job': ['position', 'role', 'career', 'employment', 'work'],
-        'hire': ['recruit', 'employ', 'onboard', 'place'],
-        'company': ['organization', 'firm', 'business', 'employer'],
-        'salary': ['compensation', 'pay', 'wage', 'ctc', 'package'],
-        'experience': ['background', 'expertise', 'skills'],
-        'process': ['procedure', 'steps', 'workflow', 'method'],
-        'cost': ['price', 'fee', 'charge', 'pricing'],
-        'fast': ['quick', 'rapid', 'speedy', 'swift'],
-        'help': ['assist', 'support', 'aid'],
-        'find': ['search', 'locate', 'discover', 'get']
-    }
-    
-    return synonym_map.get(word.lower(), [])
\ No newline at end of file
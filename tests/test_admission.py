@@ -0,0 +1,162 @@
+import unittest
+import sys
+import os
+import asyncio
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backend.admission import AdmissionController, AdmissionMiddleware, AdmissionRejected
+
+
+class TestAdmissionController(unittest.TestCase):
+    def test_admits_up_to_concurrency_without_waiting(self):
+        """Test that requests within the concurrency limit are admitted immediately."""
+        async def scenario():
+            controller = AdmissionController("test", max_concurrency=2, max_queue=1)
+            await controller.acquire()
+            await controller.acquire()
+            return controller.stats()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats["active"], 2)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["admitted_total"], 2)
+
+    def test_rejects_when_queue_is_full(self):
+        """Test that a full wait queue rejects with a Retry-After hint."""
+        async def scenario():
+            controller = AdmissionController("test", max_concurrency=1, max_queue=1, retry_after=3)
+            await controller.acquire()
+            waiter = asyncio.ensure_future(controller.acquire())
+            await asyncio.sleep(0)
+            with self.assertRaises(AdmissionRejected) as ctx:
+                await controller.acquire()
+            controller.release()
+            await waiter
+            return controller, ctx.exception
+
+        controller, rejection = asyncio.run(scenario())
+        self.assertEqual(rejection.retry_after, 3)
+        self.assertEqual(controller.rejected_total, 1)
+        self.assertEqual(controller.admitted_total, 2)
+
+    def test_waiters_are_served_in_order(self):
+        """Test that released slots go to the oldest waiter."""
+        async def scenario():
+            controller = AdmissionController("test", max_concurrency=1, max_queue=5)
+            order = []
+
+            async def request(name):
+                async with controller.slot():
+                    order.append(name)
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(*(request(f"r{i}") for i in range(4)))
+            return controller, order
+
+        controller, order = asyncio.run(scenario())
+        self.assertEqual(order, ["r0", "r1", "r2", "r3"])
+        self.assertEqual(controller.active, 0)
+        self.assertGreater(controller.stats()["max_wait_ms"], 0)
+
+    def test_queue_timeout(self):
+        """Test that waiting longer than the queue timeout is rejected."""
+        async def scenario():
+            controller = AdmissionController("test", max_concurrency=1, max_queue=1, queue_timeout=0.01)
+            await controller.acquire()
+            with self.assertRaises(AdmissionRejected):
+                await controller.acquire()
+            controller.release()
+            return controller
+
+        controller = asyncio.run(scenario())
+        self.assertEqual(controller.timed_out_total, 1)
+        self.assertEqual(controller.active, 0)
+        self.assertEqual(controller.queue_depth, 0)
+
+    def test_cancelled_waiter_does_not_leak_slot(self):
+        """Test that a cancelled waiter leaves the limiter consistent."""
+        async def scenario():
+            controller = AdmissionController("test", max_concurrency=1, max_queue=2)
+            await controller.acquire()
+            waiter = asyncio.ensure_future(controller.acquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.sleep(0)
+            controller.release()
+            await controller.acquire()
+            return controller
+
+        controller = asyncio.run(scenario())
+        self.assertEqual(controller.active, 1)
+        self.assertEqual(controller.queue_depth, 0)
+
+class TestAdmissionMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.controller = AdmissionController("upload", max_concurrency=1, max_queue=0, retry_after=4)
+        self.calls = []
+
+        async def app(scope, receive, send):
+            self.calls.append(scope["path"])
+            await receive()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        self.middleware = AdmissionMiddleware(app, [("POST", r"/upload/[^/]+", self.controller)])
+
+    def request(self, path, method="POST"):
+        """Run one request through the middleware; returns (sent messages, body reads)"""
+        sent, reads = [], []
+
+        async def receive():
+            reads.append(path)
+            return {"type": "http.request", "body": b"file", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": method, "path": path, "headers": []}
+        return self.middleware(scope, receive, send), sent, reads
+
+    def test_admitted_request_holds_slot_until_done(self):
+        """Test that a matching request runs with a slot that is released afterwards."""
+        call, sent, reads = self.request("/upload/a")
+        asyncio.run(call)
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertEqual(reads, ["/upload/a"])
+        self.assertEqual(self.controller.admitted_total, 1)
+        self.assertEqual(self.controller.active, 0)
+
+    def test_rejected_before_body_is_read(self):
+        """Test that a request over the limit gets a 503 without its body being read."""
+        async def scenario():
+            await self.controller.acquire()
+            call, sent, reads = self.request("/upload/b")
+            await call
+            return sent, reads
+
+        sent, reads = asyncio.run(scenario())
+        self.assertEqual(reads, [])
+        self.assertEqual(self.calls, [])
+        self.assertEqual(sent[0]["status"], 503)
+        headers = dict(sent[0]["headers"])
+        self.assertEqual(headers[b"retry-after"], b"4")
+        self.assertEqual(headers[b"connection"], b"close")
+        self.assertIn(b"Server is busy", sent[1]["body"])
+        self.assertEqual(self.controller.rejected_total, 1)
+
+    def test_other_routes_pass_through(self):
+        """Test that requests not listed in the routes are not limited."""
+        async def scenario():
+            await self.controller.acquire()
+            for path, method in (("/upload/c", "GET"), ("/upload", "POST"), ("/upload/c/extra", "POST")):
+                call, sent, _ = self.request(path, method)
+                await call
+                self.assertEqual(sent[0]["status"], 200)
+
+        asyncio.run(scenario())
+        self.assertEqual(self.controller.rejected_total, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+import unittest
+import sys
+import os
+import io
+import json
+import time
+import asyncio
+from functools import partial
+from unittest.mock import patch
+
+# Add the src directory to the path; main imports its sibling modules by name
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+try:
+    from fastapi.testclient import TestClient
+    from starlette.datastructures import UploadFile
+    from backend import main
+except ImportError:  # fastapi, spaCy, NLTK or the document libraries are not installed
+    main = None
+
+PARSED = {"text": "text", "cleaned_text": "text", "skills": ["python"],
+          "experience": {"years_of_experience": 3}, "ctc": {}}
+
+
+def fake_parse_document(file_content, file_type, is_jd):
+    return dict(PARSED)
+
+
+def upload(field, filename, content=b"Python developer with 3 years of experience"):
+    return (field, (filename, content, "text/plain"))
+
+
+@unittest.skipIf(main is None, "API dependencies not installed")
+class TestMatch(unittest.TestCase):
+    FILES = [upload("jd_file", "jd.txt"), upload("resume_file", "cv.txt")]
+
+    def setUp(self):
+        self.client = TestClient(main.app)
+
+    def post_match(self, parse, **params):
+        with patch.object(main, "parse_document", parse):
+            return self.client.post("/api/ats/match", files=self.FILES, params=params)
+
+    def test_success(self):
+        """Test that the JD and CV are both parsed and scored."""
+        calls = []
+
+        def parse(file_content, file_type, is_jd):
+            calls.append(is_jd)
+            return dict(PARSED)
+
+        with patch.object(main, "calculate_match_score", lambda jd, cv: {"score": 80.0, "matched_skills": ["python"]}):
+            response = self.post_match(parse)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["score"], 80.0)
+        self.assertEqual(body["metadata"]["jd_filename"], "jd.txt")
+        self.assertEqual(body["metadata"]["cv_skills_count"], 1)
+        self.assertIn("parse_wall_ms", body["metadata"]["timings"])
+        self.assertEqual(sorted(calls), [False, True])
+
+    def test_jd_parse_failure(self):
+        """Test that a JD that fails to parse is reported as such, even though the CV parsed."""
+        def parse(file_content, file_type, is_jd):
+            if is_jd:
+                raise ValueError("broken jd")
+            return dict(PARSED)
+
+        response = self.post_match(parse)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["detail"], "Failed to parse Job Description: broken jd")
+
+    def test_cv_parse_failure(self):
+        """Test that a CV that fails to parse is reported as such, even though the JD parsed."""
+        def parse(file_content, file_type, is_jd):
+            if not is_jd:
+                raise ValueError("broken cv")
+            return dict(PARSED)
+
+        response = self.post_match(parse)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["detail"], "Failed to parse Resume/CV: broken cv")
+
+
+@unittest.skipIf(main is None, "API dependencies not installed")
+class TestBatchStream(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app)
+
+    def test_ndjson_lines(self):
+        """Test that every resume gets its own newline-terminated JSON line and its upload is closed."""
+        closed = []
+        original_close = UploadFile.close
+
+        async def close(upload_file):
+            await original_close(upload_file)
+            closed.append(upload_file)
+
+        def build_match_line(parsed_jd, filename, cv_content, cv_file_type):
+            return {"filename": filename, "score": 50.0, "breakdown": {"matched_skills": ["python"]}, "error": None}
+
+        files = [upload("jd_file", "jd.txt"), upload("resume_files", "cv1.txt"),
+                 upload("resume_files", "cv2.txt"), upload("resume_files", "notes.xyz")]
+        with patch.object(main, "parse_document", fake_parse_document), \
+                patch.object(main, "build_match_line", build_match_line), \
+                patch.object(UploadFile, "close", close):
+            with self.client.stream("POST", "/api/ats/match/batch", files=files) as response:
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+                body = b"".join(response.iter_bytes())
+
+        self.assertTrue(body.endswith(b"\n"))
+        lines = {line["filename"]: line for line in map(json.loads, body[:-1].split(b"\n"))}
+        self.assertEqual(sorted(lines), ["cv1.txt", "cv2.txt", "notes.xyz"])
+        self.assertEqual(lines["cv1.txt"]["score"], 50.0)
+        self.assertIsNone(lines["notes.xyz"]["score"])
+        self.assertIn("Unsupported file type", lines["notes.xyz"]["error"])
+
+        # Starlette closes the form's uploads again when the request ends
+        resumes = [upload_file for upload_file in closed if upload_file.filename != "jd.txt"]
+        self.assertEqual({upload_file.filename for upload_file in resumes}, {"cv1.txt", "cv2.txt", "notes.xyz"})
+        self.assertTrue(all(upload_file.file.closed for upload_file in resumes))
+
+    def test_each_resume_closed_once(self):
+        """Test that the stream itself closes every resume exactly once."""
+        uploads = [UploadFile(io.BytesIO(b"Python developer"), filename=name)
+                   for name in ("cv1.txt", "cv2.txt", "notes.xyz")]
+        closed = []
+        for upload_file in uploads:
+            upload_file.close = partial(self.record_close, upload_file, closed)
+
+        async def collect():
+            return [line async for line in main.stream_batch_results(dict(PARSED), uploads)]
+
+        with patch.object(main, "build_match_line", lambda parsed_jd, filename, content, file_type: {"filename": filename}):
+            lines = asyncio.run(collect())
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(sorted(closed), ["cv1.txt", "cv2.txt", "notes.xyz"])
+        self.assertTrue(all(upload_file.file.closed for upload_file in uploads))
+
+    @staticmethod
+    async def record_close(upload_file, closed):
+        upload_file.file.close()
+        closed.append(upload_file.filename)
+
+
+@unittest.skipIf(main is None, "API dependencies not installed")
+class TestMatchJobs(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app)
+        patcher = patch.object(main, "parse_document", fake_parse_document)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def use_manager(self, **limits):
+        manager = main.JobManager(main.WORK_QUEUE, lambda payload, item: {"filename": item["filename"], "score": 1},
+                                  **limits)
+        patcher = patch.object(main, "JOB_MANAGER", manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return manager
+
+    def test_empty_jobs_expire(self):
+        """Test that jobs created without resumes stop counting against the limit once expired."""
+        self.use_manager(max_jobs=1, retention_seconds=0.05)
+        response = self.client.post("/api/ats/jobs", files=[upload("jd_file", "jd.txt")])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["total"], 0)
+        self.assertEqual(self.client.post("/api/ats/jobs", files=[upload("jd_file", "jd.txt")]).status_code, 429)
+
+        time.sleep(0.1)
+        self.assertEqual(self.client.post("/api/ats/jobs", files=[upload("jd_file", "jd.txt")]).status_code, 202)
+        self.assertEqual(self.client.get(f"/api/ats/jobs/{response.json()['job_id']}").status_code, 404)
+
+    def test_rejected_first_chunk_leaves_no_job(self):
+        """Test that a job whose first chunk is over the item limit is not kept around."""
+        manager = self.use_manager(max_jobs=1, max_items_per_job=1)
+        files = [upload("jd_file", "jd.txt"), upload("resume_files", "cv1.txt"), upload("resume_files", "cv2.txt")]
+        self.assertEqual(self.client.post("/api/ats/jobs", files=files).status_code, 429)
+        self.assertEqual(len(manager._jobs), 0)
+
+        response = self.client.post("/api/ats/jobs", files=files[:2])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["total"], 1)
+
+    def test_unreadable_first_chunk_leaves_no_job(self):
+        """Test that a failure while reading the first chunk registers no job."""
+        manager = self.use_manager(max_jobs=1)
+
+        async def fail(uploads):
+            raise main.HTTPException(status_code=400, detail="unreadable upload")
+
+        with patch.object(main, "read_job_items", fail):
+            response = self.client.post("/api/ats/jobs", files=[upload("jd_file", "jd.txt"),
+                                                                upload("resume_files", "cv1.txt")])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(manager._jobs), 0)
+
+
+@unittest.skipIf(main is None, "API dependencies not installed")
+class TestChat(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app)
+
+    def test_unknown_session_id_is_not_adopted(self):
+        """Test that a client-chosen session ID starts a session under a server-generated one."""
+        response = self.client.post("/api/chat", json={"message": "What is RaaS?", "session_id": "chosen-by-client"})
+        self.assertEqual(response.status_code, 200)
+        session_id = response.json()["session_id"]
+        self.assertNotEqual(session_id, "chosen-by-client")
+        self.assertEqual(self.client.get("/api/chat/chosen-by-client/history").status_code, 404)
+
+        response = self.client.post("/api/chat", json={"message": "And pricing?", "session_id": session_id})
+        self.assertEqual(response.json()["session_id"], session_id)
+        self.assertEqual(len(self.client.get(f"/api/chat/{session_id}/history").json()["history"]), 2)
+
+    def test_query_runs_off_the_event_loop(self):
+        """Test that the chatbot's search runs on the worker pool, not on the event loop."""
+        def process_query(message, history=None):
+            try:
+                asyncio.get_running_loop()
+                on_loop = True
+            except RuntimeError:
+                on_loop = False
+            return {"response": "ok", "on_loop": on_loop}
+
+        with patch.object(main.CHAT_BOT, "process_query", process_query):
+            response = self.client.post("/api/chat", json={"message": "hello"})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["on_loop"])
+
+
+if __name__ == '__main__':
+    unittest.main()
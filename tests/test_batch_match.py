@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backend.batch_match import collect_resumes, completed_paths, output_format, csv_row, ResultWriter
+
+LINE = {
+    "path": "/data/cv1.pdf",
+    "filename": "cv1.pdf",
+    "score": 75.0,
+    "error": None,
+    "breakdown": {
+        "matched_skills": ["python", "sql"],
+        "missing_jd_skills": [],
+        "cv_experience_years": 5,
+        "cv_seniority_level": "Mid-Level",
+        "responsibilities_matched": 2,
+        "responsibilities_total": 3
+    }
+}
+
+
+class TestBatchMatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def touch(self, *parts):
+        path = os.path.join(self.dir, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "w").close()
+        return path
+
+    def test_collect_resumes_from_directory_and_glob(self):
+        """Test that directories are walked recursively and unsupported files are ignored."""
+        a = self.touch("a.pdf")
+        b = self.touch("nested", "b.docx")
+        self.touch("notes.md")
+        self.assertEqual(collect_resumes([self.dir]), sorted([a, b]))
+        self.assertEqual(collect_resumes([os.path.join(self.dir, "*.pdf")]), [a])
+
+    def test_output_format(self):
+        """Test that the format follows the extension unless given explicitly."""
+        self.assertEqual(output_format("out.CSV"), "csv")
+        self.assertEqual(output_format("out.jsonl"), "jsonl")
+        self.assertEqual(output_format("out.txt", "csv"), "csv")
+
+    def test_resume_skips_done_and_drops_partial_line(self):
+        """Test that completed paths are read back and a half-written last line is removed."""
+        output = os.path.join(self.dir, "results.jsonl")
+        with open(output, "w") as f:
+            f.write(json.dumps(LINE) + "\n")
+            f.write('{"path": "/data/cv2.pdf", "filen')
+        self.assertEqual(completed_paths(output, "jsonl"), {"/data/cv1.pdf"})
+        with open(output) as f:
+            self.assertEqual(f.read(), json.dumps(LINE) + "\n")
+
+    def test_csv_writer_round_trip(self):
+        """Test that CSV output gets one header and can be resumed from."""
+        output = os.path.join(self.dir, "results.csv")
+        for line in (LINE, {**LINE, "path": "/data/cv2.pdf", "filename": "cv2.pdf"}):
+            writer = ResultWriter(output, "csv")
+            writer.write(line)
+            writer.close()
+        with open(output) as f:
+            self.assertEqual(f.read().count("path,filename"), 1)
+        self.assertEqual(completed_paths(output, "csv"), {"/data/cv1.pdf", "/data/cv2.pdf"})
+
+    def test_csv_row_flattens_breakdown(self):
+        """Test that list fields are joined and errors become empty strings."""
+        row = csv_row(LINE)
+        self.assertEqual(row["matched_skills"], "python;sql")
+        self.assertEqual(row["error"], "")
+        self.assertEqual(row["responsibilities_total"], 3)
+
+if __name__ == '__main__':
+    unittest.main()
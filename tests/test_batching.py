@@ -0,0 +1,125 @@
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+# Add the src directory to the path; ats_core imports its sibling modules by name
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+from backend.batching import MicroBatcher
+
+try:
+    from backend import ats_core
+except ImportError:  # spaCy, NLTK or the document libraries are not installed
+    ats_core = None
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+
+        def process_batch(items):
+            self.batches.append(list(items))
+            return [item.upper() for item in items]
+
+        self.batcher = MicroBatcher(process_batch, max_batch_size=4, max_wait_ms=50)
+
+    def tearDown(self):
+        self.batcher.stop()
+
+    def test_single_item(self):
+        """Test that a lone item is processed once the window closes."""
+        self.assertEqual(self.batcher.process("a"), "A")
+        self.assertEqual(self.batches, [["a"]])
+
+    def test_results_are_routed_to_callers(self):
+        """Test that each caller gets the result for its own item."""
+        self.assertEqual(self.batcher.process_many(["a", "b", "c"]), ["A", "B", "C"])
+
+    def test_concurrent_callers_share_batches(self):
+        """Test that items from concurrent callers are merged, up to the maximum batch size."""
+        results = {}
+        barrier = threading.Barrier(8)
+
+        def caller(name):
+            barrier.wait()
+            results[name] = self.batcher.process(name)
+
+        threads = [threading.Thread(target=caller, args=(f"item{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {f"item{i}": f"ITEM{i}" for i in range(8)})
+        self.assertLess(len(self.batches), 8)
+        self.assertTrue(all(len(batch) <= 4 for batch in self.batches))
+        self.assertEqual(self.batcher.stats()["items_total"], 8)
+
+    def test_batch_failure_is_propagated(self):
+        """Test that an exception in the batch call reaches every caller in the batch."""
+        def failing_batch(items):
+            raise ValueError("pipeline error")
+
+        batcher = MicroBatcher(failing_batch, max_batch_size=4, max_wait_ms=1)
+        try:
+            with self.assertRaises(ValueError):
+                batcher.process("a")
+        finally:
+            batcher.stop()
+
+
+class FakeDoc:
+    has_vector = True
+
+    def __init__(self, text):
+        self.words = set(text.lower().split())
+
+    def similarity(self, other):
+        return len(self.words & other.words) / len(self.words | other.words)
+
+
+class FakeNLP:
+    """Stands in for a spaCy model with word vectors, recording every pipe() call"""
+
+    def __init__(self):
+        self.vocab = type("Vocab", (), {"vectors": type("Vectors", (), {"name": "fake_vectors"})()})()
+        self.pipe_calls = []
+
+    def pipe(self, texts, batch_size=None):
+        texts = list(texts)
+        self.pipe_calls.append(texts)
+        return [FakeDoc(text) for text in texts]
+
+
+@unittest.skipIf(ats_core is None, "ATS dependencies not installed")
+class TestMatchScoreBatching(unittest.TestCase):
+    def setUp(self):
+        self.nlp = FakeNLP()
+        for name, value in (("nlp", self.nlp), ("sent_tokenize", lambda text: text.split(". "))):
+            patcher = patch.object(ats_core, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.batcher = ats_core.enable_micro_batching(max_batch_size=64, max_wait_ms=20)
+        self.addCleanup(ats_core.disable_micro_batching)
+
+    def test_responsibilities_share_one_pipeline_call(self):
+        """Test that semantic responsibility matching parses the CV sentences once, not per responsibility."""
+        parsed_jd = {"skills": ["python"], "experience": {}, "ctc": {},
+                     "key_responsibilities": ["design scalable services", "mentor junior engineers",
+                                              "own the release process"]}
+        parsed_cv = {"skills": ["python"], "experience": {}, "ctc": {},
+                     "text": "I designed scalable backend services. I mentored two engineers. I like hiking"}
+
+        result = ats_core.calculate_match_score(parsed_jd, parsed_cv)
+
+        self.assertNotIn("overall_error", result)
+        self.assertEqual(len(result["jd_responsibilities_matched_in_cv"]), 3)
+        responsibility_calls = [texts for texts in self.nlp.pipe_calls if "mentor junior engineers" in texts]
+        self.assertEqual(len(responsibility_calls), 1)
+        self.assertEqual(self.batcher.stats()["items_total"], 6)
+
+if __name__ == '__main__':
+    unittest.main()
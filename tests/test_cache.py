@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backend.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        """Test that the entry not accessed for longest is evicted at capacity."""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_idle_entries_expire(self):
+        """Test that entries idle for longer than the TTL are dropped and access refreshes the timer."""
+        clock = FakeClock()
+        cache = LRUCache(10, ttl_seconds=10, clock=clock)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        clock.now = 8
+        cache.get("a")
+        clock.now = 12
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_hit_rate(self):
+        """Test hit and miss accounting."""
+        cache = LRUCache(4)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_pop_and_clear(self):
+        """Test removing single entries and clearing the cache."""
+        cache = LRUCache(4)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.pop("a"), 1)
+        self.assertIsNone(cache.pop("a"))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
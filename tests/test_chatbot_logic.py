@@ -2,8 +2,9 @@ import unittest
 import sys
 import os
 
-# Add the src directory to the path
+# Add the src directory to the path; chatbot_logic imports its sibling modules by name
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
 
 from backend.chatbot_logic import JobsTerritoryBot
 
@@ -17,6 +18,8 @@ class TestChatbotLogic(unittest.TestCase):
         self.assertTrue(self.bot.is_greeting("Hi there"))
         self.assertTrue(self.bot.is_greeting("Good morning"))
         self.assertFalse(self.bot.is_greeting("What is RaaS?"))
+        self.assertFalse(self.bot.is_greeting("Are you hiring?"))
+        self.assertFalse(self.bot.is_greeting("Which industries do you cover?"))
     
     def test_goodbye_detection(self):
         """Test goodbye detection."""
@@ -32,6 +35,11 @@ class TestChatbotLogic(unittest.TestCase):
         self.assertEqual(result['confidence'], 1.0)
         self.assertIn('Welcome', result['response'])
     
+    def test_hiring_question_not_greeting(self):
+        """Test that questions containing "hi" inside a word reach the knowledge base."""
+        result = self.bot.process_query("What is your hiring process?")
+        self.assertTrue(result['category'].startswith('hiring_process'))
+    
     def test_service_query(self):
         """Test service-related queries."""
         result = self.bot.process_query("Tell me about RaaS")
@@ -50,6 +58,18 @@ class TestChatbotLogic(unittest.TestCase):
         self.assertGreater(result['confidence'], 0.5)
         self.assertIn('hello@jobsterritory.com', result['response'])
     
+    def test_misspelled_query(self):
+        """Test that typos are corrected before searching the knowledge base."""
+        result = self.bot.process_query("recruitmnt pricng")
+        self.assertGreater(result['confidence'], 0.5)
+        self.assertIn('pricing', result['response'].lower())
+    
+    def test_synonym_query(self):
+        """Test that a synonym finds the answers indexed under its canonical word."""
+        result = self.bot.process_query("What about compensation?")
+        self.assertGreater(result['confidence'], 0.5)
+        self.assertIn('salary', result['response'].lower())
+    
     def test_fallback_response(self):
         """Test fallback for unknown queries."""
         result = self.bot.process_query("What is quantum physics?")
@@ -89,5 +109,64 @@ class TestChatbotLogic(unittest.TestCase):
         history = self.bot.get_conversation_history()
         self.assertEqual(len(history), 0)
 
+    def test_session_histories_are_separate(self):
+        """Test that histories passed per session do not mix with each other or the bot's own."""
+        first, second = [], []
+        self.bot.process_query("Hello", history=first)
+        self.bot.process_query("Tell me about RaaS", history=second)
+        self.bot.process_query("How can I contact you?", history=second)
+        
+        self.assertEqual([turn['user'] for turn in first], ["Hello"])
+        self.assertEqual(len(second), 2)
+        self.assertEqual(self.bot.get_conversation_history(), [])
+    
+    def test_session_history_trimmed_in_place(self):
+        """Test that a session's history list is kept to max_history."""
+        history = []
+        for i in range(10):
+            self.bot.process_query(f"Message {i}", history=history)
+        self.assertEqual(len(history), self.bot.max_history)
+        self.assertEqual(history[-1]['user'], "Message 9")
+    
+    def test_shared_knowledge_base(self):
+        """Test that bots can share one KnowledgeBase instance."""
+        other = JobsTerritoryBot(self.bot.knowledge_base)
+        self.assertIs(other.knowledge_base, self.bot.knowledge_base)
+
+    def test_response_cache_hits_on_normalized_query(self):
+        """Test that repeated questions differing only in case and punctuation hit the cache."""
+        first = self.bot.process_query("What is RaaS?")
+        second = self.bot.process_query("what is raas")
+        self.assertEqual(first['response'], second['response'])
+        stats = self.bot.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+    
+    def test_cached_answers_still_recorded_per_session(self):
+        """Test that a cached answer is added to the asking session's history only."""
+        first, second = [], []
+        self.bot.process_query("pricing", history=first)
+        self.bot.process_query("Pricing!", history=second)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(second[0]['user'], "Pricing!")
+        self.assertEqual(second[0]['bot'], first[0]['bot'])
+    
+    def test_cached_result_is_not_shared(self):
+        """Test that modifying a returned result does not change later cached replies."""
+        result = self.bot.process_query("What is quantum physics?")
+        result['suggestions'].clear()
+        self.assertGreater(len(self.bot.process_query("What is quantum physics?")['suggestions']), 0)
+    
+    def test_cache_cleared_on_reload(self):
+        """Test that a knowledge base reload empties the response cache."""
+        self.bot.process_query("pricing")
+        self.bot.knowledge_base.reload(force=True)
+        self.assertEqual(self.bot.cache_stats()['size'], 0)
+    
+    def test_cache_disabled(self):
+        """Test that caching can be turned off."""
+        bot = JobsTerritoryBot(self.bot.knowledge_base, response_cache_size=0)
+        self.assertIsNone(bot.cache_stats())
+        self.assertIn('Recruitment as a Service', bot.process_query("Tell me about RaaS")['response'])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backend.fuzzy import FuzzyCorrector, edit_distance
+
+VOCABULARY = {"recruitment": 3, "pricing": 2, "contact": 2, "international": 1, "hiring": 5, "retail": 1}
+
+
+class TestFuzzyCorrector(unittest.TestCase):
+    def setUp(self):
+        self.corrector = FuzzyCorrector(VOCABULARY, known_words={"details", "the"})
+
+    def test_edit_distance(self):
+        """Test insertions, deletions, substitutions and transpositions."""
+        self.assertEqual(edit_distance("pricng", "pricing", 2), 1)
+        self.assertEqual(edit_distance("contcat", "contact", 2), 1)
+        self.assertEqual(edit_distance("hiring", "hiring", 2), 0)
+        self.assertEqual(edit_distance("quantum", "contact", 2), 3)
+
+    def test_corrects_typos(self):
+        """Test that misspelled words are mapped to the vocabulary."""
+        self.assertEqual(self.corrector.correct_text("recruitmnt pricng"), "recruitment pricing")
+        self.assertEqual(self.corrector.correct("internatinol"), "international")
+
+    def test_known_and_unrelated_words_unchanged(self):
+        """Test that known words, short words and far-off words are left alone."""
+        self.assertEqual(self.corrector.correct_text("the details"), "the details")
+        self.assertEqual(self.corrector.correct("cst"), "cst")
+        self.assertEqual(self.corrector.correct("quantum"), "quantum")
+
+    def test_short_words_allow_one_edit(self):
+        """Test that words under eight characters are corrected by at most one edit."""
+        self.assertEqual(self.corrector.correct("detaile"), "detaile")
+        self.assertEqual(self.corrector.correct("hirng"), "hiring")
+
+    def test_stats(self):
+        """Test that stats report the index size and count memoized corrections until cleared."""
+        stats = self.corrector.stats()
+        self.assertEqual(stats["vocabulary"], len(VOCABULARY))
+        self.assertGreater(stats["deletion_keys"], stats["vocabulary"])
+        self.assertEqual(stats["memoized_corrections"], 0)
+        self.corrector.correct("recrutment")
+        self.assertEqual(self.corrector.stats()["memoized_corrections"], 1)
+        self.corrector.clear_corrections()
+        self.assertEqual(self.corrector.stats()["memoized_corrections"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the path; intents imports its sibling modules by name
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+from backend.intents import IntentRouter
+
+INTENTS = {
+    "greeting": {"phrases": ["hello", "hi", "good morning"]},
+    "goodbye": {"phrases": ["bye", "thank you", "that's all"]},
+    "human": {"phrases": ["talk to a human", "real person"], "response": "Call us at +91 98765 43210."}
+}
+
+
+class TestIntentRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = IntentRouter(INTENTS)
+
+    def test_matches_whole_words(self):
+        """Test that phrases match whole words only, anywhere in the text."""
+        self.assertEqual(self.router.match("Hi there!"), "greeting")
+        self.assertEqual(self.router.match("well, GOOD MORNING"), "greeting")
+        self.assertEqual(self.router.match("That's all, thank you"), "goodbye")
+        for text in ("Are you hiring?", "What is this?", "Which industries?", "byelaws", "", "   "):
+            self.assertIsNone(self.router.match(text), text)
+
+    def test_first_listed_intent_wins(self):
+        """Test that the intent listed first wins when several match."""
+        self.assertEqual(self.router.match("thank you, hello"), "greeting")
+        self.assertEqual(self.router.match("bye, I want to talk to a human"), "goodbye")
+
+    def test_responses(self):
+        """Test that configured responses are returned and missing ones are None."""
+        self.assertEqual(self.router.match("can I talk to a human?"), "human")
+        self.assertEqual(self.router.response("human"), "Call us at +91 98765 43210.")
+        self.assertIsNone(self.router.response("greeting"))
+
+    def test_empty_table(self):
+        """Test that a router without intents matches nothing."""
+        self.assertIsNone(IntentRouter({}).match("hello"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backend.job_queue import (
+    WorkQueue, JobManager, JobLimitError, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+)
+
+
+def wait_for(predicate, timeout=5.0):
+    """Poll until predicate() is true or the timeout expires."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestWorkQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = WorkQueue(max_workers=1, name="test-work")
+
+    def tearDown(self):
+        self.queue.shutdown()
+
+    def test_submit_returns_result(self):
+        """Test that submitted work returns its result through a future."""
+        future = self.queue.submit(lambda a, b: a + b, 2, 3)
+        self.assertEqual(future.result(timeout=5), 5)
+
+    def test_exception_is_propagated(self):
+        """Test that exceptions raised by work end up on the future."""
+        def fail():
+            raise ValueError("boom")
+
+        future = self.queue.submit(fail)
+        with self.assertRaises(ValueError):
+            future.result(timeout=5)
+
+    def test_interactive_work_runs_before_batch_work(self):
+        """Test that the interactive lane jumps ahead of queued batch work."""
+        gate = threading.Event()
+        order = []
+
+        self.queue.submit(gate.wait, 5)  # Occupy the single worker
+        batch = [self.queue.submit(order.append, f"batch-{i}", priority=PRIORITY_BATCH) for i in range(3)]
+        interactive = self.queue.submit(order.append, "interactive", priority=PRIORITY_INTERACTIVE)
+        gate.set()
+
+        for future in batch + [interactive]:
+            future.result(timeout=5)
+        self.assertEqual(order, ["interactive", "batch-0", "batch-1", "batch-2"])
+
+
+class TestJobManager(unittest.TestCase):
+    def setUp(self):
+        self.queue = WorkQueue(max_workers=2, name="test-jobs")
+        self.gate = threading.Event()
+        self.gate.set()
+
+        def process_item(payload, item):
+            self.gate.wait(5)
+            if item.get("fail"):
+                raise ValueError("bad file")
+            return {"filename": item["filename"], "score": payload * item["value"]}
+
+        self.manager = JobManager(self.queue, process_item, max_jobs=2, max_items_per_job=5)
+
+    def tearDown(self):
+        self.gate.set()
+        self.queue.shutdown()
+
+    def test_job_progress_and_results(self):
+        """Test that a job reports progress and collects one line per item."""
+        job = self.manager.create_job(10, metadata={"jd_filename": "jd.txt"})
+        self.manager.add_items(job.id, [{"filename": f"cv{i}.txt", "value": i} for i in range(3)])
+
+        self.assertTrue(wait_for(lambda: job.progress()["status"] == "completed"))
+        progress = job.progress()
+        self.assertEqual(progress["done"], 3)
+        self.assertEqual(progress["total"], 3)
+        self.assertEqual(progress["jd_filename"], "jd.txt")
+
+        scores = sorted(line["score"] for line in job.page(0, 10))
+        self.assertEqual(scores, [0, 10, 20])
+
+    def test_failed_item_is_reported_per_line(self):
+        """Test that one failing item does not fail the whole job."""
+        job = self.manager.create_job(1)
+        self.manager.add_items(job.id, [{"filename": "ok.txt", "value": 1}, {"filename": "bad.txt", "fail": True}])
+
+        self.assertTrue(wait_for(lambda: job.finished))
+        self.assertEqual(job.progress()["failed"], 1)
+        errors = [line for line in job.page() if line.get("error")]
+        self.assertEqual(len(errors), 1)
+        self.assertIn("bad file", errors[0]["error"])
+
+    def test_results_paging(self):
+        """Test paging through results with offset and limit."""
+        job = self.manager.create_job(1)
+        self.manager.add_items(job.id, [{"filename": f"cv{i}.txt", "value": i} for i in range(5)])
+
+        self.assertTrue(wait_for(lambda: job.finished))
+        self.assertEqual(len(job.page(0, 2)), 2)
+        self.assertEqual(len(job.page(4, 2)), 1)
+        indexes = sorted(line["index"] for line in job.page(0, 2) + job.page(2, 3))
+        self.assertEqual(indexes, [0, 1, 2, 3, 4])
+
+    def test_cancel_drops_queued_items(self):
+        """Test that cancelling a job drops work that has not started."""
+        self.gate.clear()
+        job = self.manager.create_job(1)
+        self.manager.add_items(job.id, [{"filename": f"cv{i}.txt", "value": i} for i in range(5)])
+
+        self.manager.cancel_job(job.id)
+        self.gate.set()
+
+        self.assertEqual(job.progress()["status"], "cancelled")
+        with self.assertRaises(JobLimitError):
+            self.manager.add_items(job.id, [{"filename": "late.txt", "value": 1}])
+        time.sleep(0.1)
+        self.assertEqual(job.progress()["done"], 0)
+
+    def test_limits(self):
+        """Test job count and per-job item limits."""
+        job = self.manager.create_job(1)
+        with self.assertRaises(JobLimitError):
+            self.manager.add_items(job.id, [{"filename": f"cv{i}.txt", "value": i} for i in range(6)])
+
+        self.manager.create_job(1)
+        with self.assertRaises(JobLimitError):
+            self.manager.create_job(1)
+
+    def test_empty_jobs_expire(self):
+        """Test that jobs which never got items are dropped after the retention period."""
+        manager = JobManager(self.queue, lambda payload, item: {}, max_jobs=2, retention_seconds=0.05)
+        empty = manager.create_job(1)
+        manager.create_job(1)
+        with self.assertRaises(JobLimitError):
+            manager.create_job(1)
+
+        time.sleep(0.1)
+        manager.create_job(1)
+        with self.assertRaises(KeyError):
+            manager.get_job(empty.id)
+
+    def test_delete_job_frees_its_slot(self):
+        """Test that a deleted job is forgotten and no longer counts against the limit."""
+        first = self.manager.create_job(1)
+        self.manager.create_job(1)
+        self.manager.delete_job(first.id)
+
+        self.assertTrue(first.cancelled)
+        with self.assertRaises(KeyError):
+            self.manager.get_job(first.id)
+        self.manager.create_job(1)
+
+    def test_unknown_job(self):
+        """Test looking up a job that does not exist."""
+        with self.assertRaises(KeyError):
+            self.manager.get_job("missing")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,11 +3,14 @@ import sys
 import os
 import json
 import tempfile
+import threading
 
-# Add the src directory to the path
+# Add the src directory to the path; knowledge_base imports its sibling modules by name
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
 
 from backend.knowledge_base import KnowledgeBase
+from backend.utils import normalize_text
 
 class TestKnowledgeBase(unittest.TestCase):
     def setUp(self):
@@ -131,5 +134,135 @@ class TestKnowledgeBase(unittest.TestCase):
             self.assertEqual(results_lower[0][0], results_upper[0][0])
             self.assertEqual(results_lower[0][0], results_mixed[0][0])
 
+    def test_search_matches_word_variants(self):
+        """Test that indexed terms are stemmed, so plurals and -ing forms match."""
+        results = self.kb.search_content("contacting by emails")
+        self.assertGreater(len(results), 0)
+        self.assertEqual(results[0][2], "contact.general")
+    
+    def test_search_ranks_keywords_above_answer_text(self):
+        """Test that an entry whose keywords match outranks one that only mentions the term in its answer."""
+        self.test_data["contact"]["general"]["answer"] = "Ask us about pay per hire pricing"
+        with open(self.temp_file.name, 'w') as f:
+            json.dump(self.test_data, f)
+        kb = KnowledgeBase(self.temp_file.name)
+        results = kb.search_content("pay per hire")
+        self.assertEqual([r[2] for r in results[:2]], ["services.pay_per_hire", "contact.general"])
+    
+    def test_search_short_keyword_phrase(self):
+        """Test that keywords too short to be index terms still match as exact phrases."""
+        self.test_data["services"]["pay_per_hire"]["keywords"].append("cv")
+        with open(self.temp_file.name, 'w') as f:
+            json.dump(self.test_data, f)
+        kb = KnowledgeBase(self.temp_file.name)
+        results = kb.search_content("upload my cv")
+        self.assertEqual(results[0][2], "services.pay_per_hire")
+    
+    def test_search_uses_prebuilt_index(self):
+        """Test that queries do not rebuild the entry list."""
+        self.kb.get_all_entries = None
+        self.assertEqual(self.kb.search_content("raas")[0][0], "Test RaaS answer")
+
+    def baseline_phrase_scores(self, kb, normalized_query):
+        """Exact-phrase bonus per entry as utils.calculate_match_score computes it"""
+        scores = {}
+        for entry_id, (keywords, _, _) in enumerate(kb.entries):
+            bonus = sum(len(k.split()) * 2 for k in keywords if k in normalized_query)
+            if bonus:
+                scores[entry_id] = bonus
+        return scores
+
+    def test_phrase_scores_match_baseline_scorer(self):
+        """Test that the one-pass phrase scan gives the baseline scorer's bonus on the real data."""
+        kb = KnowledgeBase(os.path.join(os.path.dirname(__file__), '..', 'data', 'jobsterritory_content.json'))
+        queries = ["how much does it cost", "pay per hire or raas", "executive search for a cfo",
+                   "where are you located", "upload my cv", "quantum physics"]
+        # Every keyword that normalization leaves unchanged, as a query of its own and inside a sentence
+        queries += [k for keywords, _, _ in kb.entries for k in keywords if normalize_text(k) == k]
+        queries += [f"tell me about {k} please" for keywords, _, _ in kb.entries for k in keywords
+                    if normalize_text(k) == k]
+        # Queries hitting a punctuated keyword differ on purpose, see test_punctuated_keywords_now_match
+        punctuated = [normalize_text(k) for keywords, _, _ in kb.entries for k in keywords if normalize_text(k) != k]
+        for query in queries:
+            normalized = normalize_text(query)
+            if any(phrase in normalized for phrase in punctuated):
+                continue
+            self.assertEqual(kb.index.phrase_scores(normalized), self.baseline_phrase_scores(kb, normalized), query)
+
+    def test_punctuated_keywords_now_match(self):
+        """Test the one intended difference: keywords are normalized like the query, so "c-suite" can match."""
+        kb = KnowledgeBase(os.path.join(os.path.dirname(__file__), '..', 'data', 'jobsterritory_content.json'))
+        for keyword, query in [("c-suite", "c-suite executive search"), ("e-commerce", "ecommerce hiring")]:
+            normalized = normalize_text(query)
+            entry_id = next(i for i, (keywords, _, _) in enumerate(kb.entries) if keyword in keywords)
+            baseline = self.baseline_phrase_scores(kb, normalized)
+            scores = kb.index.phrase_scores(normalized)
+            self.assertEqual(scores.get(entry_id, 0) - baseline.get(entry_id, 0), 2, query)
+            self.assertEqual({i: b for i, b in scores.items() if i != entry_id},
+                             {i: b for i, b in baseline.items() if i != entry_id}, query)
+    
+    def test_synonyms_are_indexed_under_canonical_terms(self):
+        """Test that synonyms in the data file match entries indexed under the canonical word."""
+        self.test_data["pricing"] = {"salary": {"keywords": ["salary"], "answer": "Test salary answer"}}
+        self.test_data["synonyms"] = {"salary": ["compensation", "ctc"]}
+        self.write_data(self.test_data)
+        kb = KnowledgeBase(self.temp_file.name)
+        
+        self.assertEqual(len(kb.get_all_entries()), 4)
+        self.assertEqual(kb.get_synonyms("salary"), ["compensation", "ctc"])
+        for query in ("compensation", "CTC", "salary"):
+            results = kb.search_content(query)
+            self.assertEqual(results[0][0], "Test salary answer", query)
+    
+    def write_data(self, data):
+        with open(self.temp_file.name, 'w') as f:
+            json.dump(data, f)
+        # Make sure the change is visible even on filesystems with coarse mtimes
+        stat = os.stat(self.temp_file.name)
+        os.utime(self.temp_file.name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    def test_reload_picks_up_changes(self):
+        """Test that reload swaps in edited content and notifies listeners."""
+        reloaded = []
+        self.kb.add_reload_listener(lambda kb: reloaded.append(kb.version))
+        self.assertFalse(self.kb.reload())
+        
+        self.test_data["services"]["raas"]["answer"] = "Updated RaaS answer"
+        self.write_data(self.test_data)
+        self.assertTrue(self.kb.reload())
+        self.assertEqual(self.kb.search_content("raas")[0][0], "Updated RaaS answer")
+        self.assertEqual(reloaded, [self.kb.version])
+    
+    def test_failed_reload_keeps_current_version(self):
+        """Test that a broken file does not replace the loaded content."""
+        version = self.kb.version
+        with open(self.temp_file.name, 'w') as f:
+            f.write("{not json")
+        self.assertFalse(self.kb.reload(force=True))
+        self.assertEqual(self.kb.version, version)
+        self.assertEqual(self.kb.search_content("raas")[0][0], "Test RaaS answer")
+    
+    def test_in_flight_snapshot_is_unchanged_by_reload(self):
+        """Test that a snapshot taken before a reload keeps its own index."""
+        snapshot = self.kb._snapshot
+        self.test_data["services"]["raas"]["answer"] = "Updated RaaS answer"
+        self.write_data(self.test_data)
+        self.kb.reload()
+        self.assertEqual(snapshot.index.search("raas")[0][0], "Test RaaS answer")
+        self.assertIsNot(self.kb._snapshot, snapshot)
+    
+    def test_watcher_reloads_on_mtime_change(self):
+        """Test that the background watcher reloads a modified file."""
+        reloaded = threading.Event()
+        self.kb.add_reload_listener(lambda kb: reloaded.set())
+        self.kb.start_watching(interval_seconds=0.02)
+        try:
+            self.test_data["contact"]["general"]["answer"] = "New contact answer"
+            self.write_data(self.test_data)
+            self.assertTrue(reloaded.wait(2))
+            self.assertEqual(self.kb.search_content("contact")[0][0], "New contact answer")
+        finally:
+            self.kb.stop_watching()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
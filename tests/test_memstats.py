@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backend.memstats import parse_smaps, process_memory
+
+SMAPS_ROLLUP = """55eaef2fb000-7ffeeee93000 ---p 00000000 00:00 0                          [rollup]
+Rss:                1304 kB
+Pss:                 395 kB
+Pss_Dirty:           104 kB
+Shared_Clean:       1160 kB
+Shared_Dirty:          0 kB
+Private_Clean:        40 kB
+Private_Dirty:       104 kB
+Swap:                  0 kB
+"""
+
+
+class TestMemstats(unittest.TestCase):
+    def test_parse_smaps_rollup(self):
+        """Test that smaps_rollup fields are converted to bytes."""
+        memory = parse_smaps(SMAPS_ROLLUP)
+        self.assertEqual(memory["rss"], 1304 * 1024)
+        self.assertEqual(memory["pss"], 395 * 1024)
+        self.assertEqual(memory["shared_clean"], 1160 * 1024)
+        self.assertEqual(memory["private_dirty"], 104 * 1024)
+
+    def test_parse_smaps_sums_mappings(self):
+        """Test that per-mapping smaps blocks are summed."""
+        text = "Rss: 10 kB\nPss: 5 kB\n7f00-7f01 r--p\nRss: 20 kB\nPss: 20 kB\n"
+        memory = parse_smaps(text)
+        self.assertEqual(memory["rss"], 30 * 1024)
+        self.assertEqual(memory["pss"], 25 * 1024)
+
+    @unittest.skipUnless(os.path.exists("/proc/self/smaps_rollup") or os.path.exists("/proc/self/smaps"),
+                         "/proc smaps not available")
+    def test_process_memory_self(self):
+        """Test reading this process's own memory figures."""
+        memory = process_memory()
+        self.assertGreater(memory["rss"], 0)
+        self.assertGreater(memory["pss"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
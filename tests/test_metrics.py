@@ -0,0 +1,137 @@
+import unittest
+import sys
+import os
+import threading
+import time
+import tracemalloc
+
+# Add the src directory to the path; metrics imports its sibling modules by name
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+from backend.metrics import MetricsRegistry, StageTimer, STAGE_MEMORY_PEAK_BYTES, STAGE_MEMORY_RETAINED_BYTES
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_render(self):
+        """Test counter increments and text rendering."""
+        counter = self.registry.counter("test_fallbacks_total", "Fallbacks", labels=("reason",))
+        counter.inc(reason="empty_text")
+        counter.inc(2, reason="empty_text")
+
+        self.assertEqual(counter.value(reason="empty_text"), 3)
+        output = self.registry.render()
+        self.assertIn("# TYPE test_fallbacks_total counter", output)
+        self.assertIn('test_fallbacks_total{reason="empty_text"} 3', output)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram buckets, sum and count are rendered cumulatively."""
+        histogram = self.registry.histogram("test_seconds", "Latency", labels=("stage",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, stage="parse")
+        histogram.observe(0.5, stage="parse")
+        histogram.observe(5.0, stage="parse")
+
+        output = self.registry.render()
+        self.assertIn('test_seconds_bucket{stage="parse",le="0.1"} 1', output)
+        self.assertIn('test_seconds_bucket{stage="parse",le="1.0"} 2', output)
+        self.assertIn('test_seconds_bucket{stage="parse",le="+Inf"} 3', output)
+        self.assertIn('test_seconds_count{stage="parse"} 3', output)
+        self.assertIn('test_seconds_sum{stage="parse"} 5.55', output)
+
+    def test_stage_timer_records_each_lap(self):
+        """Test that a stage timer observes one sample per lap."""
+        histogram = self.registry.histogram("test_stage_seconds", "Stages", labels=("stage", "file_type"))
+        timer = StageTimer(histogram, "stage", file_type="pdf")
+        timer.lap("extract_text")
+        timer.lap("clean_text")
+
+        self.assertEqual(histogram.count(stage="extract_text", file_type="pdf"), 1)
+        self.assertEqual(histogram.count(stage="clean_text", file_type="pdf"), 1)
+    
+    def test_stage_timer_records_memory_while_tracing(self):
+        """Test that stage memory is recorded only while tracemalloc runs."""
+        histogram = self.registry.histogram("test_memory_stage_seconds", "Stages", labels=("stage",))
+        StageTimer(histogram, "stage").lap("untraced_stage")
+        self.assertEqual(STAGE_MEMORY_PEAK_BYTES.count(stage="untraced_stage"), 0)
+        
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        with StageTimer(histogram, "stage") as timer:
+            data = [bytearray(1024) for _ in range(100)]
+            timer.lap("traced_stage")
+        self.assertEqual(STAGE_MEMORY_PEAK_BYTES.count(stage="traced_stage"), 1)
+        self.assertEqual(STAGE_MEMORY_RETAINED_BYTES.count(stage="traced_stage"), 1)
+        self.assertIn('ats_stage_memory_retained_bytes_bucket{stage="traced_stage",le="65536.0"} 0',
+                      "\n".join(STAGE_MEMORY_RETAINED_BYTES.samples()))
+        self.assertEqual(len(data), 100)
+
+    def test_traced_timers_run_one_at_a_time(self):
+        """Test that while tracing, a second timer waits for the first one's block so their stages don't mix."""
+        histogram = self.registry.histogram("test_concurrent_stage_seconds", "Stages", labels=("stage",))
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        first_started = threading.Event()
+        events = []
+
+        def big():
+            with StageTimer(histogram, "stage") as timer:
+                first_started.set()
+                data = bytearray(4 * 1024 * 1024)
+                time.sleep(0.05)
+                timer.lap("concurrent_big_stage")
+                del data
+                events.append("big stopped")
+
+        def small():
+            first_started.wait(5)
+            with StageTimer(histogram, "stage") as timer:
+                events.append("small started")
+                data = bytearray(1024)
+                timer.lap("concurrent_small_stage")
+            self.assertEqual(len(data), 1024)
+
+        threads = [threading.Thread(target=big), threading.Thread(target=small)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(events, ["big stopped", "small started"])
+        samples = "\n".join(STAGE_MEMORY_PEAK_BYTES.samples())
+        self.assertIn('ats_stage_memory_peak_bytes_bucket{stage="concurrent_big_stage",le="4194304.0"} 0', samples)
+        self.assertIn('ats_stage_memory_peak_bytes_bucket{stage="concurrent_small_stage",le="262144.0"} 1', samples)
+
+    def test_lock_released_when_stage_raises(self):
+        """Test that a timed block that raises lets the next timer's stages run."""
+        histogram = self.registry.histogram("test_raising_stage_seconds", "Stages", labels=("stage",))
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        with self.assertRaises(ValueError):
+            with StageTimer(histogram, "stage"):
+                raise ValueError("parse failed")
+
+        def next_stage():
+            with StageTimer(histogram, "stage") as timer:
+                timer.lap("after_raising_stage")
+
+        other_thread = threading.Thread(target=next_stage)
+        other_thread.start()
+        other_thread.join(1)
+        self.assertFalse(other_thread.is_alive())
+
+    def test_callback_metric(self):
+        """Test metrics computed at scrape time."""
+        self.registry.callback("test_queue_depth", "Queue depth", ("route",), lambda: {("match",): 4})
+        self.assertIn('test_queue_depth{route="match"} 4', self.registry.render())
+
+    def test_label_escaping(self):
+        """Test that label values are escaped."""
+        counter = self.registry.counter("test_escaped_total", "Escaping", labels=("reason",))
+        counter.inc(reason='say "hi"')
+        self.assertIn('reason="say \\"hi\\""', self.registry.render())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import sys
+import os
+import random
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backend.phrase_matching import PhraseAutomaton
+
+
+class TestPhraseAutomaton(unittest.TestCase):
+    def test_overlapping_phrases(self):
+        """Test the classic overlapping case: phrases ending inside other phrases."""
+        automaton = PhraseAutomaton.from_phrases([(p, p) for p in ("he", "she", "his", "hers")])
+        self.assertEqual(sorted(automaton.find("ushers")), ["he", "hers", "she"])
+        self.assertEqual(automaton.find("xyz"), [])
+
+    def test_each_added_phrase_reported_once(self):
+        """Test that a phrase is reported once per add, however often it occurs."""
+        automaton = PhraseAutomaton.from_phrases([("pay per hire", 1), ("hire", 2), ("hire", 3)])
+        self.assertEqual(automaton.find("hire hire pay per hire"), [1, 2, 3])
+
+    def test_matches_substring_semantics(self):
+        """Test that results agree with `phrase in text` on random phrases and texts."""
+        rng = random.Random(42)
+        alphabet = "ab c"
+        phrases = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))).strip() or "a"
+                          for _ in range(40)})
+        automaton = PhraseAutomaton.from_phrases([(p, p) for p in phrases])
+        for _ in range(200):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+            self.assertEqual(sorted(automaton.find(text)), [p for p in phrases if p in text])
+
+    def test_add_after_build_rejected(self):
+        """Test that the automaton is immutable once built."""
+        automaton = PhraseAutomaton.from_phrases([("raas", 1)])
+        with self.assertRaises(RuntimeError):
+            automaton.add("pph", 2)
+
+if __name__ == '__main__':
+    unittest.main()
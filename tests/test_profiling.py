@@ -0,0 +1,143 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import pstats
+import tracemalloc
+from unittest.mock import patch
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backend import profiling
+from backend.profiling import RequestProfile, StageMemory, current_profile, run_profiled, count
+
+
+class TestRequestProfile(unittest.TestCase):
+    def test_no_profile_by_default(self):
+        """Test that nothing is active outside a profiled call."""
+        self.assertIsNone(current_profile())
+        count("spacy_calls")  # Must be a no-op
+        self.assertEqual(run_profiled(None, lambda x: x * 2, 21), 42)
+
+    def test_run_profiled_activates_profile(self):
+        """Test that the profile is visible inside the call and reset afterwards."""
+        profile = RequestProfile()
+
+        def work():
+            self.assertIs(current_profile(), profile)
+            count("spacy_calls", 2)
+            count("regex_matches.extract_experience")
+            current_profile().add_stage("clean_text", 0.0015)
+            return "done"
+
+        self.assertEqual(run_profiled(profile, work), "done")
+        self.assertIsNone(current_profile())
+
+        report = profile.to_dict()
+        self.assertEqual(report["spacy_calls"], 2)
+        self.assertEqual(report["regex_matches"], {"extract_experience": 1})
+        self.assertAlmostEqual(report["stages_ms"]["clean_text"], 1.5)
+
+    def test_sections(self):
+        """Test that sections are reported under their own keys."""
+        profile = RequestProfile()
+        run_profiled(profile.section("jd"), count, "sentences_processed", 7)
+        run_profiled(profile.section("cv"), count, "sentences_processed", 3)
+
+        report = profile.to_dict()
+        self.assertEqual(report["jd"]["sentences_processed"], 7)
+        self.assertEqual(report["cv"]["sentences_processed"], 3)
+
+    def test_cprofile_dump(self):
+        """Test that recorded cProfile data is merged into one pstats file."""
+        directory = tempfile.mkdtemp()
+        try:
+            profile = RequestProfile(record_cprofile=True)
+            run_profiled(profile.section("jd"), sorted, range(1000))
+            run_profiled(profile.section("cv"), sorted, range(1000))
+
+            path = profile.dump_cprofile(directory, "match")
+            self.assertTrue(os.path.exists(path))
+            self.assertGreater(pstats.Stats(path).total_calls, 0)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_section_skipped_when_another_profiler_is_active(self):
+        """Test that a section whose profiler cannot start (Python 3.12+) still runs and says so."""
+        class BusyProfile:
+            def enable(self):
+                raise ValueError("Another profiling tool is already active")
+
+        profile = RequestProfile(record_cprofile=True)
+        with patch.object(profiling.cProfile, "Profile", BusyProfile):
+            self.assertEqual(run_profiled(profile.section("cv"), sorted, [3, 1, 2]), [1, 2, 3])
+        self.assertTrue(profile.to_dict()["cv"]["cprofile_skipped"])
+        self.assertNotIn("cprofile_skipped", profile.to_dict())
+        self.assertIsNone(profile.dump_cprofile(tempfile.gettempdir()))
+
+    def test_no_dump_without_cprofile(self):
+        """Test that a plain profile does not write a dump."""
+        profile = RequestProfile()
+        run_profiled(profile, sorted, [3, 1, 2])
+        self.assertIsNone(profile.dump_cprofile(tempfile.gettempdir()))
+
+
+class TestStageMemory(unittest.TestCase):
+    def setUp(self):
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+
+    def test_peak_and_retained_per_stage(self):
+        """Test that each lap reports the stage's own peak and retained allocations."""
+        memory = StageMemory()
+        kept = [bytearray(1024) for _ in range(200)]
+        peak, retained, sites = memory.lap()
+        self.assertGreater(retained, 200 * 1024)
+        self.assertGreaterEqual(peak, retained)
+        self.assertEqual(sites, [])
+
+        temporary = bytearray(4 * 1024 * 1024)
+        del temporary
+        peak, retained, _ = memory.lap()
+        self.assertGreater(peak, 4000 * 1024)
+        self.assertLess(retained, 64 * 1024)
+        self.assertEqual(len(kept), 200)
+
+    def test_without_reset_peak(self):
+        """Test the Python 3.8 fallback, where the process-wide peak cannot be reset."""
+        with patch.object(profiling, "_CAN_RESET_PEAK", False):
+            temporary = bytearray(4 * 1024 * 1024)
+            del temporary
+            memory = StageMemory()
+            kept = [bytearray(1024) for _ in range(200)]
+            peak, retained, _ = memory.lap()
+            self.assertGreater(retained, 200 * 1024)
+            self.assertLess(peak, 1024 * 1024)
+
+            temporary = bytearray(8 * 1024 * 1024)
+            del temporary
+            peak, retained, _ = memory.lap()
+            self.assertGreater(peak, 8000 * 1024)
+            self.assertLess(retained, 64 * 1024)
+        self.assertEqual(len(kept), 200)
+
+    def test_top_sites_in_profile_report(self):
+        """Test that the allocation sites of a stage are attributed to this file."""
+        memory = StageMemory(top_sites=3)
+        kept = [bytearray(4096) for _ in range(100)]
+        peak, retained, sites = memory.lap()
+        self.assertTrue(sites)
+        self.assertIn("test_profiling.py", sites[0]["site"])
+        self.assertGreater(sites[0]["size_kb"], 300)
+
+        profile = RequestProfile(memory_top_sites=3)
+        profile.section("cv").add_memory("extract_text", peak, retained, sites)
+        report = profile.to_dict()["cv"]["memory"]["extract_text"]
+        self.assertEqual(report["top_sites"], sites)
+        self.assertNotIn("memory", RequestProfile().to_dict())
+        self.assertEqual(len(kept), 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the src directory to the path; knowledge_base imports its sibling modules by name
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+from backend.semantic import LatencyBudget, SemanticIndex, np
+from backend.knowledge_base import KnowledgeBase
+
+# Toy word vectors: "staff" and "recruit" point the same way, so a question
+# about staffing is close to the recruitment entry without sharing a keyword
+WORD_VECTORS = {
+    "recruit": (1.0, 0.0, 0.0), "recruitment": (1.0, 0.0, 0.0), "staff": (0.9, 0.1, 0.0),
+    "hiring": (0.8, 0.2, 0.0), "price": (0.0, 1.0, 0.0), "cost": (0.0, 0.9, 0.1),
+    "phone": (0.0, 0.0, 1.0), "contact": (0.0, 0.1, 0.9)
+}
+
+
+def toy_vectorize(text):
+    vectors = [WORD_VECTORS[word] for word in text.lower().replace("?", "").split() if word in WORD_VECTORS]
+    return np.mean(np.array(vectors, dtype=np.float32), axis=0) if vectors else None
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLatencyBudget(unittest.TestCase):
+    def test_pauses_when_percentile_over_budget(self):
+        """Test that a p99 over budget pauses the stage until the cooldown has passed."""
+        clock = FakeClock()
+        budget = LatencyBudget(0.005, window=100, check_every=10, cooldown_seconds=30, clock=clock)
+        for _ in range(10):
+            self.assertTrue(budget.allow())
+            budget.record(0.001)
+        self.assertTrue(budget.allow())
+        for _ in range(10):
+            budget.record(0.02)
+        self.assertFalse(budget.allow())
+        self.assertEqual(budget.stats()["trips"], 1)
+        self.assertEqual(budget.stats()["skipped"], 1)
+        clock.now = 31
+        self.assertTrue(budget.allow())
+        self.assertFalse(budget.stats()["paused"])
+
+    def test_occasional_slow_run_within_percentile(self):
+        """Test that one slow run in a window does not trip a p99 budget."""
+        budget = LatencyBudget(0.005, window=200, check_every=200)
+        for i in range(200):
+            budget.record(0.02 if i == 0 else 0.001)
+        self.assertTrue(budget.allow())
+        self.assertEqual(budget.stats()["trips"], 0)
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestSemanticIndex(unittest.TestCase):
+    ENTRIES = [
+        (["recruitment"], "We recruit for you", "services.raas"),
+        (["price"], "Our price list", "pricing.general"),
+        (["contact"], "Call our phone line", "contact.general"),
+        (["unknown"], "Nothing known here", "misc.general")
+    ]
+
+    def test_top_k(self):
+        """Test that the most similar entries come first and entries without vectors never match."""
+        index = SemanticIndex(self.ENTRIES, toy_vectorize)
+        self.assertEqual(index.matrix.shape, (4, 3))
+        results = index.top_k("staff", k=2)
+        self.assertEqual([entry_id for entry_id, _ in results], [0, 1])
+        self.assertGreater(results[0][1], 0.9)
+        self.assertEqual(index.top_k("nothing matches"), [])
+
+    def test_knowledge_base_blends_paraphrases(self):
+        """Test that a paraphrase with no keyword hit is found once semantic search is enabled."""
+        data = {"services": {"raas": {"keywords": ["recruitment"], "answer": "We recruit for you"}},
+                "pricing": {"general": {"keywords": ["price"], "answer": "Our price list"}}}
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump(data, f)
+        self.addCleanup(os.unlink, f.name)
+        kb = KnowledgeBase(f.name)
+        self.assertEqual(kb.search_content("staff?"), [])
+        version = kb.version
+
+        kb.enable_semantic_search(toy_vectorize)
+        self.assertEqual(kb.version, version + 1)
+        results = kb.search_content("staff?")
+        self.assertEqual(results[0][2], "services.raas")
+        self.assertEqual(kb.search_content("price")[0][2], "pricing.general")
+        self.assertEqual(kb.stats()["semantic"]["runs"], 2)
+
+        # Reloads keep the entry vectors
+        self.assertTrue(kb.reload(force=True))
+        self.assertEqual(kb.search_content("staff?")[0][2], "services.raas")
+
+
+if __name__ == '__main__':
+    unittest.main()
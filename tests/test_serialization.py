@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+import json
+
+# Add the src directory to the path; serialization imports its sibling modules by name
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+from backend.serialization import dumps, parse_fields, select_fields
+
+MATCH_RESULT = {
+    "score": 82.5,
+    "matched_skills": ["python", "aws"],
+    "missing_jd_skills": ["kubernetes"],
+    "metadata": {"cv_filename": "cv.pdf", "timings": {"total_ms": 41.2, "score_ms": 3.1}}
+}
+
+
+class TestSerialization(unittest.TestCase):
+    def test_dumps_round_trips(self):
+        """Test that dumps produces JSON equal to the input, with non-str keys and sets."""
+        self.assertEqual(json.loads(dumps(MATCH_RESULT)), MATCH_RESULT)
+        self.assertEqual(json.loads(dumps({2020: {"b", "a"}})), {"2020": ["a", "b"]})
+
+    def test_parse_fields(self):
+        """Test splitting of the fields query parameter."""
+        self.assertIsNone(parse_fields(None))
+        self.assertIsNone(parse_fields(" , "))
+        self.assertEqual(parse_fields("score, metadata.timings"), ["score", "metadata.timings"])
+
+    def test_select_top_level_and_nested_fields(self):
+        """Test that only requested keys are kept, including dotted paths."""
+        selected = select_fields(MATCH_RESULT, ["score", "metadata.timings.total_ms", "unknown"])
+        self.assertEqual(selected, {"score": 82.5, "metadata": {"timings": {"total_ms": 41.2}}})
+
+    def test_select_merges_sibling_paths(self):
+        """Test that paths sharing a parent end up in the same nested object."""
+        selected = select_fields(MATCH_RESULT, ["metadata.cv_filename", "metadata.timings.score_ms"])
+        self.assertEqual(selected, {"metadata": {"cv_filename": "cv.pdf", "timings": {"score_ms": 3.1}}})
+
+    def test_no_selection_keeps_everything(self):
+        """Test that no fields parameter returns the response unchanged."""
+        self.assertIs(select_fields(MATCH_RESULT, None), MATCH_RESULT)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import signal
+from unittest.mock import patch
+
+# Add the src directory to the path; server imports its sibling modules by name
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+from backend import server
+
+
+@unittest.skipUnless(hasattr(signal, "SIGHUP"), "needs SIGHUP")
+class TestPreforkServer(unittest.TestCase):
+    def setUp(self):
+        self.server = server.PreforkServer(sock=None, workers=2, memory_report_seconds=0)
+        self.server.children = {101: 0.0, 102: 0.0}
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            self.addCleanup(signal.signal, signum, signal.getsignal(signum))
+
+    def test_sighup_is_forwarded_to_every_worker(self):
+        """Test that SIGHUP to the launcher reaches the workers instead of killing the launcher."""
+        self.server.install_signal_handlers()
+        with patch.object(server.os, "kill") as kill:
+            signal.raise_signal(signal.SIGHUP)
+        self.assertEqual(sorted(call.args for call in kill.call_args_list),
+                         [(101, signal.SIGHUP), (102, signal.SIGHUP)])
+        self.assertFalse(self.server.stopping)
+
+    def test_forward_skips_workers_that_are_gone(self):
+        """Test that a worker that already exited does not stop the others from being signalled."""
+        with patch.object(server.os, "kill", side_effect=[ProcessLookupError, None]) as kill:
+            self.server.forward(signal.SIGHUP)
+        self.assertEqual(kill.call_count, 2)
+
+    def test_reap_restarts_a_worker_that_died(self):
+        """Test that an exited worker is logged with its exit code and replaced."""
+        self.server.children = {101: 0.0}
+        with patch.object(server.os, "waitpid", side_effect=[(101, 3 << 8), (0, 0)]), \
+                patch.object(self.server, "spawn") as spawn, \
+                self.assertLogs("ats.server", "WARNING") as logs:
+            self.server.reap()
+        spawn.assert_called_once_with()
+        self.assertIn("Worker 101 exited with status 3", logs.output[0])
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "needs fork")
+class TestExitCode(unittest.TestCase):
+    def wait_for_child(self, child):
+        pid = os.fork()
+        if pid == 0:
+            child()
+            os._exit(0)
+        return os.waitpid(pid, 0)[1]
+
+    def test_exit_status(self):
+        """Test the exit code of a worker that exited on its own."""
+        self.assertEqual(server.exit_code(self.wait_for_child(lambda: os._exit(3))), 3)
+
+    def test_killed_by_signal(self):
+        """Test that a worker killed by a signal reports the negated signal number."""
+        status = self.wait_for_child(lambda: os.kill(os.getpid(), signal.SIGKILL))
+        self.assertEqual(server.exit_code(status), -signal.SIGKILL)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the path; session_store imports its sibling modules by name
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+from backend.session_store import SessionStore
+
+
+class TestSessionStore(unittest.TestCase):
+    def test_new_and_existing_sessions(self):
+        """Test that a session is created once and found again by its ID."""
+        store = SessionStore(max_sessions=10)
+        session = store.get_or_create()
+        session.history.append({"user": "hi", "bot": "hello"})
+        self.assertIs(store.get_or_create(session.session_id), session)
+        self.assertIsNone(store.get("unknown"))
+
+    def test_unknown_id_gets_a_fresh_session(self):
+        """Test that a client-chosen ID is not adopted for a new session."""
+        store = SessionStore()
+        session = store.get_or_create("chosen-by-client")
+        self.assertNotEqual(session.session_id, "chosen-by-client")
+        self.assertIsNone(store.get("chosen-by-client"))
+        self.assertIs(store.get_or_create(session.session_id), session)
+
+    def test_store_is_bounded(self):
+        """Test that the least recently used sessions are evicted at capacity."""
+        store = SessionStore(max_sessions=3)
+        ids = [store.get_or_create().session_id for _ in range(5)]
+        self.assertEqual(len(store), 3)
+        self.assertIsNone(store.get(ids[0]))
+        self.assertIsNotNone(store.get(ids[-1]))
+        self.assertEqual(store.stats()["evicted"], 2)
+
+    def test_delete(self):
+        """Test ending a session."""
+        store = SessionStore()
+        session = store.get_or_create()
+        self.assertTrue(store.delete(session.session_id))
+        self.assertFalse(store.delete(session.session_id))
+
+if __name__ == '__main__':
+    unittest.main()